@@ -1,4 +1,4 @@
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 from pydantic import BaseModel, Field
 
@@ -7,6 +7,10 @@ class ChatbotReq(BaseModel):
     query: str = Field(..., description="사용자 질의")
     lang: Literal["ko", "zh", "th", "en", "vi", "ja", "uz"] = Field("ko", description="질의 언어")
 
+class ChatbotBatchReq(BaseModel):
+    """챗봇 일괄 요청 DTO"""
+    questions: List[ChatbotReq] = Field(..., description="질문 목록", min_length=1, max_length=100)
+
 class TranslationReq(BaseModel):
     """번역 요청 DTO (여러 필드 번역)"""
     title: str = Field(..., description="번역할 제목", min_length=1, max_length=1000)
@@ -14,3 +18,17 @@ class TranslationReq(BaseModel):
     text: str = Field(..., description="번역할 본문 텍스트", min_length=1, max_length=5000)
     target_language: Literal["ko", "zh", "th", "en", "vi", "ja", "uz"] = Field(..., description="번역 대상 언어")
 
+
+class TranslationPostingReq(BaseModel):
+    """일괄 번역 공고 항목 DTO"""
+    posting_id: str = Field(..., description="공고 식별자 (결과 매칭용)", min_length=1, max_length=100)
+    title: str = Field(..., description="번역할 제목", min_length=1, max_length=1000)
+    eligibility: str = Field(..., description="번역할 자격요건", min_length=1, max_length=3000)
+    text: str = Field(..., description="번역할 본문 텍스트", min_length=1, max_length=5000)
+
+class TranslationBulkReq(BaseModel):
+    """일괄 번역 요청 DTO (공고 × 대상 언어)"""
+    postings: List[TranslationPostingReq] = Field(..., description="번역할 공고 목록", min_length=1, max_length=500)
+    target_languages: List[Literal["ko", "zh", "th", "en", "vi", "ja", "uz"]] = Field(
+        ..., description="번역 대상 언어 목록", min_length=1, max_length=7
+    )
@@ -1,11 +1,25 @@
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel, Field
 
 class ChatbotRes(BaseModel):
     """챗봇 응답 DTO"""
     answer: str = Field(..., description="챗봇의 답변")
+    timings: Optional[Dict[str, float]] = Field(None, description="단계별 처리 시간 ms (시간 측정 요청 시에만 포함)")
+
+class ChatbotBatchItemRes(BaseModel):
+    """챗봇 일괄 응답 항목 DTO (항목별 성공/실패)"""
+    answer: Optional[str] = Field(None, description="챗봇의 답변 (실패 시 None)")
+    error: Optional[str] = Field(None, description="항목 처리 오류 메시지 (성공 시 None)")
+
+class ChatbotBatchRes(BaseModel):
+    """챗봇 일괄 응답 DTO (요청 순서 유지)"""
+    results: List[ChatbotBatchItemRes] = Field(..., description="질문별 처리 결과")
 
 class TranslationRes(BaseModel):
     """번역 응답 DTO (여러 필드 번역 결과)"""
     title: str = Field(..., description="번역된 제목")
     eligibility: str = Field(..., description="번역된 자격요건")
-    text: str = Field(..., description="번역된 본문 텍스트")
\ No newline at end of file
+    text: str = Field(..., description="번역된 본문 텍스트")
+    cached: bool = Field(False, description="번역 캐시에서 반환한 결과인지 여부")
+    timings: Optional[Dict[str, float]] = Field(None, description="단계별 처리 시간 ms (시간 측정 요청 시에만 포함)")
\ No newline at end of file
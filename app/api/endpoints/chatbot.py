@@ -1,14 +1,26 @@
-from fastapi import APIRouter
+import time
 
-from app.api.dtos.request import ChatbotReq
-from app.api.dtos.response import ChatbotRes
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.dtos.request import ChatbotReq, ChatbotBatchReq
+from app.api.dtos.response import ChatbotRes, ChatbotBatchRes, ChatbotBatchItemRes
+from app.api.utils import server_timing_header, sse_event, timing_requested
+from app.services.Metrics import service_metrics
 from loguru import logger
 from fastapi import HTTPException
-from app.services.OpenAIService import OpenAIService
+from etl.pdf.lazy import LazyInstance
 
 router = APIRouter()
 
-openAiService = OpenAIService()
+
+def _create_openai_service():
+    # langchain/OpenAI 클라이언트는 무거우므로 첫 요청 또는 서버 시작 시 로드
+    from app.services.OpenAIService import OpenAIService
+    return OpenAIService()
+
+
+openAiService = LazyInstance(_create_openai_service)
 
 @router.get("/health")
 def health():
@@ -18,18 +30,32 @@ def health():
         "message": "Chatbot service is healthy"
     }
 
-@router.post("/ask", response_model=ChatbotRes)
-async def ask_question(request: ChatbotReq) -> ChatbotRes:
+@router.post("/ask", response_model=ChatbotRes, response_model_exclude_none=True)
+async def ask_question(request: ChatbotReq, http_request: Request, http_response: Response) -> ChatbotRes:
+    """
+    RAG 질의 응답
+
+    X-Debug-Timing: 1 헤더 또는 ?timings=1이면 단계별 처리 시간을
+    Server-Timing 헤더와 timings 필드로 함께 반환
+    """
     try:
         logger.info(f"RAG API 호출: '{request.query}' (언어: {request.lang})")
 
+        start = time.perf_counter()
+        timings = service_metrics.start_request_timings() if timing_requested(http_request) else None
+
         response = ChatbotRes(
-            answer=openAiService.generate_rag_answer(
+            answer=await openAiService.agenerate_rag_answer(
                 question=request.query,
                 language=request.lang
             )
         )
 
+        if timings is not None:
+            timings["total"] = (time.perf_counter() - start) * 1000
+            http_response.headers["Server-Timing"] = server_timing_header(timings)
+            response.timings = {name: round(duration, 1) for name, duration in timings.items()}
+
         logger.info(f"RAG API 응답 완료: {len(response.answer)}자")
 
         return response
@@ -40,3 +66,86 @@ async def ask_question(request: ChatbotReq) -> ChatbotRes:
             status_code=500,
             detail="질문 처리 중 오류가 발생했습니다."
         )
+
+@router.post("/ask-batch", response_model=ChatbotBatchRes)
+async def ask_questions_batch(request: ChatbotBatchReq) -> ChatbotBatchRes:
+    """
+    여러 질문 일괄 처리
+
+    질의 임베딩과 FAISS 검색은 한 번에 처리하고 LLM 호출은 병렬로 수행하며,
+    결과는 요청 순서대로 항목별 성공/실패로 반환
+    """
+    try:
+        logger.info(f"RAG 일괄 API 호출: {len(request.questions)}건")
+
+        results = await openAiService.abatch_generate_rag_answers(
+            questions=[item.query for item in request.questions],
+            languages=[item.lang for item in request.questions]
+        )
+
+        response = ChatbotBatchRes(results=[
+            ChatbotBatchItemRes(error="질문 처리 중 오류가 발생했습니다.")
+            if isinstance(result, Exception) else ChatbotBatchItemRes(answer=result)
+            for result in results
+        ])
+
+        failed = sum(1 for item in response.results if item.error)
+        logger.info(f"RAG 일괄 API 응답 완료: 성공 {len(results) - failed}건, 실패 {failed}건")
+
+        return response
+
+    except Exception as e:
+        logger.error(f"RAG 일괄 API 오류: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="질문 처리 중 오류가 발생했습니다."
+        )
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: ChatbotReq) -> StreamingResponse:
+    """
+    RAG 답변 스트리밍 (Server-Sent Events)
+
+    token 이벤트로 생성된 토큰을 즉시 전송하고,
+    완료 시 done 이벤트로 소요 시간 정보를 전송
+    """
+    logger.info(f"RAG 스트리밍 API 호출: '{request.query}' (언어: {request.lang})")
+
+    return StreamingResponse(
+        _stream_answer_events(request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+async def _stream_answer_events(request: ChatbotReq):
+    """답변 토큰을 SSE 이벤트로 변환"""
+    start = time.perf_counter()
+    first_token_at = None
+    answer_length = 0
+
+    try:
+        async for token in openAiService.astream_rag_answer(
+            question=request.query,
+            language=request.lang
+        ):
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            answer_length += len(token)
+            yield sse_event("token", {"token": token})
+
+        total_ms = (time.perf_counter() - start) * 1000
+        ttft_ms = (first_token_at - start) * 1000 if first_token_at else total_ms
+        yield sse_event("done", {
+            "answer_length": answer_length,
+            "time_to_first_token_ms": round(ttft_ms, 1),
+            "total_ms": round(total_ms, 1)
+        })
+
+        logger.info(f"RAG 스트리밍 응답 완료: {answer_length}자 (첫 토큰 {ttft_ms:.0f}ms)")
+
+    except Exception as e:
+        logger.error(f"RAG 스트리밍 API 오류: {str(e)}")
+        yield sse_event("error", {"detail": "질문 처리 중 오류가 발생했습니다."})
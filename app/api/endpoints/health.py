@@ -1,7 +1,20 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
 @router.get("/health")
 def health():
-    return {"ok": True, "message": "healthy"}
\ No newline at end of file
+    """Liveness: 프로세스가 요청을 받을 수 있으면 항상 200 (인덱스/모델 상태와 무관)"""
+    return {"ok": True, "message": "healthy"}
+
+@router.get("/ready")
+def ready(request: Request):
+    """Readiness: 인덱스 로드와 모델/클라이언트 준비가 모두 끝났을 때만 200, 그 전에는 503 (준비 실패 시 마지막 오류 포함)"""
+    checks = dict(getattr(request.app.state, "readiness", {}))
+    is_ready = bool(checks) and all(checks.values())
+    content = {"ready": is_ready, "checks": checks}
+    error = getattr(request.app.state, "readiness_error", None)
+    if not is_ready and error:
+        content["error"] = error
+    return JSONResponse(status_code=200 if is_ready else 503, content=content)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services.Metrics import CONTENT_TYPE, service_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 수집 엔드포인트 (텍스트 노출 형식)"""
+    return Response(content=service_metrics.render(), media_type=CONTENT_TYPE)
@@ -1,19 +1,34 @@
 """
 번역 API 엔드포인트
 """
-from fastapi import APIRouter, HTTPException
+import time
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from app.api.dtos.request import TranslationReq
+from app.api.dtos.request import TranslationReq, TranslationBulkReq
 from app.api.dtos.response import TranslationRes
-from app.services.OpenAIService import OpenAIService
+from app.api.utils import ndjson_line, server_timing_header, timing_requested
+from app.services.Metrics import service_metrics
+from etl.pdf.lazy import LazyInstance
 
 router = APIRouter()
 
-@router.post("/translate", response_model=TranslationRes)
-async def translate_korean_text(request: TranslationReq):
+
+def _create_openai_service():
+    # langchain/OpenAI 클라이언트는 무거우므로 첫 요청 또는 서버 시작 시 로드
+    from app.services.OpenAIService import OpenAIService
+    return OpenAIService()
+
+
+openAiService = LazyInstance(_create_openai_service)
+
+@router.post("/translate", response_model=TranslationRes, response_model_exclude_none=True)
+async def translate_korean_text(request: TranslationReq, http_request: Request, http_response: Response):
     """
     한국어 다중 필드 번역 API
+    X-Debug-Timing: 1 헤더 또는 ?timings=1이면 단계별 처리 시간을 Server-Timing 헤더와 timings 필드로 함께 반환
     
     Args:
         request: 번역 요청 정보 (제목, 자격요건, 본문, 대상 언어)
@@ -24,12 +39,12 @@ async def translate_korean_text(request: TranslationReq):
     try:
         logger.info(f"한국어 다중 필드 번역 요청 - 대상 언어: {request.target_language}")
         logger.info(f"제목 길이: {len(request.title)}, 자격요건 길이: {len(request.eligibility)}, 본문 길이: {len(request.text)}")
-        
-        # OpenAI 서비스 인스턴스 생성
-        openai_service = OpenAIService()
+
+        start = time.perf_counter()
+        timings = service_metrics.start_request_timings() if timing_requested(http_request) else None
         
         # 한국어 → 대상 언어 다중 필드 번역 수행
-        translation_result = openai_service.translate_multiple_fields(
+        translation_result = await openAiService.atranslate_multiple_fields(
             title=request.title,
             eligibility=request.eligibility,
             text=request.text,
@@ -37,8 +52,14 @@ async def translate_korean_text(request: TranslationReq):
         )
         
         logger.info(f"다중 필드 번역 성공 - 한국어 -> {request.target_language}")
+
+        response = TranslationRes(**translation_result)
+        if timings is not None:
+            timings["total"] = (time.perf_counter() - start) * 1000
+            http_response.headers["Server-Timing"] = server_timing_header(timings)
+            response.timings = {name: round(duration, 1) for name, duration in timings.items()}
         
-        return TranslationRes(**translation_result)
+        return response
         
     except Exception as e:
         logger.error(f"번역 API 오류: {str(e)}")
@@ -46,3 +67,53 @@ async def translate_korean_text(request: TranslationReq):
             status_code=500,
             detail=f"번역 처리 중 오류가 발생했습니다: {str(e)}"
         )
+
+@router.post("/translate-bulk")
+async def translate_bulk(request: TranslationBulkReq) -> StreamingResponse:
+    """
+    여러 공고 × 여러 언어 일괄 번역 (NDJSON 스트리밍)
+
+    (공고, 언어) 항목이 끝나는 순서대로 한 줄씩 전송하고,
+    실패한 항목은 error 필드로 전송하며 나머지 항목은 계속 처리
+    마지막 줄에 성공/실패 건수와 소요 시간을 전송
+    """
+    # 같은 공고/언어 중복 제거
+    target_languages = list(dict.fromkeys(request.target_languages))
+    logger.info(f"일괄 번역 요청 - 공고 {len(request.postings)}건 × 언어 {len(target_languages)}개")
+
+    return StreamingResponse(
+        _stream_bulk_translation(request, target_languages),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+async def _stream_bulk_translation(request: TranslationBulkReq, target_languages: list):
+    """일괄 번역 결과를 NDJSON 줄로 변환"""
+    start = time.perf_counter()
+    succeeded = failed = 0
+    postings = [posting.model_dump() for posting in request.postings]
+
+    try:
+        async for item in openAiService.atranslate_bulk(postings, target_languages):
+            if item["error"] is None:
+                succeeded += 1
+            else:
+                failed += 1
+            yield ndjson_line(item)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        yield ndjson_line({
+            "done": True,
+            "succeeded": succeeded,
+            "failed": failed,
+            "total_ms": round(total_ms, 1)
+        })
+
+        logger.info(f"일괄 번역 완료: 성공 {succeeded}건, 실패 {failed}건 ({total_ms:.0f}ms)")
+
+    except Exception as e:
+        logger.error(f"일괄 번역 API 오류: {str(e)}")
+        yield ndjson_line({"done": True, "error": "일괄 번역 처리 중 오류가 발생했습니다."})
@@ -0,0 +1,50 @@
+"""
+요청 지표 미들웨어
+엔드포인트별 진행 중 요청 수와 처리 시간을 기록하고, 서비스 계층 지표에 엔드포인트 라벨을 전달
+"""
+import time
+
+from starlette.routing import Match
+
+from app.services.Metrics import current_endpoint, service_metrics
+
+
+class MetricsMiddleware:
+    """ASGI 미들웨어 (스트리밍 응답은 본문 전송이 끝날 때까지 진행 중으로 집계)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self._endpoint(scope)
+        token = current_endpoint.set(endpoint)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            with service_metrics.requests_in_flight.track_inprogress(endpoint=endpoint):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            service_metrics.request_duration.observe(
+                time.perf_counter() - start, endpoint=endpoint, method=scope["method"], status=status
+            )
+            current_endpoint.reset(token)
+
+    @staticmethod
+    def _endpoint(scope) -> str:
+        """라우트 경로 템플릿 (등록되지 않은 경로는 하나의 라벨로 묶어 라벨 수 폭증 방지)"""
+        for route in scope["app"].routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
@@ -1,3 +1,4 @@
+import json
 import math
 from datetime import datetime, timezone
 from typing import Optional
@@ -18,3 +19,20 @@ def recency_boost(updated_at: Optional[str]) -> float:
         return 0.0
     days = (datetime.now(timezone.utc) - dt).days
     return math.exp(-days / 30.0)
+
+def sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열 생성"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def ndjson_line(data: dict) -> str:
+    """NDJSON(줄 단위 JSON) 형식의 한 줄 생성"""
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+def timing_requested(request) -> bool:
+    """단계별 처리 시간 응답 요청 여부 (X-Debug-Timing 헤더 또는 timings 쿼리 값이 1/true)"""
+    flag = request.headers.get("x-debug-timing") or request.query_params.get("timings") or ""
+    return flag.lower() in ("1", "true")
+
+def server_timing_header(timings: dict) -> str:
+    """단계별 처리 시간(ms)을 Server-Timing 헤더 값으로 변환"""
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
@@ -3,17 +3,20 @@ OpenAI API 설정 관리
 환경변수에서 API 키와 모델 설정을 로드
 """
 import os
+from pathlib import Path
 
 from dotenv import load_dotenv
 from loguru import logger
 
-# .env 파일 로드
-load_dotenv()
+from etl.pdf.lazy import LazyInstance
 
 class OpenAIConfig:
     """OpenAI API 설정 클래스"""
     
     def __init__(self):
+        # .env 파일 로드 (import 시점이 아닌 설정 생성 시점)
+        load_dotenv()
+
         # OpenAI API 키
         self.api_key = self._get_api_key()
         
@@ -26,6 +29,55 @@ class OpenAIConfig:
         self.max_tokens = int(os.getenv("MAX_TOKENS"))
         self.temperature = float(os.getenv("TEMPERATURE"))
         self.timeout = int(os.getenv("OPENAI_TIMEOUT", "30"))
+        # 워커 하나에서 동시에 진행할 수 있는 최대 LLM 호출 수
+        self.max_concurrency = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+        # 배치 요청 하나가 동시에 사용할 수 있는 최대 LLM 호출 수
+        self.batch_concurrency = int(os.getenv("OPENAI_BATCH_CONCURRENCY", "8"))
+
+        # 벡터 인덱스 설정 (게시된 인덱스 변경 감시 주기, 초)
+        self.index_reload_interval = int(os.getenv("INDEX_RELOAD_INTERVAL", "30"))
+
+        # 검색 설정 (hybrid: 벡터+BM25 결합, vector, lexical)
+        self.retrieval_mode = os.getenv("RETRIEVAL_MODE", "hybrid")
+        self.retrieval_fetch_k = int(os.getenv("RETRIEVAL_FETCH_K", "20"))
+        # 질의 임베딩 대기 시간(초). 초과하면 임베딩 없이 BM25 검색만 사용 (0이면 제한 없음)
+        self.embedding_timeout = float(os.getenv("EMBEDDING_TIMEOUT", "5"))
+
+        # 재순위 설정 (CPU 크로스 인코더, 후보 수, 평균 지연 상한(ms), 동시 재순위 수)
+        self.reranker_enabled = os.getenv("RERANKER_ENABLED", "false").lower() == "true"
+        self.reranker_model = os.getenv("RERANKER_MODEL", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")
+        self.reranker_candidates = int(os.getenv("RERANKER_CANDIDATES", "20"))
+        self.reranker_max_latency_ms = float(os.getenv("RERANKER_MAX_LATENCY_MS", "300"))
+        self.reranker_max_inflight = int(os.getenv("RERANKER_MAX_INFLIGHT", "4"))
+        # torch / onnx (onnx는 sentence-transformers 3.2 이상), torch 백엔드 int8 동적 양자화 여부
+        self.reranker_backend = os.getenv("RERANKER_BACKEND", "torch")
+        self.reranker_quantize = os.getenv("RERANKER_QUANTIZE", "true").lower() == "true"
+
+        # 프롬프트 컨텍스트 설정 (토큰 예산, 0이면 max_tokens의 2배 / 중복 청크 판정 유사도)
+        self.context_token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", "0"))
+        self.context_dedup_threshold = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.8"))
+
+        # 일괄 번역 설정 (동시 작업 수, 항목별 재시도 횟수, 재시도 기본 대기 시간 초)
+        self.translation_bulk_concurrency = int(os.getenv("TRANSLATION_BULK_CONCURRENCY", "8"))
+        self.translation_max_retries = int(os.getenv("TRANSLATION_MAX_RETRIES", "2"))
+        self.translation_retry_base_delay = float(os.getenv("TRANSLATION_RETRY_BASE_DELAY", "1.0"))
+
+        # 긴 본문 분할 번역 설정 (구간 최대 문자 수, 0이면 분할하지 않음)
+        self.translation_segment_chars = int(os.getenv("TRANSLATION_SEGMENT_CHARS", "1200"))
+
+        # 번역 결과 영구 캐시 설정 (SQLite 파일 경로, 최대 크기 MB)
+        self.translation_cache_enabled = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+        self.translation_cache_path = Path(os.getenv(
+            "TRANSLATION_CACHE_PATH",
+            str(Path(__file__).parent.parent.parent / "cache" / "translation_cache.sqlite3")
+        ))
+        self.translation_cache_max_mb = int(os.getenv("TRANSLATION_CACHE_MAX_MB", "256"))
+
+        # 의미 기반 답변 캐시 설정 (코사인 유사도 임계값, 언어별 최대 항목 수)
+        # 다른 질문에 이전 답변을 반환할 위험이 있으므로 명시적으로 켰을 때만 사용
+        self.answer_cache_enabled = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() == "true"
+        self.answer_cache_threshold = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+        self.answer_cache_size = int(os.getenv("ANSWER_CACHE_SIZE", "256"))
 
         # 설정 검증
         self._validate_config()
@@ -51,6 +103,69 @@ class OpenAIConfig:
         if self.timeout <= 0:
             logger.warning(f"잘못된 timeout 값: {self.timeout}. 기본값으로 설정합니다.")
             self.timeout = 30
+
+        if self.max_concurrency <= 0:
+            logger.warning(f"잘못된 max_concurrency 값: {self.max_concurrency}. 기본값으로 설정합니다.")
+            self.max_concurrency = 32
+
+        if self.batch_concurrency <= 0:
+            logger.warning(f"잘못된 batch_concurrency 값: {self.batch_concurrency}. 기본값으로 설정합니다.")
+            self.batch_concurrency = 8
+
+        if self.index_reload_interval <= 0:
+            logger.warning(f"잘못된 index_reload_interval 값: {self.index_reload_interval}. 기본값으로 설정합니다.")
+            self.index_reload_interval = 30
+
+        if self.retrieval_mode not in ("hybrid", "vector", "lexical"):
+            logger.warning(f"잘못된 retrieval_mode 값: {self.retrieval_mode}. 기본값으로 설정합니다.")
+            self.retrieval_mode = "hybrid"
+
+        if self.retrieval_fetch_k < self.top_k:
+            logger.warning(f"retrieval_fetch_k({self.retrieval_fetch_k})가 top_k보다 작습니다. top_k로 설정합니다.")
+            self.retrieval_fetch_k = self.top_k
+
+        if self.reranker_candidates < self.top_k:
+            logger.warning(f"reranker_candidates({self.reranker_candidates})가 top_k보다 작습니다. top_k로 설정합니다.")
+            self.reranker_candidates = self.top_k
+
+        if self.reranker_max_inflight <= 0:
+            logger.warning(f"잘못된 reranker_max_inflight 값: {self.reranker_max_inflight}. 기본값으로 설정합니다.")
+            self.reranker_max_inflight = 4
+
+        if self.reranker_backend not in ("torch", "onnx"):
+            logger.warning(f"잘못된 reranker_backend 값: {self.reranker_backend}. 기본값으로 설정합니다.")
+            self.reranker_backend = "torch"
+
+        if self.context_token_budget <= 0:
+            self.context_token_budget = self.max_tokens * 2
+
+        if not (0.0 < self.context_dedup_threshold <= 1.0):
+            logger.warning(f"잘못된 context_dedup_threshold 값: {self.context_dedup_threshold}. 기본값으로 설정합니다.")
+            self.context_dedup_threshold = 0.8
+
+        if not (0.0 < self.answer_cache_threshold <= 1.0):
+            logger.warning(f"잘못된 answer_cache_threshold 값: {self.answer_cache_threshold}. 기본값으로 설정합니다.")
+            self.answer_cache_threshold = 0.95
+
+        if self.translation_bulk_concurrency <= 0:
+            logger.warning(f"잘못된 translation_bulk_concurrency 값: {self.translation_bulk_concurrency}. 기본값으로 설정합니다.")
+            self.translation_bulk_concurrency = 8
+
+        if self.translation_max_retries < 0:
+            logger.warning(f"잘못된 translation_max_retries 값: {self.translation_max_retries}. 기본값으로 설정합니다.")
+            self.translation_max_retries = 2
+
+        if self.translation_segment_chars < 0:
+            logger.warning(f"잘못된 translation_segment_chars 값: {self.translation_segment_chars}. 기본값으로 설정합니다.")
+            self.translation_segment_chars = 1200
+
+        if self.translation_cache_max_mb <= 0:
+            logger.warning(f"잘못된 translation_cache_max_mb 값: {self.translation_cache_max_mb}. 기본값으로 설정합니다.")
+            self.translation_cache_max_mb = 256
+
+        if self.answer_cache_size <= 0:
+            logger.warning(f"잘못된 answer_cache_size 값: {self.answer_cache_size}. 기본값으로 설정합니다.")
+            self.answer_cache_size = 256
             
         logger.info(f"OpenAI 설정 로드 완료 - 모델: {self.chat_model}, 임베딩: {self.embedding_model}")
     
@@ -82,5 +197,5 @@ class OpenAIConfig:
         }
 
 
-# 전역 설정 인스턴스
-openai_config = OpenAIConfig()
+# 전역 설정 인스턴스 (첫 사용 시 환경 변수를 읽어 생성)
+openai_config = LazyInstance(OpenAIConfig)
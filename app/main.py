@@ -1,11 +1,123 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from loguru import logger
 
+from app.api.endpoints import metrics
+from app.api.middleware import MetricsMiddleware
 from app.api.routers import api_router
 
+# 서버 준비 단계 (모두 True가 되면 /api/ready가 200)
+READINESS_CHECKS = ("index", "embeddings", "pipelines", "reranker")
+# 준비 실패 시 재시도 대기 시간 (초, 실패할 때마다 두 배로 늘리고 최대값에서 유지)
+WARM_UP_RETRY_BASE_DELAY = 1.0
+WARM_UP_RETRY_MAX_DELAY = 60.0
+
+
+def _prepare(readiness: dict):
+    """
+    인덱스 로드와 모델/클라이언트 준비 (무거운 모듈은 여기서 처음 로드)
+    이미 끝난 단계는 건너뛰므로 실패 후 다시 호출하면 남은 단계만 진행
+    """
+    from app.api.endpoints.chatbot import openAiService
+    from app.services.Reranker import reranker
+    from app.services.VectorIndexManager import vector_index_manager
+    from etl.pdf.embedding_backends import warm_up
+
+    # FAISS 인덱스는 시작 시 한 번만 로드하고, 이후 게시되는 새 인덱스는 감시하여 교체
+    if not readiness["index"]:
+        vector_index_manager.reload()
+        readiness["index"] = vector_index_manager.version is not None
+    # 로컬 임베딩 백엔드는 모델을 미리 메모리에 올려 첫 질의 지연을 없앰
+    if not readiness["embeddings"]:
+        warm_up(vector_index_manager.embedding_service.config.embedding_model)
+        readiness["embeddings"] = True
+    # 언어별 RAG 프롬프트/체인을 미리 구성하여 요청마다 다시 만들지 않음 (OpenAI 클라이언트도 이때 생성)
+    if not readiness["pipelines"]:
+        openAiService.pipelines.build()
+        readiness["pipelines"] = True
+    # 재순위 모델은 첫 요청 전에 로드 (RERANKER_ENABLED일 때만)
+    if not readiness["reranker"]:
+        reranker.load()
+        readiness["reranker"] = True
+
+    if not readiness["index"]:
+        raise RuntimeError("게시된 FAISS 인덱스가 없습니다.")
+
+
+def _start_index_watch() -> bool:
+    """게시된 인덱스 변경 감시 시작 (성공 여부 반환)"""
+    try:
+        from app.services.VectorIndexManager import vector_index_manager
+        vector_index_manager.start_watching()
+        return True
+    except Exception as e:
+        logger.error(f"FAISS 인덱스 변경 감시 시작 중 오류: {str(e)}")
+        return False
+
+
+async def _warm_up(app: FastAPI):
+    """
+    준비 작업이 모두 끝날 때까지 지수 백오프로 재시도
+    마지막 오류는 /api/ready 응답에 노출하고, 인덱스 감시는 준비 성공 여부와 무관하게 시작
+    """
+    delay = WARM_UP_RETRY_BASE_DELAY
+    watching = False
+    while True:
+        try:
+            await asyncio.to_thread(_prepare, app.state.readiness)
+            app.state.readiness_error = None
+        except Exception as e:
+            app.state.readiness_error = f"{type(e).__name__}: {e}"
+            logger.error(f"서비스 준비 중 오류 ({delay:g}초 후 재시도): {str(e)}")
+
+        # 첫 준비가 실패해도 감시는 시작하여 이후 게시되는 인덱스를 로드
+        if not watching:
+            watching = _start_index_watch()
+
+        if app.state.readiness_error is None and watching:
+            logger.info(f"서비스 준비 완료: {app.state.readiness}")
+            return
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WARM_UP_RETRY_MAX_DELAY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 준비 작업은 백그라운드에서 진행하여 서버는 바로 요청을 받고(liveness: /api/health),
+    # 준비가 끝나면 /api/ready가 200을 반환 (그 전에 들어온 요청은 필요한 자원을 직접 로드)
+    app.state.readiness = {check: False for check in READINESS_CHECKS}
+    app.state.readiness_error = None
+    warm_up_task = asyncio.create_task(_warm_up(app))
+    yield
+    app.state.readiness = {check: False for check in READINESS_CHECKS}
+    app.state.readiness_error = None
+    warm_up_task.cancel()
+    await asyncio.gather(warm_up_task, return_exceptions=True)
+
+    from app.services.VectorIndexManager import vector_index_manager
+    from etl.pdf.http_pool import openai_http_pool
+    from etl.pdf.lazy import is_created
+
+    if is_created(vector_index_manager):
+        await vector_index_manager.stop_watching()
+    if is_created(openai_http_pool):
+        logger.info(f"OpenAI 연결 풀 통계: {openai_http_pool.get_stats()}")
+        logger.info(f"OpenAI 호출 제어 통계: {openai_http_pool.governor.get_stats()}")
+        await openai_http_pool.aclose()
+
+
 app = FastAPI(
     title="LocalLinker AI service",
     description="로컬링커 팀 AI 서비스 API입니다.",
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan
 )
 
-app.include_router(api_router, prefix="/api")
\ No newline at end of file
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(api_router, prefix="/api")
+# Prometheus 수집 경로는 관례대로 루트에 노출
+app.include_router(metrics.router, tags=["metrics"])
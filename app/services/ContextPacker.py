@@ -0,0 +1,184 @@
+"""
+컨텍스트 패커
+검색된 청크 중 거의 같은 내용을 제거하고 토큰 예산 안에서 프롬프트 컨텍스트를 구성
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from langchain_core.documents import Document
+from loguru import logger
+
+from app.config.OpenAIConfig import openai_config
+from etl.pdf.lazy import LazyInstance
+
+CONTEXT_SEPARATOR = "\n\n"
+
+
+class _CharEncoding:
+    """tiktoken 인코딩을 불러올 수 없을 때 사용하는 추정 인코딩 (문자 1개 = 토큰 1개, 상한 추정)"""
+
+    name = "char-estimate"
+
+    def encode(self, text: str) -> list:
+        return list(text)
+
+    def decode(self, tokens: list) -> str:
+        return "".join(tokens)
+
+
+@dataclass
+class PackedContext:
+    """패킹된 컨텍스트와 토큰 집계"""
+    text: str
+    documents: List[Document] = field(default_factory=list)
+    tokens: int = 0
+    original_tokens: int = 0
+    duplicates: int = 0
+    truncated: bool = False
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(self.original_tokens - self.tokens, 0)
+
+
+class ContextPacker:
+    """토큰 예산 기반 컨텍스트 구성기"""
+
+    # 예산이 이보다 적게 남으면 청크를 잘라 넣지 않음
+    MIN_CHUNK_TOKENS = 32
+    # 중복 판정에 사용하는 문자 n-gram 길이
+    SHINGLE_SIZE = 3
+
+    def __init__(self, token_budget: int, dedup_threshold: float, model: Optional[str] = None, encoding=None):
+        """
+        Args:
+            token_budget: 컨텍스트 최대 토큰 수
+            dedup_threshold: 이미 선택된 청크와의 문자 n-gram Jaccard 유사도가 이 값 이상이면 제외
+            model: 토큰 계산에 사용할 모델명 (tiktoken)
+            encoding: 토큰 인코딩 (지정하지 않으면 첫 사용 시 tiktoken에서 로드)
+        """
+        self.token_budget = token_budget
+        self.dedup_threshold = dedup_threshold
+        self.model = model
+        self._encoding = encoding
+        self._lock = threading.Lock()
+
+        self._requests = 0
+        self._original_tokens = 0
+        self._packed_tokens = 0
+        self._duplicates = 0
+
+    @property
+    def encoding(self):
+        """토큰 인코딩 (tiktoken 파일을 받을 수 없는 환경에서는 문자 수로 추정)"""
+        if self._encoding is None:
+            try:
+                import tiktoken
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model or "")
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken 인코딩 로드 실패, 문자 수로 토큰을 추정합니다: {str(e)}")
+                self._encoding = _CharEncoding()
+        return self._encoding
+
+    def count_tokens(self, text: str) -> int:
+        """텍스트 토큰 수"""
+        return len(self.encoding.encode(text))
+
+    def _shingles(self, text: str) -> set:
+        normalized = " ".join(text.split())
+        size = self.SHINGLE_SIZE
+        if len(normalized) <= size:
+            return {normalized}
+        return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+    def _is_duplicate(self, shingles: set, selected: List[set]) -> bool:
+        for other in selected:
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= self.dedup_threshold:
+                return True
+        return False
+
+    def pack(self, docs: List[Document]) -> PackedContext:
+        """
+        검색 순위대로 청크를 담되 중복 청크는 건너뛰고 예산을 넘으면 잘라냄
+
+        Args:
+            docs: 관련도 순으로 정렬된 검색 결과
+
+        Returns:
+            패킹된 컨텍스트 (원래 컨텍스트 대비 절약한 토큰 수 포함)
+        """
+        encoding = self.encoding
+        separator_tokens = len(encoding.encode(CONTEXT_SEPARATOR))
+        original_tokens = len(encoding.encode(CONTEXT_SEPARATOR.join(doc.page_content for doc in docs)))
+
+        texts, documents, selected_shingles = [], [], []
+        used, duplicates, truncated = 0, 0, False
+        for doc in docs:
+            text = doc.page_content.strip()
+            if not text:
+                continue
+
+            shingles = self._shingles(text)
+            if self._is_duplicate(shingles, selected_shingles):
+                duplicates += 1
+                continue
+
+            remaining = self.token_budget - used - (separator_tokens if texts else 0)
+            tokens = encoding.encode(text)
+            if len(tokens) > remaining:
+                if remaining < self.MIN_CHUNK_TOKENS:
+                    truncated = True
+                    break
+                tokens = tokens[:remaining]
+                text = encoding.decode(tokens)
+                truncated = True
+
+            used += len(tokens) + (separator_tokens if texts else 0)
+            texts.append(text)
+            selected_shingles.append(shingles)
+            documents.append(Document(page_content=text, metadata=doc.metadata))
+
+            if truncated:
+                break
+
+        packed = PackedContext(
+            text=CONTEXT_SEPARATOR.join(texts),
+            documents=documents,
+            tokens=used,
+            original_tokens=original_tokens,
+            duplicates=duplicates,
+            truncated=truncated
+        )
+
+        with self._lock:
+            self._requests += 1
+            self._original_tokens += packed.original_tokens
+            self._packed_tokens += packed.tokens
+            self._duplicates += packed.duplicates
+
+        return packed
+
+    def get_stats(self) -> dict:
+        """누적 프롬프트 컨텍스트 토큰 통계"""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "original_tokens": self._original_tokens,
+                "packed_tokens": self._packed_tokens,
+                "saved_tokens": max(self._original_tokens - self._packed_tokens, 0),
+                "duplicates": self._duplicates,
+                "encoding": getattr(self._encoding, "name", None)
+            }
+
+
+# 전역 컨텍스트 패커 인스턴스 (첫 사용 시 생성)
+context_packer = LazyInstance(lambda: ContextPacker(
+    token_budget=openai_config.context_token_budget,
+    dedup_threshold=openai_config.context_dedup_threshold,
+    model=openai_config.chat_model
+))
@@ -0,0 +1,87 @@
+"""
+하이브리드 검색기
+FAISS 벡터 검색과 BM25 어휘 검색 결과를 Reciprocal Rank Fusion으로 결합
+"""
+import asyncio
+from typing import Any, List, Literal, Optional
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from etl.pdf.lexical_index import reciprocal_rank_fusion
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    언어별 인덱스 하나에 대한 검색기
+
+    mode:
+        hybrid  - 벡터 + 어휘 검색 결합
+        vector  - 벡터 검색만 사용
+        lexical - 어휘 검색만 사용 (임베딩 API 호출 없음)
+    """
+    vector_db: Any
+    lexical_index: Optional[Any] = None
+    k: int = 5
+    fetch_k: int = 20
+    mode: Literal["hybrid", "vector", "lexical"] = "hybrid"
+    rrf_k: int = 60
+
+    @property
+    def uses_embedding(self) -> bool:
+        """질의 임베딩이 필요한지 여부"""
+        return self.mode != "lexical" or self.lexical_index is None
+
+    def vector_search_rows(self, embeddings) -> List[List[int]]:
+        """질의 임베딩 행렬을 한 번의 FAISS 검색으로 처리하여 질의별 행 번호 반환"""
+        queries = np.asarray(embeddings, dtype=np.float32)
+        if self.vector_db._normalize_L2:
+            faiss.normalize_L2(queries)
+
+        fetch_k = self.fetch_k if self.mode == "hybrid" and self.lexical_index is not None else self.k
+        _, indices = self.vector_db.index.search(queries, fetch_k)
+        return [[int(i) for i in row if i != -1] for row in indices]
+
+    def combine(self, query: str, vector_rows: Optional[List[int]]) -> List[Document]:
+        """
+        벡터 검색 결과에 어휘 검색 결과를 결합하여 상위 k개 문서 반환
+
+        Args:
+            query: 검색어
+            vector_rows: 벡터 검색 행 번호 (임베딩을 사용할 수 없으면 None → 어휘 검색만 사용)
+
+        Returns:
+            검색된 문서 목록
+        """
+        rankings = []
+        if vector_rows is not None and self.mode != "lexical":
+            rankings.append(vector_rows)
+        if self.lexical_index is not None and (self.mode != "vector" or vector_rows is None):
+            rankings.append(self.lexical_index.search(query, self.fetch_k))
+
+        rows = rankings[0] if len(rankings) == 1 else reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        return [
+            self.vector_db.docstore.search(self.vector_db.index_to_docstore_id[row])
+            for row in rows[:self.k]
+        ]
+
+    def search(self, query: str, embedding=None) -> List[Document]:
+        """임베딩(없으면 어휘 검색만)으로 문서 검색"""
+        vector_rows = self.vector_search_rows([embedding])[0] if embedding is not None else None
+        return self.combine(query, vector_rows)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        embedding = self.vector_db.embeddings.embed_query(query) if self.uses_embedding else None
+        return self.search(query, embedding)
+
+    async def _aget_relevant_documents(
+            self,
+            query: str,
+            *,
+            run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        embedding = await self.vector_db.embeddings.aembed_query(query) if self.uses_embedding else None
+        return await asyncio.to_thread(self.search, query, embedding)
@@ -0,0 +1,357 @@
+"""
+Prometheus 지표
+단계별 지연 히스토그램, 토큰/오류 카운터, 진행 중 요청 게이지를 모아 /metrics에서 텍스트 형식으로 노출
+(prometheus_client 없이 텍스트 노출 형식 0.0.4를 직접 생성, 캐시 통계 등은 수집 시점에 조회)
+요청이 단계별 시간을 요청하면(Server-Timing) 같은 측정값을 요청별로도 모음
+"""
+import bisect
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 단계별 지연 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 현재 요청의 엔드포인트 (미들웨어가 설정하고 서비스 계층 지표 라벨로 사용)
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="none")
+# 현재 요청의 단계별 소요 시간 (ms, 요청이 시간 측정을 요청했을 때만 dict)
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        name = f"{name}{{{label_text}}}"
+    value = float(value)
+    if value == float("inf"):
+        return f"{name} +Inf"
+    return f"{name} {int(value)}" if value.is_integer() else f"{name} {value!r}"
+
+
+class _Metric:
+    """라벨 조합별 값을 가지는 지표"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(f"{self.name}_total", self._labels(key), value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    samples.append((f"{self.name}_bucket", {**labels, "le": le}, cumulative))
+                samples.append((f"{self.name}_count", labels, cumulative))
+                samples.append((f"{self.name}_sum", labels, total))
+        return samples
+
+
+class MetricsRegistry:
+    """지표 모음과 수집 시점 콜렉터 (콜렉터는 (이름, 유형, 설명, 샘플 목록)을 반환)"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        families = [(m.name, m.type, m.documentation, m.samples()) for m in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+
+        lines = []
+        for name, metric_type, documentation, samples in families:
+            # 0.0.4 형식은 카운터 메타데이터도 샘플 이름(_total)으로 기술
+            if metric_type == "counter":
+                name = f"{name}_total"
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(_format_sample(*sample) for sample in samples)
+        return "\n".join(lines) + "\n"
+
+
+class ServiceMetrics:
+    """서비스 지표 (엔드포인트 라벨은 current_endpoint에서 가져옴)"""
+
+    def __init__(self, registry: MetricsRegistry = None):
+        self.registry = registry or MetricsRegistry()
+        register = self.registry.register
+
+        self.request_duration = register(Histogram(
+            "http_request_duration_seconds", "HTTP 요청 처리 시간", ("endpoint", "method", "status")
+        ))
+        self.requests_in_flight = register(Gauge(
+            "http_requests_in_flight", "처리 중인 HTTP 요청 수", ("endpoint",)
+        ))
+        self.stage_duration = register(Histogram(
+            "rag_stage_duration_seconds",
+            "OpenAIService 단계별 소요 시간 (index, embedding, search, prompt_build, llm, parse)",
+            ("stage", "endpoint", "language")
+        ))
+        self.llm_tokens = register(Counter(
+            "llm_tokens", "LLM 토큰 수 (kind: prompt/completion)", ("kind", "endpoint", "language")
+        ))
+        self.cache_lookups = register(Counter(
+            "cache_lookups", "캐시 조회 수 (result: hit/miss)", ("cache", "result", "endpoint", "language")
+        ))
+        self.errors = register(Counter(
+            "errors", "처리 중 발생한 오류 수 (type: 예외 클래스)", ("type", "endpoint", "language")
+        ))
+
+    @contextmanager
+    def stage(self, stage: str, language: str):
+        """OpenAIService 단계 소요 시간 측정 (요청별 시간 측정 중이면 요청 단위로도 누적)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_duration.observe(elapsed, stage=stage, endpoint=current_endpoint.get(), language=language)
+            timings = request_timings.get()
+            if timings is not None:
+                timings[stage] = timings.get(stage, 0.0) + elapsed * 1000
+
+    @staticmethod
+    def start_request_timings() -> Dict[str, float]:
+        """현재 요청의 단계별 시간 측정 시작 (요청 처리 중 호출되는 stage가 이 dict에 기록)"""
+        timings = {}
+        request_timings.set(timings)
+        return timings
+
+    @staticmethod
+    def mark_first(name: str, start: float):
+        """요청별 시간 측정 중이면 start부터 지금까지의 시간을 처음 한 번만 기록 (예: 첫 토큰 시간)"""
+        timings = request_timings.get()
+        if timings is not None and name not in timings:
+            timings[name] = (time.perf_counter() - start) * 1000
+
+    def record_tokens(self, language: str, prompt_tokens: int, completion_tokens: int):
+        endpoint = current_endpoint.get()
+        self.llm_tokens.inc(prompt_tokens, kind="prompt", endpoint=endpoint, language=language)
+        self.llm_tokens.inc(completion_tokens, kind="completion", endpoint=endpoint, language=language)
+
+    def record_cache(self, cache: str, hit: bool, language: str):
+        self.cache_lookups.inc(
+            cache=cache, result="hit" if hit else "miss", endpoint=current_endpoint.get(), language=language
+        )
+
+    def record_error(self, error: BaseException, language: str):
+        self.errors.inc(type=type(error).__name__, endpoint=current_endpoint.get(), language=language)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+def _created_instance(module_name: str, attribute: str):
+    """이미 import되고 생성된 전역 인스턴스만 반환 (지표 수집이 무거운 모듈 로드/생성을 유발하지 않도록)"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        return None
+    instance = getattr(module, attribute, None)
+    lazy = sys.modules.get("etl.pdf.lazy")
+    if instance is None or (lazy is not None and not lazy.is_created(instance)):
+        return None
+    return instance
+
+
+def collect_component_stats() -> List[Tuple[str, str, str, List[Sample]]]:
+    """
+    캐시 적중률, 요청 병합, 파이프라인 재사용, 컨텍스트 토큰 절약, 재순위,
+    연결 재사용, 호출 제어 통계 (수집 시점 조회)
+    """
+    cache_hits, cache_misses, cache_ratio = [], [], []
+
+    def add_cache(cache: str, stats: dict):
+        cache_hits.append(("cache_hits_total", {"cache": cache}, stats.get("hits", 0)))
+        cache_misses.append(("cache_misses_total", {"cache": cache}, stats.get("misses", 0)))
+        cache_ratio.append(("cache_hit_ratio", {"cache": cache}, stats.get("hit_ratio", 0.0)))
+
+    answer_cache = _created_instance("app.services.SemanticAnswerCache", "semantic_answer_cache")
+    if answer_cache is not None:
+        add_cache("answer", answer_cache.get_stats())
+
+    translation_cache = _created_instance("app.services.TranslationCache", "translation_cache")
+    if translation_cache is not None:
+        add_cache("translation", translation_cache.get_stats())
+
+    index_manager = _created_instance("app.services.VectorIndexManager", "vector_index_manager")
+    if index_manager is not None:
+        embedding_model = index_manager.embedding_service.config.embedding_model
+        if hasattr(getattr(embedding_model, "cache", None), "get_stats"):
+            add_cache("query_embedding", embedding_model.cache.get_stats())
+
+    families = [
+        ("cache_hits", "counter", "캐시 적중 수", cache_hits),
+        ("cache_misses", "counter", "캐시 미적중 수", cache_misses),
+        ("cache_hit_ratio", "gauge", "캐시 적중률", cache_ratio)
+    ]
+
+    single_flight = _created_instance("app.services.SingleFlight", "single_flight")
+    if single_flight is not None:
+        stats = single_flight.get_stats()
+        families.append(("single_flight_inflight", "gauge", "실행 중인 병합 대상 요청 수", [
+            ("single_flight_inflight", {"kind": kind}, values["inflight"]) for kind, values in stats.items()
+        ]))
+        families.append(("single_flight_saved_calls", "counter", "요청 병합으로 절약한 호출 수", [
+            ("single_flight_saved_calls_total", {"kind": kind}, values["saved_calls"]) for kind, values in stats.items()
+        ]))
+
+    chatbot_service = _created_instance("app.api.endpoints.chatbot", "openAiService")
+    if chatbot_service is not None:
+        stats = chatbot_service.pipelines.get_stats()
+        families.append(("rag_pipeline_build_seconds", "gauge", "언어별 RAG 파이프라인 구성에 걸린 시간 합계", [
+            ("rag_pipeline_build_seconds", {}, stats["build_ms"] / 1000)
+        ]))
+        families.append(("rag_pipeline_reuses", "counter", "미리 구성한 파이프라인/검색기 재사용 수", [
+            ("rag_pipeline_reuses_total", {}, stats["reuses"])
+        ]))
+        families.append(("rag_pipeline_saved_seconds", "counter", "재사용으로 절약한 구성 시간", [
+            ("rag_pipeline_saved_seconds_total", {}, stats["saved_ms"] / 1000)
+        ]))
+
+    context_packer = _created_instance("app.services.ContextPacker", "context_packer")
+    if context_packer is not None:
+        stats = context_packer.get_stats()
+        families.append(("context_tokens", "counter", "프롬프트 컨텍스트 토큰 수 (kind: original/packed/saved)", [
+            ("context_tokens_total", {"kind": kind}, stats[f"{kind}_tokens"]) for kind in ("original", "packed", "saved")
+        ]))
+        families.append(("context_duplicate_chunks", "counter", "컨텍스트 구성 시 제거한 중복 청크 수", [
+            ("context_duplicate_chunks_total", {}, stats["duplicates"])
+        ]))
+
+    reranker = _created_instance("app.services.Reranker", "reranker")
+    if reranker is not None:
+        stats = reranker.get_stats()
+        families.append(("reranker_requests", "counter", "재순위 요청 수 (result: reranked/skipped)", [
+            ("reranker_requests_total", {"result": result}, stats[result]) for result in ("reranked", "skipped")
+        ]))
+        families.append(("reranker_latency_seconds", "gauge", "재순위 지연 시간 (kind: avg/ewma)", [
+            ("reranker_latency_seconds", {"kind": "avg"}, stats["avg_ms"] / 1000),
+            ("reranker_latency_seconds", {"kind": "ewma"}, stats["latency_ewma_ms"] / 1000)
+        ]))
+
+    http_pool = _created_instance("etl.pdf.http_pool", "openai_http_pool")
+    if http_pool is not None:
+        stats = http_pool.get_stats()
+        families.append(("openai_http_requests", "counter", "OpenAI HTTP 요청 수", [
+            ("openai_http_requests_total", {}, stats["requests"])
+        ]))
+        families.append(("openai_http_connection_reuse_ratio", "gauge", "OpenAI HTTP 연결 재사용 비율", [
+            ("openai_http_connection_reuse_ratio", {}, stats["reuse_ratio"])
+        ]))
+
+    governor = _created_instance("etl.pdf.openai_governor", "openai_governor")
+    if governor is not None:
+        stats = governor.get_stats()
+        families.append(("openai_rate_limited", "counter", "OpenAI 429 응답 수", [
+            ("openai_rate_limited_total", {}, stats["rate_limited"])
+        ]))
+        families.append(("openai_retries", "counter", "OpenAI 요청 재시도 수", [
+            ("openai_retries_total", {}, stats["retries"])
+        ]))
+        families.append(("openai_circuit_open", "gauge", "서킷 브레이커 열림 여부 (half_open은 0.5)", [
+            ("openai_circuit_open", {}, {"closed": 0, "half_open": 0.5, "open": 1}.get(stats["breaker_state"], 0))
+        ]))
+
+    return families
+
+
+# 전역 지표 인스턴스
+service_metrics = ServiceMetrics()
+service_metrics.registry.add_collector(collect_component_stats)
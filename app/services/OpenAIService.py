@@ -1,106 +1,682 @@
 """
 OpenAI API 서비스
 """
-from langchain.chains.retrieval_qa.base import RetrievalQA
+import asyncio
+import random
+import time
+from typing import AsyncIterator, List
+from uuid import UUID
+
+import numpy as np
 from langchain_community.chat_models import ChatOpenAI
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from loguru import logger
 
 from app.config.OpenAIConfig import openai_config
-from etl.pdf.embedding_service import EmbeddingService
+from app.services.ContextPacker import context_packer
+from app.services.HybridRetriever import HybridRetriever
+from app.services.Metrics import current_endpoint, request_timings, service_metrics
+from app.services.RagPipelineRegistry import RagPipelineRegistry
+from app.services.Reranker import reranker
+from app.services.SemanticAnswerCache import semantic_answer_cache
+from app.services.SingleFlight import single_flight
+from app.services.TranslationCache import make_translation_key, translation_cache
+from app.services.TranslationSegmenter import split_translation_segments
+from app.services.VectorIndexManager import vector_index_manager
+from etl.pdf.http_pool import openai_http_pool
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """LLM 호출별 프롬프트/응답 토큰 수를 지표로 기록 (API 사용량이 없으면 토큰 수 추정)"""
+
+    def __init__(self, language: str):
+        self.language = language
+        # 콜백이 다른 컨텍스트에서 실행되어도 호출 시점의 엔드포인트로 기록
+        self.endpoint = current_endpoint.get()
+        self._prompt_tokens = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._prompt_tokens[run_id] = sum(
+            context_packer.count_tokens(str(message.content)) for batch in messages for message in batch
+        )
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        prompt_tokens = self._prompt_tokens.pop(run_id, 0)
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            prompt_tokens = usage.get("prompt_tokens", prompt_tokens)
+            completion_tokens = usage.get("completion_tokens", 0)
+        else:
+            # 스트리밍 응답은 사용량이 오지 않으므로 생성된 텍스트로 추정
+            completion_tokens = sum(
+                context_packer.count_tokens(generation.text)
+                for generations in response.generations for generation in generations
+            )
+        token = current_endpoint.set(self.endpoint)
+        try:
+            service_metrics.record_tokens(self.language, prompt_tokens, completion_tokens)
+        finally:
+            current_endpoint.reset(token)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._prompt_tokens.pop(run_id, None)
 
 
 class OpenAIService:
     """OpenAI API 서비스"""
 
+    # 프로세스 전체에서 공유하는 LLM 동시 호출 제한 (비동기 경로 전용)
+    _llm_semaphore = None
+
+    # 번역 프롬프트/파싱 규칙 버전 (변경 시 올려서 이전 번역 캐시를 무효화)
+    TRANSLATION_PROMPT_VERSION = "1"
+
+    # 번역 프롬프트에 사용하는 언어명
+    TRANSLATION_LANGUAGE_NAMES = {
+        "ko": "한국어",
+        "en": "English",
+        "ja": "日本語",
+        "zh": "中文",
+        "vi": "Tiếng Việt",
+        "uz": "O'zbek tili",
+        "th": "ภาษาไทย"
+    }
+
     def __init__(self):
         # ChatOpenAI 클라이언트 초기화 (올바른 설정 사용)
         self.config = openai_config
-        self.client = ChatOpenAI(
+        self._client = ChatOpenAI(
             model=self.config.chat_model,
-            temperature=self.config.temperature
+            temperature=self.config.temperature,
+            # 채팅/번역/임베딩이 하나의 keep-alive 연결 풀을 공유
+            client=openai_http_pool.openai().chat.completions,
+            async_client=openai_http_pool.async_openai().chat.completions
         )
-
-    def generate_rag_answer(
+        # 언어별 RAG 프롬프트/체인 (시작 시 build()로 미리 구성)
+        self.pipelines = RagPipelineRegistry(self._build_rag_prompt, self._client, self.config)
+
+    @property
+    def client(self):
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        # 모델이 바뀌면 미리 구성된 체인도 새 모델로 다시 구성
+        self._client = client
+        self.pipelines.set_llm(client)
+
+    @classmethod
+    def _get_llm_semaphore(cls) -> asyncio.Semaphore:
+        """LLM 동시 호출 수를 제한하는 세마포어 반환"""
+        if cls._llm_semaphore is None:
+            cls._llm_semaphore = asyncio.Semaphore(openai_config.max_concurrency)
+        return cls._llm_semaphore
+
+    async def agenerate_rag_answer(
             self,
             question: str,
             language: str
     ) -> str:
         """
-        RAG를 통한 답변 생성
+        RAG를 통한 답변 생성 (비동기)
+        질의 임베딩, 검색, LLM 호출 모두 이벤트 루프를 막지 않음
+        같은 질문이 동시에 들어오면 한 번만 생성하여 결과를 공유
 
         Args:
             question: 사용자 질문
-            context: 검색된 컨텍스트
             language: 언어 코드
 
         Returns:
             생성된 답변
         """
+        key = (language, question.strip(), vector_index_manager.version)
+        return await single_flight.do("rag", key, lambda: self._agenerate_rag_answer(question, language))
+
+    async def _agenerate_rag_answer(self, question: str, language: str) -> str:
+        """RAG를 통한 답변 생성 (비동기, 요청 병합 없이 실행)"""
         try:
-            # 언어별 시스템 프롬프트 설정
-            system_prompt = self._get_system_prompt(language)
+            with service_metrics.stage("index", language):
+                snapshot = vector_index_manager.get()
+            retriever = self._get_retriever(snapshot, language)
 
-            # 사용자 메시지 구성
-            user_message = self._build_user_message(language)
+            # 질의 임베딩 (지연 시 BM25 검색만 사용), 의미 기반 캐시 조회
+            with service_metrics.stage("embedding", language):
+                embedding = await self._aembed_query(snapshot, retriever, question)
+            if self.config.answer_cache_enabled and embedding is not None:
+                cached = self._lookup_answer(language, snapshot.version, embedding, question)
+                if cached is not None:
+                    return cached
 
-            # 프롬프트 템플릿 생성
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", system_prompt),
-                ("human", user_message)
-            ])
+            with service_metrics.stage("search", language):
+                docs = await asyncio.to_thread(self._search, retriever, question, embedding)
 
-            # 벡터 db 조회
-            vector_db = EmbeddingService().load_existing_db()
+            with service_metrics.stage("prompt_build", language):
+                inputs = {"question": question, "context": self._pack_context(docs)}
 
-            # 리트리버 생성
-            retriever = vector_db.as_retriever(search_kwargs={"k": self.config.top_k})
+            chain = self.pipelines.get(language).chain
+            async with self._get_llm_semaphore():
+                with service_metrics.stage("llm", language):
+                    result = await self._ainvoke_llm(chain, inputs, self._llm_config(language))
 
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=self.client,
-                chain_type_kwargs={"prompt": prompt},
-                retriever=retriever
-            )
+            with service_metrics.stage("parse", language):
+                response = result.content.strip()
 
-            response = qa_chain(question)['result'].strip()
+            logger.info("OpenAI API를 통한 답변 생성 완료")
 
-            logger.info(f"OpenAI API를 통한 답변 생성 완료")
+            if self.config.answer_cache_enabled and embedding is not None:
+                semantic_answer_cache.store(language, snapshot.version, embedding, response, question)
 
             return response
 
         except Exception as e:
             logger.error(f"OpenAI API 호출 중 오류: {str(e)}")
+            service_metrics.record_error(e, language)
             raise
 
-    def translate_multiple_fields(self, title: str, eligibility: str, text: str, target_language: str) -> dict:
+    async def astream_rag_answer(
+            self,
+            question: str,
+            language: str
+    ) -> AsyncIterator[str]:
         """
-        여러 필드를 동시에 번역
-        
+        RAG를 통한 답변 생성 (토큰 스트리밍)
+        검색 후 LLM 토큰을 생성되는 즉시 반환
+
+        Args:
+            question: 사용자 질문
+            language: 언어 코드
+
+        Yields:
+            생성된 답변 토큰
+        """
+        try:
+            with service_metrics.stage("index", language):
+                snapshot = vector_index_manager.get()
+            retriever = self._get_retriever(snapshot, language)
+
+            with service_metrics.stage("embedding", language):
+                embedding = await self._aembed_query(snapshot, retriever, question)
+            if self.config.answer_cache_enabled and embedding is not None:
+                cached = self._lookup_answer(language, snapshot.version, embedding, question)
+                if cached is not None:
+                    yield cached
+                    return
+
+            with service_metrics.stage("search", language):
+                docs = await asyncio.to_thread(self._search, retriever, question, embedding)
+
+            with service_metrics.stage("prompt_build", language):
+                inputs = {"question": question, "context": self._pack_context(docs)}
+
+            chain = self.pipelines.get(language).chain
+            chunks = []
+            async for content in self._astream_llm(chain, inputs, language):
+                chunks.append(content)
+                yield content
+
+            logger.info("OpenAI API를 통한 스트리밍 답변 생성 완료")
+
+            if self.config.answer_cache_enabled and embedding is not None:
+                semantic_answer_cache.store(language, snapshot.version, embedding, "".join(chunks).strip(), question)
+
+        except Exception as e:
+            logger.error(f"OpenAI API 호출 중 오류: {str(e)}")
+            service_metrics.record_error(e, language)
+            raise
+
+    async def abatch_generate_rag_answers(
+            self,
+            questions: List[str],
+            languages: List[str]
+    ) -> list:
+        """
+        여러 질문에 대한 RAG 답변 일괄 생성
+        질의 임베딩 1회 요청, 언어 인덱스별 FAISS 검색 1회 후 LLM 호출을 제한된 동시성으로 병렬 처리
+        검색 방식(hybrid/vector/lexical)과 임베딩 제한 시간은 단건 질의와 동일하게 적용
+
+        Args:
+            questions: 사용자 질문 목록
+            languages: 질문별 언어 코드 목록
+
+        Returns:
+            입력 순서대로 생성된 답변 또는 해당 항목의 예외
+        """
+        with service_metrics.stage("index", "batch"):
+            snapshot = vector_index_manager.get()
+
+        rows_by_language = {}
+        for row, language in enumerate(languages):
+            rows_by_language.setdefault(snapshot.resolve_language(language), []).append(row)
+        retrievers = [None] * len(questions)
+        for language, rows in rows_by_language.items():
+            retriever = self._get_retriever(snapshot, language)
+            for row in rows:
+                retrievers[row] = retriever
+
+        # 일괄 임베딩/검색은 여러 언어를 한 번에 처리하므로 언어 라벨은 batch
+        with service_metrics.stage("embedding", "batch"):
+            embeddings = await self._aembed_queries(snapshot, retrievers, questions)
+        with service_metrics.stage("search", "batch"):
+            docs_per_question = await asyncio.to_thread(
+                self._batch_search, rows_by_language, retrievers, questions, embeddings
+            )
+
+        batch_semaphore = asyncio.Semaphore(self.config.batch_concurrency)
+
+        async def answer(question: str, language: str, embedding, docs):
+            async with batch_semaphore:
+                try:
+                    if self.config.answer_cache_enabled and embedding is not None:
+                        cached = self._lookup_answer(language, snapshot.version, embedding, question)
+                        if cached is not None:
+                            return cached
+
+                    with service_metrics.stage("prompt_build", language):
+                        inputs = {"question": question, "context": self._pack_context(docs)}
+
+                    chain = self.pipelines.get(language).chain
+                    async with self._get_llm_semaphore():
+                        with service_metrics.stage("llm", language):
+                            result = await chain.ainvoke(inputs, config=self._llm_config(language))
+
+                    with service_metrics.stage("parse", language):
+                        response = result.content.strip()
+
+                    if self.config.answer_cache_enabled and embedding is not None:
+                        semantic_answer_cache.store(language, snapshot.version, embedding, response, question)
+                    return response
+
+                except Exception as e:
+                    logger.error(f"일괄 답변 생성 중 오류: {str(e)}")
+                    service_metrics.record_error(e, language)
+                    return e
+
+        results = await asyncio.gather(*[
+            answer(question, language, embedding, docs)
+            for question, language, embedding, docs in zip(questions, languages, embeddings, docs_per_question)
+        ])
+
+        logger.info(f"OpenAI API를 통한 일괄 답변 생성 완료: {len(results)}건")
+
+        return results
+
+    @staticmethod
+    def _batch_search(rows_by_language: dict, retrievers: list, questions: List[str], embeddings: list) -> list:
+        """
+        언어 인덱스별로 임베딩이 있는 질의 행렬을 한 번의 FAISS 검색으로 처리하고
+        BM25 결과와 결합하여 질의별 문서 목록 반환 (임베딩이 없는 질의는 어휘 검색만 사용)
+        """
+        docs_per_question = [[] for _ in questions]
+        for rows in rows_by_language.values():
+            retriever = retrievers[rows[0]]
+            vector_rows = dict.fromkeys(rows)
+            embedded = [row for row in rows if embeddings[row] is not None]
+            if embedded:
+                matrix = np.asarray([embeddings[row] for row in embedded], dtype=np.float32)
+                vector_rows.update(zip(embedded, retriever.vector_search_rows(matrix)))
+            for row in rows:
+                docs_per_question[row] = retriever.combine(questions[row], vector_rows[row])
+
+        # 질의 전체의 후보를 한 번의 배치 추론으로 재순위
+        return reranker.rerank_batch(questions, docs_per_question)
+
+    @staticmethod
+    def _search(retriever: HybridRetriever, question: str, embedding) -> list:
+        """검색 후 재순위 (재순위를 사용하지 않거나 건너뛰면 검색 순위 상위 top_k개)"""
+        return reranker.rerank(question, retriever.search(question, embedding))
+
+    def _get_retriever(self, snapshot, language: str) -> HybridRetriever:
+        """질의 언어의 인덱스에 대한 검색기 (스냅샷별로 재사용)"""
+        return self.pipelines.get_retriever(snapshot, language)
+
+    @staticmethod
+    def _lookup_answer(language: str, version: str, embedding, question: str):
+        """의미 기반 답변 캐시 조회 (엔드포인트/언어별 적중 지표 기록)"""
+        cached = semantic_answer_cache.lookup(language, version, embedding, question)
+        service_metrics.record_cache("answer", cached is not None, language)
+        return cached
+
+    @staticmethod
+    async def _ainvoke_llm(chain, inputs: dict, config: dict = None):
+        """
+        체인 실행
+        요청별 시간 측정 중이면 스트리밍으로 받아 첫 토큰까지의 시간(llm_ttft)을 기록하고 응답을 합쳐 반환
+        """
+        if request_timings.get() is None:
+            return await chain.ainvoke(inputs, config=config)
+
+        start = time.perf_counter()
+        message = None
+        async for chunk in chain.astream(inputs, config=config):
+            if message is None:
+                service_metrics.mark_first("llm_ttft", start)
+                message = chunk
+            else:
+                message += chunk
+        return message if message is not None else AIMessage(content="")
+
+    async def _astream_llm(self, chain, inputs: dict, language: str) -> AsyncIterator[str]:
+        """
+        체인 스트리밍 실행
+        업스트림 토큰은 LLM 동시 호출 제한 안에서 별도 작업이 받아 큐에 넣고, 호출자는 큐에서 꺼내 전달
+        느린 클라이언트가 토큰을 읽는 동안 세마포어를 잡고 있지 않도록 업스트림이 끝나면 바로 반환
+        (큐에는 최대 응답 하나 분량의 토큰만 쌓임)
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        async def receive():
+            try:
+                async with self._get_llm_semaphore():
+                    # LLM 단계 시간은 업스트림 수신 시간만 (클라이언트 전송 대기 제외)
+                    with service_metrics.stage("llm", language):
+                        async for chunk in chain.astream(inputs, config=self._llm_config(language)):
+                            if chunk.content:
+                                queue.put_nowait(chunk.content)
+                queue.put_nowait(finished)
+            except Exception as e:
+                queue.put_nowait(e)
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # 클라이언트 연결이 끊겨 중단되면 업스트림 수신도 취소
+            receiver.cancel()
+
+    @staticmethod
+    def _llm_config(language: str) -> dict:
+        """LLM 호출 설정 (토큰 사용량 지표 콜백)"""
+        return {"callbacks": [TokenUsageHandler(language)]}
+
+    async def _aembed_query(self, snapshot, retriever: HybridRetriever, question: str):
+        """
+        질의 임베딩 (비동기)
+        임베딩 API가 제한 시간 안에 응답하지 않으면 None을 반환하여 BM25 검색만 사용
+
+        Returns:
+            질의 임베딩 (사용하지 않거나 시간 초과 시 None)
+        """
+        if not retriever.uses_embedding:
+            return None
+        return await self._await_embedding(
+            snapshot.embeddings.aembed_query(question), has_fallback=retriever.lexical_index is not None
+        )
+
+    async def _aembed_queries(self, snapshot, retrievers: List[HybridRetriever], questions: List[str]) -> list:
+        """
+        질의 임베딩 일괄 요청 (비동기)
+        임베딩이 필요한 질의만 한 번에 요청하고, 제한 시간 안에 응답하지 않으면 모두 BM25 검색만 사용
+
+        Returns:
+            질의별 임베딩 (사용하지 않거나 시간 초과 시 None)
+        """
+        embeddings = [None] * len(questions)
+        rows = [row for row, retriever in enumerate(retrievers) if retriever.uses_embedding]
+        if not rows:
+            return embeddings
+
+        vectors = await self._await_embedding(
+            snapshot.embeddings.aembed_queries([questions[row] for row in rows]),
+            has_fallback=all(retrievers[row].lexical_index is not None for row in rows)
+        )
+        if vectors is not None:
+            for row, vector in zip(rows, vectors):
+                embeddings[row] = vector
+        return embeddings
+
+    async def _await_embedding(self, embedding_call, has_fallback: bool):
+        """임베딩 요청 대기 (BM25 검색으로 대신할 수 있을 때만 제한 시간 적용, 시간 초과 시 None)"""
+        if not self.config.embedding_timeout or not has_fallback:
+            return await embedding_call
+
+        try:
+            return await asyncio.wait_for(embedding_call, timeout=self.config.embedding_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"질의 임베딩 시간 초과({self.config.embedding_timeout}초): BM25 검색만 사용")
+            return None
+
+    def _build_rag_prompt(self, language: str) -> ChatPromptTemplate:
+        """언어별 RAG 프롬프트 템플릿 구성 ({question}, {context} 변수 사용)"""
+        # 언어별 시스템 프롬프트 설정
+        system_prompt = self._get_system_prompt(language)
+
+        # 사용자 메시지 구성
+        user_message = self._build_user_message(language)
+
+        # 프롬프트 템플릿 생성
+        return ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("human", user_message)
+        ])
+
+    @staticmethod
+    def _pack_context(docs) -> str:
+        """검색된 문서에서 중복 청크를 제거하고 토큰 예산 안에서 컨텍스트 문자열 구성"""
+        packed = context_packer.pack(docs)
+        logger.info(
+            f"컨텍스트 구성: {len(packed.documents)}/{len(docs)}개 청크, {packed.tokens}토큰 "
+            f"(절약 {packed.saved_tokens}토큰, 중복 {packed.duplicates}개)"
+        )
+        return packed.text
+
+    async def atranslate_multiple_fields(self, title: str, eligibility: str, text: str, target_language: str) -> dict:
+        """
+        여러 필드를 동시에 번역 (비동기)
+        같은 내용의 번역 요청이 동시에 들어오면 LLM을 한 번만 호출하여 결과를 공유
+
         Args:
             title: 번역할 제목
             eligibility: 번역할 자격요건
             text: 번역할 본문 텍스트
             target_language: 대상 언어
-            
+
         Returns:
-            번역된 세 필드를 포함한 딕셔너리
+            번역된 세 필드와 캐시 사용 여부(cached)를 포함한 딕셔너리
         """
+        cache_key = self._translation_cache_key(title, eligibility, text, target_language)
+        cached = await self._alookup_translation(cache_key, target_language)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        result = await single_flight.do(
+            "translation", cache_key,
+            lambda: self._atranslate_multiple_fields(title, eligibility, text, target_language, cache_key)
+        )
+        # 호출자마다 별도의 딕셔너리를 받도록 복사
+        return {**result, "cached": False}
+
+    async def _atranslate_multiple_fields(
+            self,
+            title: str,
+            eligibility: str,
+            text: str,
+            target_language: str,
+            cache_key: str
+    ) -> dict:
+        """여러 필드 번역 (비동기, 요청 병합 없이 실행 후 캐시에 저장)"""
         try:
-            # 언어 코드를 언어명으로 변환
-            language_names = {
-                "ko": "한국어",
-                "en": "English", 
-                "ja": "日本語",
-                "zh": "中文",
-                "vi": "Tiếng Việt",
-                "uz": "O'zbek tili",
-                "th": "ภาษาไทย"
-            }
-            
-            target_lang_name = language_names.get(target_language, target_language)
-            
-            # 여러 필드 번역을 위한 시스템 프롬프트
-            system_prompt = f"""당신은 전문 번역가입니다. 주어진 한국어 텍스트들을 {target_lang_name}로 정확하고 자연스럽게 번역해주세요.
+            with service_metrics.stage("prompt_build", target_language):
+                chains = self._build_translation_chains(title, eligibility, text, target_language)
+            # 제목/자격요건과 본문 구간을 동시에 번역하여 가장 긴 구간 시간만큼만 소요
+            config = self._llm_config(target_language)
+            with service_metrics.stage("llm", target_language):
+                responses = await asyncio.gather(*[self._ainvoke_translation(chain, config) for chain in chains])
+
+            logger.info(f"다중 필드 번역 완료: 한국어 -> {target_language} ({len(chains)}개 구간)")
+
+            with service_metrics.stage("parse", target_language):
+                result = self._merge_translation(responses)
+            await self._astore_translation(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"다중 필드 번역 중 오류 발생: {str(e)}")
+            service_metrics.record_error(e, target_language)
+            raise
+
+    async def atranslate_bulk(self, postings: List[dict], target_languages: List[str]) -> AsyncIterator[dict]:
+        """
+        여러 공고 × 여러 언어 일괄 번역
+        (공고, 언어) 작업을 제한된 수의 워커가 처리하고 끝나는 순서대로 결과를 반환
+        항목별 실패는 재시도 후 오류로 반환하며 나머지 작업은 계속 진행
+
+        Args:
+            postings: posting_id, title, eligibility, text를 포함한 공고 목록
+            target_languages: 대상 언어 목록
+
+        Yields:
+            작업별 결과 (posting_id, target_language, 번역 필드 또는 error, attempts)
+        """
+        jobs = asyncio.Queue()
+        for posting in postings:
+            for language in target_languages:
+                jobs.put_nowait((posting, language))
+        total = jobs.qsize()
+        results = asyncio.Queue()
+
+        async def worker():
+            while True:
+                try:
+                    posting, language = jobs.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await results.put(await self._atranslate_with_retry(posting, language))
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.config.translation_bulk_concurrency, total))
+        ]
+        try:
+            for _ in range(total):
+                yield await results.get()
+        finally:
+            # 클라이언트 연결이 끊기면 남은 작업 중단
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _atranslate_with_retry(self, posting: dict, target_language: str) -> dict:
+        """번역 작업 하나를 재시도 포함하여 실행 (예외 대신 error 필드로 실패 반환)"""
+        item = {"posting_id": posting.get("posting_id"), "target_language": target_language}
+        max_attempts = self.config.translation_max_retries + 1
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                result = await self.atranslate_multiple_fields(
+                    title=posting["title"],
+                    eligibility=posting["eligibility"],
+                    text=posting["text"],
+                    target_language=target_language
+                )
+                return {**item, **result, "attempts": attempt, "error": None}
+
+            except Exception as e:
+                if attempt == max_attempts:
+                    logger.error(f"일괄 번역 항목 실패 ({item['posting_id']}, {target_language}): {str(e)}")
+                    return {**item, "attempts": attempt, "error": str(e)}
+
+                delay = self._retry_delay(attempt, e)
+                logger.warning(
+                    f"일괄 번역 항목 재시도 {attempt}/{max_attempts - 1} "
+                    f"({item['posting_id']}, {target_language}), {delay:.2f}초 후: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지수 백오프 + 지터)"""
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        try:
+            if retry_after is not None:
+                return float(retry_after)
+        except ValueError:
+            pass
+        return self.config.translation_retry_base_delay * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+    def _translation_cache_key(self, title: str, eligibility: str, text: str, target_language: str) -> str:
+        """번역 캐시 키 (모델, 대상 언어, 입력 필드, 프롬프트 버전)"""
+        return make_translation_key(
+            self.config.chat_model, target_language, title, eligibility, text, self.TRANSLATION_PROMPT_VERSION
+        )
+
+    @staticmethod
+    async def _alookup_translation(cache_key: str, target_language: str):
+        """번역 캐시 조회 (비동기, SQLite I/O는 스레드에서 실행)"""
+        cached = await translation_cache.aget(cache_key)
+        service_metrics.record_cache("translation", cached is not None, target_language)
+        return cached
+
+    @staticmethod
+    async def _astore_translation(cache_key: str, result: dict):
+        """파싱된 필드가 있는 번역 결과만 캐시에 저장 (비동기)"""
+        if any(result.values()):
+            await translation_cache.aset(cache_key, result)
+
+    def _build_translation_chains(self, title: str, eligibility: str, text: str, target_language: str) -> list:
+        """
+        번역 체인 목록 구성
+        첫 체인은 제목/자격요건과 본문 첫 구간, 나머지는 본문 구간별 체인 (본문이 짧으면 체인 하나)
+        """
+        segments = split_translation_segments(text, self.config.translation_segment_chars)
+        chains = [self._build_translation_prompt(title, eligibility, segments[0], target_language) | self.client]
+        chains.extend(
+            self._build_segment_prompt(segment, target_language) | self.client
+            for segment in segments[1:]
+        )
+        return chains
+
+    async def _ainvoke_translation(self, chain, config: dict = None):
+        """번역 체인 하나 실행 (LLM 동시 호출 제한 적용)"""
+        async with self._get_llm_semaphore():
+            return await self._ainvoke_llm(chain, {}, config)
+
+    def _merge_translation(self, responses: list) -> dict:
+        """첫 응답의 필드 파싱 결과 뒤에 본문 구간 번역을 원래 순서대로 이어 붙임"""
+        result = self._parse_translation(responses[0].content.strip())
+        if len(responses) > 1:
+            # 필드 파싱과 같은 규칙으로 줄 정리 (앞뒤 공백 제거, 빈 줄 제외)
+            lines = [result["text"]] if result["text"] else []
+            for response in responses[1:]:
+                lines.extend(line.strip() for line in response.content.split("\n") if line.strip())
+            result["text"] = "\n".join(lines)
+        return result
+
+    def _build_segment_prompt(self, segment: str, target_language: str) -> ChatPromptTemplate:
+        """본문 구간 번역 프롬프트 구성 (번역문만 응답)"""
+        target_lang_name = self.TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)
+
+        system_prompt = f"""당신은 전문 번역가입니다. 주어진 한국어 텍스트를 {target_lang_name}로 정확하고 자연스럽게 번역해주세요.
+
+번역 원칙:
+1. 원문의 의미와 뉘앙스를 정확히 전달
+2. 대상 언어의 자연스러운 표현 사용
+3. ■ 섹션 제목, 목록 기호, 줄바꿈 구조를 그대로 유지
+4. 설명이나 머리말 없이 번역문만 응답
+
+한국어 → {target_lang_name}"""
+
+        # 본문에 중괄호가 있어도 템플릿 변수로 해석되지 않도록 메시지 객체로 전달
+        return ChatPromptTemplate.from_messages([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=segment)
+        ])
+
+    def _build_translation_prompt(self, title: str, eligibility: str, text: str, target_language: str) -> ChatPromptTemplate:
+        """다중 필드 번역 프롬프트 구성"""
+        # 언어 코드를 언어명으로 변환
+        target_lang_name = self.TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)
+        
+        # 여러 필드 번역을 위한 시스템 프롬프트
+        system_prompt = f"""당신은 전문 번역가입니다. 주어진 한국어 텍스트들을 {target_lang_name}로 정확하고 자연스럽게 번역해주세요.
 
 번역 원칙:
 1. 원문의 의미와 뉘앙스를 정확히 전달
@@ -111,8 +687,8 @@ class OpenAIService:
 
 한국어 → {target_lang_name}"""
 
-            # 여러 필드를 하나의 요청으로 처리
-            user_message = f"""다음 3개의 한국어 텍스트를 {target_lang_name}로 번역해주세요:
+        # 여러 필드를 하나의 요청으로 처리
+        user_message = f"""다음 3개의 한국어 텍스트를 {target_lang_name}로 번역해주세요:
 
 제목: {title}
 
@@ -125,75 +701,65 @@ class OpenAIService:
 자격요건: [번역된 자격요건]
 본문: [번역된 본문]"""
 
-            # 프롬프트 템플릿 생성
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", system_prompt),
-                ("human", user_message)
-            ])
-
-            # 체인 생성 및 실행
-            chain = prompt | self.client
-            response = chain.invoke({})
-            translated_text = response.content.strip()
-
-            logger.info(f"다중 필드 번역 완료: 한국어 -> {target_language}")
+        # 프롬프트 템플릿 생성
+        return ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("human", user_message)
+        ])
+
+    def _parse_translation(self, translated_text: str) -> dict:
+        """번역 응답을 필드별로 파싱 (여러 줄 본문 처리)"""
+        lines = translated_text.split('\n')
+        translated_title = ""
+        translated_eligibility = ""
+        translated_main_text = ""
+        
+        current_field = None
+        content_lines = []
 
-            # 응답 파싱 개선 (여러 줄 본문 처리)
-            lines = translated_text.split('\n')
-            translated_title = ""
-            translated_eligibility = ""
-            translated_main_text = ""
+        for i, line in enumerate(lines):
+            line_stripped = line.strip()
             
-            current_field = None
-            content_lines = []
-
-            for i, line in enumerate(lines):
-                line_stripped = line.strip()
-                
-                # 제목 필드 시작
-                if line_stripped.startswith('제목:') or line_stripped.startswith('Title:') or line_stripped.startswith('タイトル:') or line_stripped.startswith('标题:') or line_stripped.startswith('Tiêu đề:') or line_stripped.startswith('Sarlavha:') or line_stripped.startswith('หัวข้อ:'):
-                    if current_field == 'text' and content_lines:
-                        translated_main_text = '\n'.join(content_lines).strip()
-                    current_field = 'title'
-                    content_lines = []
-                    translated_title = line_stripped.split(':', 1)[1].strip()
-                
-                # 자격요건 필드 시작
-                elif line_stripped.startswith('자격요건:') or line_stripped.startswith('Eligibility:') or line_stripped.startswith('資格要件:') or line_stripped.startswith('资格要求:') or line_stripped.startswith('Điều kiện:') or line_stripped.startswith('Malaka talablari:') or line_stripped.startswith('คุณสมบัติ:'):
-                    if current_field == 'text' and content_lines:
-                        translated_main_text = '\n'.join(content_lines).strip()
-                    current_field = 'eligibility'
-                    content_lines = []
-                    translated_eligibility = line_stripped.split(':', 1)[1].strip()
-                
-                # 본문 필드 시작
-                elif line_stripped.startswith('본문:') or line_stripped.startswith('Content:') or line_stripped.startswith('本文:') or line_stripped.startswith('正文:') or line_stripped.startswith('Nội dung:') or line_stripped.startswith('Matn:') or line_stripped.startswith('เนื้อหา:'):
-                    current_field = 'text'
-                    content_lines = []
-                    # 첫 번째 줄 처리
-                    first_line_content = line_stripped.split(':', 1)[1].strip()
-                    if first_line_content:
-                        content_lines.append(first_line_content)
-                
-                # 본문의 추가 줄들 처리
-                elif current_field == 'text' and line_stripped:
-                    # 다음 필드가 시작되지 않은 경우 본문의 일부로 처리
-                    if not any(line_stripped.startswith(prefix) for prefix in ['제목:', 'Title:', 'タイトル:', '标题:', 'Tiêu đề:', 'Sarlavha:', 'หัวข้อ:', '자격요건:', 'Eligibility:', '資格要件:', '资格要求:', 'Điều kiện:', 'Malaka talablari:', 'คุณสมบัติ:']):
-                        content_lines.append(line_stripped)
+            # 제목 필드 시작
+            if line_stripped.startswith('제목:') or line_stripped.startswith('Title:') or line_stripped.startswith('タイトル:') or line_stripped.startswith('标题:') or line_stripped.startswith('Tiêu đề:') or line_stripped.startswith('Sarlavha:') or line_stripped.startswith('หัวข้อ:'):
+                if current_field == 'text' and content_lines:
+                    translated_main_text = '\n'.join(content_lines).strip()
+                current_field = 'title'
+                content_lines = []
+                translated_title = line_stripped.split(':', 1)[1].strip()
             
-            # 마지막 필드 처리 (본문인 경우)
-            if current_field == 'text' and content_lines:
-                translated_main_text = '\n'.join(content_lines).strip()
-
-            return {
-                "title": translated_title,
-                "eligibility": translated_eligibility,
-                "text": translated_main_text
-            }
+            # 자격요건 필드 시작
+            elif line_stripped.startswith('자격요건:') or line_stripped.startswith('Eligibility:') or line_stripped.startswith('資格要件:') or line_stripped.startswith('资格要求:') or line_stripped.startswith('Điều kiện:') or line_stripped.startswith('Malaka talablari:') or line_stripped.startswith('คุณสมบัติ:'):
+                if current_field == 'text' and content_lines:
+                    translated_main_text = '\n'.join(content_lines).strip()
+                current_field = 'eligibility'
+                content_lines = []
+                translated_eligibility = line_stripped.split(':', 1)[1].strip()
             
-        except Exception as e:
-            logger.error(f"다중 필드 번역 중 오류 발생: {str(e)}")
-            raise
+            # 본문 필드 시작
+            elif line_stripped.startswith('본문:') or line_stripped.startswith('Content:') or line_stripped.startswith('本文:') or line_stripped.startswith('正文:') or line_stripped.startswith('Nội dung:') or line_stripped.startswith('Matn:') or line_stripped.startswith('เนื้อหา:'):
+                current_field = 'text'
+                content_lines = []
+                # 첫 번째 줄 처리
+                first_line_content = line_stripped.split(':', 1)[1].strip()
+                if first_line_content:
+                    content_lines.append(first_line_content)
+            
+            # 본문의 추가 줄들 처리
+            elif current_field == 'text' and line_stripped:
+                # 다음 필드가 시작되지 않은 경우 본문의 일부로 처리
+                if not any(line_stripped.startswith(prefix) for prefix in ['제목:', 'Title:', 'タイトル:', '标题:', 'Tiêu đề:', 'Sarlavha:', 'หัวข้อ:', '자격요건:', 'Eligibility:', '資格要件:', '资格要求:', 'Điều kiện:', 'Malaka talablari:', 'คุณสมบัติ:']):
+                    content_lines.append(line_stripped)
+        
+        # 마지막 필드 처리 (본문인 경우)
+        if current_field == 'text' and content_lines:
+            translated_main_text = '\n'.join(content_lines).strip()
+
+        return {
+            "title": translated_title,
+            "eligibility": translated_eligibility,
+            "text": translated_main_text
+        }
 
 
 
@@ -0,0 +1,137 @@
+"""
+언어별 RAG 파이프라인 레지스트리
+프롬프트 템플릿과 LLM 체인을 시작 시 한 번만 구성하고, 검색기는 인덱스 스냅샷별로 재사용
+요청 처리 시에는 검색과 LLM 호출만 수행
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from loguru import logger
+
+from app.services.HybridRetriever import HybridRetriever
+
+SUPPORTED_LANGUAGES = ("ko", "en", "ja", "zh", "vi", "uz", "th")
+DEFAULT_LANGUAGE = "ko"
+
+
+@dataclass(frozen=True)
+class RagPipeline:
+    """언어 하나에 대해 미리 구성된 프롬프트와 LLM 체인"""
+    language: str
+    prompt: ChatPromptTemplate
+    chain: Runnable
+
+
+class RagPipelineRegistry:
+    """지원 언어별 RAG 파이프라인 보관 및 재사용 통계"""
+
+    def __init__(self, prompt_builder: Callable[[str], ChatPromptTemplate], llm, config):
+        """
+        Args:
+            prompt_builder: 언어 코드로 RAG 프롬프트 템플릿을 만드는 함수
+            llm: 체인에 연결할 채팅 모델
+            config: OpenAIConfig (검색 파라미터)
+        """
+        self.prompt_builder = prompt_builder
+        self.llm = llm
+        self.config = config
+
+        self._lock = threading.Lock()
+        self._pipelines: Dict[str, RagPipeline] = {}
+        self._build_ms: Dict[str, float] = {}
+
+        # 인덱스 스냅샷이 바뀌면 검색기를 다시 구성
+        self._snapshot = None
+        self._retrievers: Dict[str, HybridRetriever] = {}
+        self._retriever_build_ms: Dict[str, float] = {}
+
+        self._reuses = 0
+        self._saved_ms = 0.0
+
+    def build(self):
+        """지원 언어 전체의 프롬프트와 LLM 체인 구성"""
+        with self._lock:
+            self._build()
+
+    def _build(self):
+        """파이프라인 구성 (잠금 안에서 호출)"""
+        self._pipelines = {}
+        self._build_ms = {}
+        for language in SUPPORTED_LANGUAGES:
+            start = time.perf_counter()
+            prompt = self.prompt_builder(language)
+            self._pipelines[language] = RagPipeline(language=language, prompt=prompt, chain=prompt | self.llm)
+            self._build_ms[language] = (time.perf_counter() - start) * 1000
+
+        logger.info(
+            f"RAG 파이프라인 구성 완료: {len(self._pipelines)}개 언어, "
+            f"{sum(self._build_ms.values()):.2f}ms"
+        )
+
+    def set_llm(self, llm):
+        """채팅 모델 교체 (구성된 파이프라인은 다음 조회 시 다시 구성)"""
+        with self._lock:
+            self.llm = llm
+            self._pipelines = {}
+
+    def get(self, language: str) -> RagPipeline:
+        """언어별 파이프라인 반환 (미지원 언어는 한국어 파이프라인)"""
+        with self._lock:
+            if not self._pipelines:
+                self._build()
+            pipeline = self._pipelines.get(language) or self._pipelines[DEFAULT_LANGUAGE]
+            self._record_reuse(self._build_ms[pipeline.language])
+            return pipeline
+
+    def get_retriever(self, snapshot, language: str) -> HybridRetriever:
+        """스냅샷의 언어별 인덱스에 대한 검색기 반환 (스냅샷별로 한 번만 생성)"""
+        key = snapshot.resolve_language(language)
+        with self._lock:
+            self._reset_if_stale(snapshot)
+            retriever = self._retrievers.get(key)
+            if retriever is not None:
+                self._record_reuse(self._retriever_build_ms[key])
+                return retriever
+
+            k, fetch_k = self.config.top_k, self.config.retrieval_fetch_k
+            if self.config.reranker_enabled:
+                # 재순위를 사용하면 후보를 더 많이 가져온 뒤 재순위기가 top_k개로 줄임
+                k = self.config.reranker_candidates
+                fetch_k = max(fetch_k, k)
+
+            start = time.perf_counter()
+            retriever = HybridRetriever(
+                vector_db=snapshot.get_vector_db(key),
+                lexical_index=snapshot.get_lexical_index(key),
+                k=k,
+                fetch_k=fetch_k,
+                mode=self.config.retrieval_mode
+            )
+            self._retrievers[key] = retriever
+            self._retriever_build_ms[key] = (time.perf_counter() - start) * 1000
+            return retriever
+
+    def _reset_if_stale(self, snapshot):
+        if snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            self._retrievers = {}
+            self._retriever_build_ms = {}
+
+    def _record_reuse(self, saved_ms: float):
+        """재사용 횟수와 절약한 구성 시간 누적 (잠금 안에서 호출)"""
+        self._reuses += 1
+        self._saved_ms += saved_ms
+
+    def get_stats(self) -> dict:
+        """파이프라인 구성 비용과 재사용으로 절약한 구성 시간"""
+        return {
+            "languages": len(self._pipelines),
+            "build_ms": sum(self._build_ms.values()),
+            "retrievers": len(self._retrievers),
+            "reuses": self._reuses,
+            "saved_ms": self._saved_ms
+        }
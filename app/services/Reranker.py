@@ -0,0 +1,185 @@
+"""
+CPU 크로스 인코더 재순위기
+후보 청크를 질의와 함께 한 번의 배치 추론으로 점수화하여 상위 몇 개만 LLM에 전달
+sentence-transformers가 없거나 부하로 지연이 커지면 검색 순위를 그대로 사용
+"""
+import threading
+import time
+from typing import List, Optional
+
+from langchain_core.documents import Document
+from loguru import logger
+
+from app.config.OpenAIConfig import openai_config
+from etl.pdf.lazy import LazyInstance
+
+
+class CrossEncoderReranker:
+    """크로스 인코더 기반 재순위기 (모델은 첫 사용 시 로드)"""
+
+    # 지연 시간 이동 평균 가중치
+    LATENCY_EWMA_ALPHA = 0.2
+
+    def __init__(
+            self,
+            enabled: bool,
+            model_name: str,
+            top_n: int,
+            max_latency_ms: float,
+            max_inflight: int,
+            backend: str = "torch",
+            quantize: bool = False,
+            model=None
+    ):
+        """
+        Args:
+            enabled: 재순위 사용 여부
+            model_name: 크로스 인코더 모델 (Hugging Face 모델명 또는 로컬 경로)
+            top_n: 재순위 후 LLM에 전달할 청크 수
+            max_latency_ms: 최근 재순위 평균 지연이 이 값을 넘으면 재순위를 건너뜀
+            max_inflight: 동시에 진행할 수 있는 재순위 수 (초과 요청은 건너뜀)
+            backend: torch / onnx (onnx는 sentence-transformers 3.2 이상 필요)
+            quantize: torch 백엔드에서 Linear 계층 동적 int8 양자화 적용
+            model: 미리 로드된 모델 (predict(pairs, batch_size=...) 지원)
+        """
+        self.enabled = enabled
+        self.model_name = model_name
+        self.top_n = top_n
+        self.max_latency_ms = max_latency_ms
+        self.max_inflight = max_inflight
+        self.backend = backend
+        self.quantize = quantize
+
+        self._model = model
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._latency_ewma_ms = 0.0
+
+        self._reranked = 0
+        self._skipped = 0
+        self._total_ms = 0.0
+
+    def load(self):
+        """크로스 인코더 로드 (sentence-transformers가 없으면 재순위 비활성화)"""
+        if not self.enabled or self._model is not None:
+            return self._model
+
+        with self._load_lock:
+            if self._model is not None:
+                return self._model
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError:
+                logger.warning("sentence-transformers가 설치되지 않아 재순위를 사용하지 않습니다.")
+                self.enabled = False
+                return None
+
+            start = time.perf_counter()
+            if self.backend != "torch":
+                try:
+                    model = CrossEncoder(self.model_name, device="cpu", backend=self.backend)
+                except TypeError:
+                    logger.warning(f"설치된 sentence-transformers가 {self.backend} 백엔드를 지원하지 않아 torch로 로드합니다.")
+                    model = CrossEncoder(self.model_name, device="cpu")
+            else:
+                model = CrossEncoder(self.model_name, device="cpu")
+                if self.quantize:
+                    import torch
+                    model.model = torch.quantization.quantize_dynamic(model.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            self._model = model
+            logger.info(
+                f"재순위 모델 로드 완료: {self.model_name} ({self.backend}"
+                f"{', int8' if self.quantize and self.backend == 'torch' else ''}), "
+                f"{(time.perf_counter() - start) * 1000:.0f}ms"
+            )
+            return model
+
+    def _try_acquire(self) -> bool:
+        """부하 상태가 아니면 재순위 슬롯 확보"""
+        with self._lock:
+            overloaded = self._inflight >= self.max_inflight or self._latency_ewma_ms > self.max_latency_ms
+            if overloaded:
+                self._skipped += 1
+                # 건너뛸 때마다 평균 지연을 낮춰 부하가 줄면 다시 재순위를 시도
+                self._latency_ewma_ms *= 1 - self.LATENCY_EWMA_ALPHA
+                return False
+            self._inflight += 1
+            return True
+
+    def _release(self, elapsed_ms: Optional[float]):
+        with self._lock:
+            self._inflight -= 1
+            if elapsed_ms is not None:
+                self._reranked += 1
+                self._total_ms += elapsed_ms
+                self._latency_ewma_ms += self.LATENCY_EWMA_ALPHA * (elapsed_ms - self._latency_ewma_ms)
+
+    def rerank(self, query: str, docs: List[Document]) -> List[Document]:
+        """질의 하나의 후보 청크 재순위"""
+        return self.rerank_batch([query], [docs])[0]
+
+    def rerank_batch(self, queries: List[str], candidates: List[List[Document]]) -> List[List[Document]]:
+        """
+        여러 질의의 후보 청크를 한 번의 배치 추론으로 재순위
+
+        Args:
+            queries: 질의 목록
+            candidates: 질의별 검색 순위대로 정렬된 후보 청크
+
+        Returns:
+            질의별 상위 top_n개 청크 (재순위를 건너뛰면 검색 순위 기준 상위 top_n개)
+        """
+        fallback = [docs[:self.top_n] for docs in candidates]
+        if not self.enabled or all(len(docs) <= 1 for docs in candidates):
+            return fallback
+
+        model = self.load()
+        if model is None or not self._try_acquire():
+            return fallback
+
+        elapsed_ms = None
+        try:
+            pairs = [(query, doc.page_content) for query, docs in zip(queries, candidates) for doc in docs]
+            start = time.perf_counter()
+            scores = model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            results, offset = [], 0
+            for docs in candidates:
+                doc_scores = scores[offset:offset + len(docs)]
+                offset += len(docs)
+                order = sorted(range(len(docs)), key=lambda i: doc_scores[i], reverse=True)
+                results.append([docs[i] for i in order[:self.top_n]])
+            return results
+
+        except Exception as e:
+            logger.error(f"재순위 중 오류, 검색 순위를 사용합니다: {str(e)}")
+            return fallback
+
+        finally:
+            self._release(elapsed_ms)
+
+    def get_stats(self) -> dict:
+        """재순위 수행/생략 횟수와 평균 지연 시간"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "reranked": self._reranked,
+                "skipped": self._skipped,
+                "avg_ms": self._total_ms / self._reranked if self._reranked else 0.0,
+                "latency_ewma_ms": self._latency_ewma_ms
+            }
+
+
+# 전역 재순위기 인스턴스 (첫 사용 시 생성)
+reranker = LazyInstance(lambda: CrossEncoderReranker(
+    enabled=openai_config.reranker_enabled,
+    model_name=openai_config.reranker_model,
+    top_n=openai_config.top_k,
+    max_latency_ms=openai_config.reranker_max_latency_ms,
+    max_inflight=openai_config.reranker_max_inflight,
+    backend=openai_config.reranker_backend,
+    quantize=openai_config.reranker_quantize
+))
@@ -0,0 +1,159 @@
+"""
+의미 기반 답변 캐시
+표현만 다른 같은 질문에 대해 LLM 호출 없이 이전 답변을 반환
+임베딩은 표현이 거의 같고 비자 종류·번호만 다른 질문(F-6/E-9 등)을 구분하지 못하므로
+질문의 식별 용어(숫자가 포함된 코드)가 같을 때만 적중으로 봄 (기본값은 사용 안 함)
+"""
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from app.config.OpenAIConfig import openai_config
+from etl.pdf.lazy import LazyInstance
+
+
+class _LanguageBucket:
+    """언어별 질문 임베딩 행렬과 답변 목록 (특정 인덱스 버전에 종속)"""
+
+    def __init__(self, version: str, dim: int, capacity: int):
+        self.version = version
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.answers: List[str] = []
+        self.key_terms: List[Optional[FrozenSet[str]]] = []
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+
+    @property
+    def count(self) -> int:
+        return len(self.answers)
+
+
+class SemanticAnswerCache:
+    """(질문 임베딩, 언어, 인덱스 버전) → 답변 캐시"""
+
+    # 비자 코드(F-6, E-9), 번호, 연도 등 숫자를 포함한 영숫자 용어
+    _KEY_TERM = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+    def __init__(self, threshold: float = None, max_size: int = None):
+        self.threshold = threshold if threshold is not None else openai_config.answer_cache_threshold
+        self.max_size = max_size or openai_config.answer_cache_size
+
+        self._buckets: Dict[str, _LanguageBucket] = {}
+        self._lock = threading.Lock()
+
+        # 캐시 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """코사인 유사도 계산을 위한 단위 벡터 변환"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @classmethod
+    def key_terms(cls, question: Optional[str]) -> Optional[FrozenSet[str]]:
+        """질문의 식별 용어 (숫자를 포함한 영숫자 용어 집합, 질문이 없으면 None)"""
+        if question is None:
+            return None
+        normalized = unicodedata.normalize("NFKC", question).casefold()
+        return frozenset(term for term in cls._KEY_TERM.findall(normalized) if any(ch.isdigit() for ch in term))
+
+    def lookup(self, language: str, version: str, embedding, question: str = None) -> Optional[str]:
+        """
+        유사한 질문의 캐시된 답변 조회
+
+        Args:
+            language: 언어 코드
+            version: 현재 인덱스 버전
+            embedding: 질문 임베딩
+            question: 질문 원문 (주면 식별 용어가 같은 질문만 적중)
+
+        Returns:
+            임계값 이상으로 유사하고 식별 용어가 같은 질문의 답변 (없으면 None)
+        """
+        query = self._normalize(embedding)
+        terms = self.key_terms(question)
+        with self._lock:
+            bucket = self._buckets.get(language)
+            if bucket is None or bucket.version != version or bucket.count == 0:
+                self.misses += 1
+                return None
+
+            similarities = bucket.vectors[:bucket.count] @ query
+            candidates = np.flatnonzero(similarities >= self.threshold)
+            best = next((
+                int(row) for row in candidates[np.argsort(-similarities[candidates])]
+                if terms is None or bucket.key_terms[row] is None or bucket.key_terms[row] == terms
+            ), None)
+            if best is None:
+                self.misses += 1
+                return None
+
+            bucket.last_used[best] = time.monotonic()
+            self.hits += 1
+            logger.info(f"의미 기반 답변 캐시 적중 (언어: {language}, 유사도: {similarities[best]:.3f})")
+            return bucket.answers[best]
+
+    def store(self, language: str, version: str, embedding, answer: str, question: str = None):
+        """
+        답변 저장 (인덱스 버전이 바뀌었으면 해당 언어의 기존 항목은 모두 무효화)
+
+        Args:
+            language: 언어 코드
+            version: 답변 생성에 사용한 인덱스 버전
+            embedding: 질문 임베딩
+            answer: 생성된 답변
+            question: 질문 원문 (식별 용어 비교용)
+        """
+        terms = self.key_terms(question)
+        vector = self._normalize(embedding)
+        with self._lock:
+            bucket = self._buckets.get(language)
+            if bucket is None or bucket.version != version or bucket.vectors.shape[1] != vector.shape[0]:
+                if bucket is not None:
+                    self.invalidations += 1
+                bucket = _LanguageBucket(version, vector.shape[0], self.max_size)
+                self._buckets[language] = bucket
+
+            if bucket.count < self.max_size:
+                row = bucket.count
+                bucket.answers.append(answer)
+                bucket.key_terms.append(terms)
+            else:
+                # 가장 오래 사용되지 않은 항목 교체
+                row = int(np.argmin(bucket.last_used))
+                bucket.answers[row] = answer
+                bucket.key_terms[row] = terms
+                self.evictions += 1
+
+            bucket.vectors[row] = vector
+            bucket.last_used[row] = time.monotonic()
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._buckets.clear()
+
+    def get_stats(self) -> dict:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "size": sum(bucket.count for bucket in self._buckets.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+
+# 전역 답변 캐시 인스턴스 (첫 사용 시 생성)
+semantic_answer_cache = LazyInstance(SemanticAnswerCache)
@@ -0,0 +1,90 @@
+"""
+동일 요청 병합 (single-flight)
+같은 키로 동시에 들어온 요청은 한 번만 실행하고 모든 호출자가 같은 결과를 받음
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.services.Metrics import request_timings
+
+
+class SingleFlight:
+    """이벤트 루프 안에서 진행 중인 동일 요청을 하나의 작업으로 병합"""
+
+    def __init__(self):
+        # 키별 (실행 중인 작업, 작업의 단계별 처리 시간)
+        self._inflight: Dict[Tuple[str, Hashable], Tuple[asyncio.Task, Optional[Dict[str, float]]]] = {}
+        # 요청 종류별 (실제 실행 수, 병합되어 생략된 수)
+        self._calls = defaultdict(int)
+        self._coalesced = defaultdict(int)
+
+    async def do(self, kind: str, key: Hashable, factory: Callable[[], Awaitable]):
+        """
+        같은 키의 작업이 진행 중이면 그 결과를 기다리고, 없으면 새로 실행
+
+        Args:
+            kind: 요청 종류 (통계 구분용, 예: rag / translation)
+            key: 요청 식별 키 (같은 키 = 같은 결과)
+            factory: 실제 작업을 만드는 함수
+
+        Returns:
+            작업 결과 (작업이 실패하면 모든 호출자에게 같은 예외 전달)
+
+        요청별 시간 측정 중인 호출자에게는 작업의 단계별 시간(첫 호출자가 측정한 경우)을 복사하고,
+        병합된 호출자에게는 기다린 시간을 coalesced 항목으로 추가
+        """
+        flight_key = (kind, key)
+        flight = self._inflight.get(flight_key)
+        coalesced = flight is not None
+        if flight is None:
+            # 첫 호출자가 시간을 측정 중일 때만 작업 단계별 시간 기록 (측정 시 LLM 호출 방식이 달라지므로)
+            timings = {} if request_timings.get() is not None else None
+            task = asyncio.ensure_future(self._run(factory, timings))
+            flight = self._inflight[flight_key] = (task, timings)
+            self._calls[kind] += 1
+            task.add_done_callback(lambda done: self._finish(flight_key, done))
+        else:
+            self._coalesced[kind] += 1
+
+        task, timings = flight
+        start = time.perf_counter()
+        try:
+            # 호출자 하나가 취소되어도 다른 호출자를 위해 작업은 계속 진행
+            return await asyncio.shield(task)
+        finally:
+            caller_timings = request_timings.get()
+            if caller_timings is not None:
+                caller_timings.update(timings or {})
+                if coalesced:
+                    caller_timings["coalesced"] = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    async def _run(factory: Callable[[], Awaitable], timings: Optional[Dict[str, float]]):
+        """작업 전용 dict에 단계별 시간을 기록하며 실행 (어느 호출자가 취소되어도 나머지에게 전달되도록 분리)"""
+        request_timings.set(timings)
+        return await factory()
+
+    def _finish(self, flight_key, task: asyncio.Task):
+        inflight = self._inflight.get(flight_key)
+        if inflight is not None and inflight[0] is task:
+            del self._inflight[flight_key]
+        # 모든 호출자가 취소된 경우에도 예외가 처리되지 않은 채 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> dict:
+        """요청 종류별 실행 수와 병합으로 절약한 호출 수"""
+        return {
+            kind: {
+                "calls": self._calls[kind],
+                "saved_calls": self._coalesced[kind],
+                "inflight": sum(1 for inflight_kind, _ in self._inflight if inflight_kind == kind)
+            }
+            for kind in set(self._calls) | set(self._coalesced)
+        }
+
+
+# 전역 요청 병합 인스턴스 (서비스 인스턴스와 무관하게 프로세스 단위로 병합)
+single_flight = SingleFlight()
@@ -0,0 +1,207 @@
+"""
+번역 결과 영구 캐시
+(모델, 대상 언어, 제목, 자격요건, 본문, 프롬프트 버전) 해시를 키로 SQLite에 저장하여 재시작 후에도 재사용
+전체 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+(여러 워커가 같은 파일을 공유해도 상한이 지켜지도록 삭제 전에 DB의 전체 크기를 다시 읽음)
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+from app.config.OpenAIConfig import openai_config
+from etl.pdf.lazy import LazyInstance
+
+
+def make_translation_key(
+        model: str,
+        target_language: str,
+        title: str,
+        eligibility: str,
+        text: str,
+        prompt_version: str
+) -> str:
+    """번역 입력 전체에 대한 내용 주소(SHA-256) 키"""
+    payload = json.dumps(
+        [model, target_language, title, eligibility, text, prompt_version],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """SQLite 기반 번역 캐시 (첫 사용 시 파일 생성)"""
+
+    # 조회 시각(last_used) 갱신은 모아서 기록 (조회마다 커밋하지 않음)
+    TOUCH_BATCH_SIZE = 64
+    TOUCH_FLUSH_INTERVAL = 30.0
+
+    def __init__(self, path: Path, max_bytes: int, enabled: bool = True):
+        """
+        Args:
+            path: SQLite 파일 경로
+            max_bytes: 저장된 번역 결과 전체 크기 상한 (바이트)
+            enabled: 캐시 사용 여부
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """연결 생성 (잠금 안에서 호출)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            # 읽기와 쓰기가 서로 막지 않도록 WAL 모드, 커밋마다 fsync하지 않음
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations(last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시된 번역 결과 조회 (없으면 None)"""
+        if not self.enabled:
+            return None
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self._touched[key] = time.time()
+                if (
+                        len(self._touched) >= self.TOUCH_BATCH_SIZE
+                        or time.monotonic() - self._last_flush >= self.TOUCH_FLUSH_INTERVAL
+                ):
+                    self._flush_touches(conn)
+                    conn.commit()
+                return json.loads(row[0])
+        except sqlite3.Error as e:
+            logger.warning(f"번역 캐시 조회 실패: {str(e)}")
+            return None
+
+    async def aget(self, key: str) -> Optional[dict]:
+        """캐시된 번역 결과 조회 (SQLite I/O는 스레드에서 실행하여 이벤트 루프를 막지 않음)"""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: dict):
+        """번역 결과 저장 (SQLite I/O는 스레드에서 실행)"""
+        if self.enabled:
+            await asyncio.to_thread(self.set, key, value)
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        """모아 둔 조회 시각을 한 번에 기록 (잠금 안에서 호출, 커밋은 호출자가 수행)"""
+        if self._touched:
+            conn.executemany(
+                "UPDATE translations SET last_used = MAX(last_used, ?) WHERE key = ?",
+                [(used_at, key) for key, used_at in self._touched.items()]
+            )
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    def set(self, key: str, value: dict):
+        """번역 결과 저장 후 크기 상한을 넘으면 오래된 항목 삭제"""
+        if not self.enabled:
+            return
+
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                # 쓰기 트랜잭션 안에서 삭제 순서(last_used)와 전체 크기를 판단하도록 조회 시각을 먼저 기록
+                conn.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, encoded, size, now, now)
+                )
+                self._flush_touches(conn)
+                self._evict(conn, keep=key)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"번역 캐시 저장 실패: {str(e)}")
+
+    @staticmethod
+    def _size_bytes(conn: sqlite3.Connection) -> int:
+        """DB에 저장된 전체 크기 (다른 워커가 저장한 항목 포함)"""
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection, keep: str):
+        """
+        전체 크기가 상한 이하가 될 때까지 가장 오래 사용되지 않은 항목 삭제 (잠금과 쓰기 트랜잭션 안에서 호출)
+        쓰기 트랜잭션은 워커 간에 직렬화되므로 DB에서 읽은 크기로 판단하면 상한이 전체 워커 기준으로 지켜짐
+        """
+        size_bytes = self._size_bytes(conn)
+        while size_bytes > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM translations WHERE key != ? ORDER BY last_used LIMIT 64", (keep,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if size_bytes <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                size_bytes -= size
+                self.evictions += 1
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM translations")
+            conn.commit()
+            self._touched.clear()
+
+    def get_stats(self) -> dict:
+        """캐시 통계 반환"""
+        with self._lock:
+            entries, size_bytes = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations"
+            ).fetchone() if self.enabled else (0, 0)
+            total = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_bytes": size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0
+            }
+
+
+# 전역 번역 캐시 인스턴스 (첫 사용 시 생성)
+translation_cache = LazyInstance(lambda: TranslationCache(
+    path=openai_config.translation_cache_path,
+    max_bytes=openai_config.translation_cache_max_mb * 1024 * 1024,
+    enabled=openai_config.translation_cache_enabled
+))
@@ -0,0 +1,66 @@
+"""
+긴 본문 번역 분할
+문단/■ 섹션 경계에서 본문을 나누어 구간별로 동시에 번역하고 원래 순서대로 합침
+"""
+import re
+from typing import List
+
+# 빈 줄 또는 ■ 섹션 제목 앞에서 문단 분리
+_BLOCK_BOUNDARY = re.compile(r"\n\s*\n|\n(?=\s*■)")
+# 문장 끝 (한 줄이 구간 크기보다 긴 경우)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+")
+
+
+def split_translation_segments(text: str, max_chars: int) -> List[str]:
+    """
+    본문을 max_chars 이하의 구간으로 분할 (문단 → 줄 → 문장 경계 순으로 사용)
+
+    Args:
+        text: 번역할 본문
+        max_chars: 구간 최대 문자 수 (0 이하이면 분할하지 않음)
+
+    Returns:
+        원문 순서대로 정렬된 구간 목록 (분할이 필요 없거나 공백뿐이면 본문 하나, 항상 1개 이상)
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [text]
+
+    blocks = [block.strip() for block in _BLOCK_BOUNDARY.split(text) if block.strip()]
+    pieces = [piece for block in blocks for piece in _split_block(block, max_chars)]
+    # 공백뿐인 본문처럼 남는 내용이 없어도 호출자는 구간 하나 이상을 기대하므로 원문 그대로 반환
+    return _pack(pieces, max_chars, "\n\n") or [text]
+
+
+def _split_block(block: str, max_chars: int) -> List[str]:
+    """구간 크기보다 긴 문단을 줄, 문장, 고정 길이 순으로 분할"""
+    if len(block) <= max_chars:
+        return [block]
+
+    pieces = []
+    for line in (line.strip() for line in block.split("\n")):
+        if not line:
+            continue
+        if len(line) <= max_chars:
+            pieces.append(line)
+            continue
+        sentences = [
+            sentence[i:i + max_chars]
+            for sentence in _SENTENCE_BOUNDARY.split(line)
+            for i in range(0, len(sentence), max_chars)
+        ]
+        pieces.extend(_pack(sentences, max_chars, " "))
+    return _pack(pieces, max_chars, "\n")
+
+
+def _pack(pieces: List[str], max_chars: int, separator: str) -> List[str]:
+    """연속된 조각을 max_chars를 넘지 않는 범위에서 하나의 구간으로 합침"""
+    segments, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            segments.append(current)
+            current = piece
+        else:
+            current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        segments.append(current)
+    return segments
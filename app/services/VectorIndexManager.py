@@ -0,0 +1,152 @@
+"""
+벡터 인덱스 관리 서비스
+FAISS 인덱스를 프로세스 전역으로 한 번만 로드하고, ETL이 새 인덱스를 게시하면 교체
+"""
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from langchain_community.vectorstores import FAISS
+from loguru import logger
+
+from app.config.OpenAIConfig import openai_config
+from etl.pdf.embedding_service import EmbeddingService
+from etl.pdf.lazy import LazyInstance
+from etl.pdf.lexical_index import BM25Index
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """특정 버전의 언어별 인덱스 묶음 (요청은 시작 시점의 스냅샷을 끝까지 사용)"""
+    partitions: Dict[str, FAISS]
+    version: str
+    fallback_language: str = "en"
+    lexical_indexes: Dict[str, BM25Index] = field(default_factory=dict)
+
+    @property
+    def embeddings(self):
+        """질의 임베딩 모델 (모든 언어 인덱스가 공유)"""
+        return next(iter(self.partitions.values())).embeddings
+
+    def resolve_language(self, language: str) -> str:
+        """질의 언어가 검색할 인덱스 언어 (가이드북이 없는 언어는 대체 언어)"""
+        for candidate in (language, self.fallback_language, EmbeddingService.UNKNOWN_LANGUAGE):
+            if candidate in self.partitions:
+                return candidate
+        return next(iter(self.partitions))
+
+    def get_vector_db(self, language: str) -> FAISS:
+        """
+        질의 언어의 인덱스 반환 (가이드북이 없는 언어는 대체 언어 인덱스 사용)
+
+        Args:
+            language: 언어 코드
+
+        Returns:
+            해당 언어의 FAISS DB
+        """
+        return self.partitions[self.resolve_language(language)]
+
+    def get_lexical_index(self, language: str) -> Optional[BM25Index]:
+        """질의 언어의 BM25 인덱스 반환 (없으면 None)"""
+        return self.lexical_indexes.get(self.resolve_language(language))
+
+
+class VectorIndexManager:
+    """FAISS 인덱스 로드 및 핫스왑 관리"""
+
+    def __init__(self, embedding_service: EmbeddingService = None, reload_interval: int = None):
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.reload_interval = reload_interval or openai_config.index_reload_interval
+
+        self._snapshot: Optional[IndexSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """현재 로드된 인덱스 버전"""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else None
+
+    def get(self) -> IndexSnapshot:
+        """
+        현재 인덱스 스냅샷 반환 (로드 전이면 즉시 로드)
+
+        Returns:
+            현재 인덱스 스냅샷
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        if snapshot is None:
+            raise RuntimeError("FAISS 인덱스를 로드할 수 없습니다.")
+        return snapshot
+
+    def reload(self, force: bool = False) -> Optional[IndexSnapshot]:
+        """
+        게시된 인덱스 버전이 바뀌었으면 새로 로드하여 교체
+
+        Args:
+            force: 버전이 같아도 다시 로드할지 여부
+
+        Returns:
+            교체 후 현재 인덱스 스냅샷
+        """
+        with self._load_lock:
+            version = self.embedding_service.get_current_index_name()
+            if version is None:
+                logger.warning("게시된 FAISS 인덱스가 없습니다.")
+                return self._snapshot
+
+            if not force and self._snapshot is not None and self._snapshot.version == version:
+                return self._snapshot
+
+            partitions = self.embedding_service.load_partitions(version=version)
+            if not partitions:
+                # 로드 실패 시 기존 인덱스로 계속 서비스
+                return self._snapshot
+
+            # 어휘 검색용 BM25 인덱스는 ETL이 게시한 파일을 mmap으로 열어 워커 간 공유 (다시 색인하지 않음)
+            lexical_indexes = self.embedding_service.load_lexical_indexes(version, partitions)
+
+            previous = self.version
+            # 참조 교체는 원자적이므로 진행 중인 요청은 이전 스냅샷으로 안전하게 완료됨
+            self._snapshot = IndexSnapshot(
+                partitions=partitions,
+                version=version,
+                fallback_language=self.embedding_service.config.fallback_language,
+                lexical_indexes=lexical_indexes
+            )
+            logger.info(f"FAISS 인덱스 교체 완료: {previous} -> {version}")
+            return self._snapshot
+
+    def start_watching(self):
+        """게시된 인덱스 변경 감시 시작 (이벤트 루프 안에서 호출)"""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+            logger.info(f"FAISS 인덱스 변경 감시 시작 (주기: {self.reload_interval}초)")
+
+    async def stop_watching(self):
+        """게시된 인덱스 변경 감시 중지"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch(self):
+        """주기적으로 CURRENT 포인터를 확인하여 변경 시 백그라운드 스레드에서 재로드"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as e:
+                logger.error(f"FAISS 인덱스 재로드 중 오류: {str(e)}")
+
+
+# 전역 인덱스 관리자 인스턴스 (첫 사용 또는 서버 시작 시 생성)
+vector_index_manager = LazyInstance(VectorIndexManager)
@@ -117,7 +117,7 @@ log_info "서비스 상태 확인 중..."
 sleep 10
 
 for i in {1..30}; do
-    if curl -f http://localhost:8100/api/health &> /dev/null; then
+    if curl -f http://localhost:8100/api/ready &> /dev/null; then
         log_info "✅ 서비스가 성공적으로 시작되었습니다!"
         break
     fi
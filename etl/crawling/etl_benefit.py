@@ -41,6 +41,9 @@ PER_PAGE = 100  # ≤ 500 권장
 MAX_PAGES = 1  # 0이면 전체
 RPS = 3              # 30TPS 가이드 → 6rps 권장
 
+# 수집 후 공고 사전 번역 (posting_translations 저장, OpenAI 설정 필요)
+PRETRANSLATE_ENABLED = os.getenv("PRETRANSLATE_ENABLED", "false").lower() == "true"
+
 # # 제목 차단 키워드 필터
 # BLOCK_TITLE_RE = re.compile(r"(북한|탈북)")
 #
@@ -340,6 +343,16 @@ def ingest(filters: Dict[str,Any]):
         # with 블록 끝나면 자동 commit
         print(f"[INFO] upserted postings: {len(ids)} rows")
 
+    # 4) 사전 번역 (선택): 새로 추가/변경된 공고만 번역하여 API가 DB 조회로 제공
+    if PRETRANSLATE_ENABLED and ids:
+        # OpenAI 설정은 사전 번역을 켤 때만 필요하므로 여기서 import
+        from .pretranslate import pretranslate_postings
+
+        with psycopg2.connect(
+                host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD
+        ) as conn:
+            pretranslate_postings(conn, ids)
+
 # -------------------- 실행 예시 --------------------
 if __name__ == "__main__":
     # 예: 외국인 + 행정 성격(법률/안전) 필터
@@ -0,0 +1,197 @@
+"""
+공고 사전 번역 단계
+수집 후 새로 추가되었거나 내용이 바뀐 공고를 지원 언어로 미리 번역하여 posting_translations에 저장
+→ API는 요청 시 LLM을 호출하는 대신 (posting_id, language)로 번역을 조회
+- 원문/모델/프롬프트 버전의 해시(source_hash)가 저장된 값과 같으면 다시 번역하지 않음
+- 번역은 OpenAIService 일괄 번역 경로(동시 작업 제한, 재시도, 번역 캐시)를 그대로 사용
+
+단독 실행 시 전체 공고를 대상으로 누락/변경된 번역을 채움:
+    python -m etl.crawling.pretranslate
+"""
+import asyncio
+import os
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from app.config.OpenAIConfig import openai_config
+from app.services.OpenAIService import OpenAIService
+from app.services.TranslationCache import make_translation_key
+
+# 사전 번역 대상 언어 (원문은 한국어)
+TARGET_LANGUAGES = [
+    lang.strip() for lang in os.getenv("PRETRANSLATE_LANGUAGES", "en,ja,zh,vi,uz,th").split(",") if lang.strip()
+]
+# 번역 결과를 몇 건씩 모아 저장할지
+STORE_BATCH_SIZE = 50
+
+DDL_TRANSLATIONS = """
+CREATE TABLE IF NOT EXISTS posting_translations (
+    posting_id   BIGINT      NOT NULL REFERENCES postings(posting_id) ON DELETE CASCADE,
+    language     VARCHAR(8)  NOT NULL,
+    title        TEXT        NOT NULL,
+    eligibility  TEXT        NOT NULL,
+    content      TEXT        NOT NULL,
+    source_hash  CHAR(64)    NOT NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (posting_id, language)
+);
+"""
+SQL_UPSERT_TRANSLATION = """
+INSERT INTO posting_translations (posting_id, language, title, eligibility, content, source_hash, updated_at)
+VALUES (%s, %s, %s, %s, %s, %s, now())
+ON CONFLICT (posting_id, language) DO UPDATE
+SET title = EXCLUDED.title,
+    eligibility = EXCLUDED.eligibility,
+    content = EXCLUDED.content,
+    source_hash = EXCLUDED.source_hash,
+    updated_at = EXCLUDED.updated_at;
+"""
+
+
+def source_hash(posting: Dict[str, Any], language: str) -> str:
+    """번역 입력(모델, 언어, 원문 필드, 프롬프트 버전) 해시 (번역 캐시 키와 동일)"""
+    return make_translation_key(
+        openai_config.chat_model, language,
+        posting["title"], posting["eligibility"], posting["content"],
+        OpenAIService.TRANSLATION_PROMPT_VERSION
+    )
+
+
+# -------------------- DB --------------------
+def ensure_translation_table(conn):
+    with conn.cursor() as cur:
+        cur.execute(DDL_TRANSLATIONS)
+
+
+def fetch_postings(conn, posting_ids: List[int]) -> List[Dict[str, Any]]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT posting_id, title, eligibility, content FROM postings WHERE posting_id = ANY(%s)",
+            (list(posting_ids),)
+        )
+        return [
+            {"posting_id": pid, "title": title, "eligibility": eligibility, "content": content}
+            for pid, title, eligibility, content in cur.fetchall()
+        ]
+
+
+def fetch_translation_hashes(conn, posting_ids: List[int]) -> Dict[Tuple[int, str], str]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT posting_id, language, source_hash FROM posting_translations WHERE posting_id = ANY(%s)",
+            (list(posting_ids),)
+        )
+        return {(pid, language): digest for pid, language, digest in cur.fetchall()}
+
+
+def store_translations(conn, rows: List[Tuple]):
+    """(posting_id, language, title, eligibility, content, source_hash) 목록 업서트 후 커밋"""
+    if not rows:
+        return
+    with conn.cursor() as cur:
+        cur.executemany(SQL_UPSERT_TRANSLATION, rows)
+    conn.commit()
+
+
+# -------------------- 번역 계획/실행 --------------------
+def plan_translations(
+        postings: Iterable[Dict[str, Any]],
+        existing: Dict[Tuple[int, str], str],
+        languages: List[str],
+        hash_fn: Callable[[Dict[str, Any], str], str] = source_hash
+) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """
+    번역이 없거나 해시가 달라진 (공고, 언어)만 골라 번역할 언어 조합별로 묶음
+
+    Returns:
+        {언어 조합: [공고 (hashes에 언어별 해시 포함)]} (모두 최신이면 빈 딕셔너리)
+    """
+    plan: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for posting in postings:
+        hashes = {language: hash_fn(posting, language) for language in languages}
+        pending = tuple(
+            language for language in languages
+            if existing.get((posting["posting_id"], language)) != hashes[language]
+        )
+        if pending:
+            plan.setdefault(pending, []).append({**posting, "hashes": hashes})
+    return plan
+
+
+async def translate_plan(
+        service: OpenAIService,
+        plan: Dict[Tuple[str, ...], List[Dict[str, Any]]],
+        store: Callable[[List[Tuple]], None],
+        batch_size: int = STORE_BATCH_SIZE
+) -> Dict[str, int]:
+    """계획된 번역을 실행하며 batch_size건씩 저장 (실패 항목은 건너뛰고 다음 실행에서 재시도)"""
+    stats = {"translated": 0, "failed": 0}
+    rows: List[Tuple] = []
+
+    for languages, postings in plan.items():
+        by_id = {str(posting["posting_id"]): posting for posting in postings}
+        requests = [
+            {"posting_id": pid, "title": p["title"], "eligibility": p["eligibility"], "text": p["content"]}
+            for pid, p in by_id.items()
+        ]
+        async for item in service.atranslate_bulk(requests, list(languages)):
+            if item["error"] is not None:
+                stats["failed"] += 1
+                continue
+            posting = by_id[item["posting_id"]]
+            language = item["target_language"]
+            rows.append((
+                posting["posting_id"], language,
+                item["title"], item["eligibility"], item["text"],
+                posting["hashes"][language]
+            ))
+            stats["translated"] += 1
+            if len(rows) >= batch_size:
+                store(rows)
+                rows = []
+
+    store(rows)
+    return stats
+
+
+def pretranslate_postings(conn, posting_ids: List[int], languages: List[str] = None) -> Dict[str, int]:
+    """
+    공고들의 누락/변경된 번역을 생성하여 posting_translations에 저장
+
+    Args:
+        conn: psycopg2 연결
+        posting_ids: 대상 공고 ID
+        languages: 번역 대상 언어 (기본: PRETRANSLATE_LANGUAGES)
+
+    Returns:
+        번역/실패/최신 상태 건수
+    """
+    languages = languages or TARGET_LANGUAGES
+    if not posting_ids:
+        return {"translated": 0, "failed": 0, "up_to_date": 0}
+
+    ensure_translation_table(conn)
+    conn.commit()
+    postings = fetch_postings(conn, posting_ids)
+    plan = plan_translations(postings, fetch_translation_hashes(conn, posting_ids), languages)
+    pending = sum(len(pending_languages) * len(group) for pending_languages, group in plan.items())
+    print(f"[INFO] pretranslate: {pending} pending of {len(postings) * len(languages)} (posting, language) pairs")
+
+    stats = asyncio.run(translate_plan(OpenAIService(), plan, lambda rows: store_translations(conn, rows)))
+    stats["up_to_date"] = len(postings) * len(languages) - pending
+    print(f"[INFO] pretranslate: translated {stats['translated']}, failed {stats['failed']}")
+    return stats
+
+
+# -------------------- 실행 --------------------
+if __name__ == "__main__":
+    import psycopg2
+
+    from .etl_benefit import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+
+    with psycopg2.connect(
+            host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD
+    ) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT posting_id FROM postings")
+            ids = [row[0] for row in cur.fetchall()]
+        pretranslate_postings(conn, ids)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+청크 저장소 로더 벤치마크
+pickle 형식 인덱스(FAISS.load_local)와 컬럼형 청크 저장소의 로드 시간, 메모리, 행 조회 시간을 비교
+
+사용 예시:
+  python -m etl.pdf.benchmark_chunk_store
+  python -m etl.pdf.benchmark_chunk_store --index-name index --lookups 10000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import faiss
+import numpy as np
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from etl.pdf.chunk_store import ChunkStore
+from etl.pdf.embedding_service import EmbeddingService
+
+
+def _measure(load, lookup, rows) -> dict:
+    """로드 시간/할당 메모리와 행 조회 시간 측정"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    loaded = load()
+    load_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for row in rows:
+        lookup(loaded, int(row))
+    lookup_us = (time.perf_counter() - start) * 1e6 / max(len(rows), 1)
+
+    return {"load_ms": load_ms, "peak_alloc_kb": peak / 1024, "lookup_us_avg": lookup_us}
+
+
+def benchmark(index_dir: Path, index_name: str = "index", lookups: int = 1000) -> dict:
+    """
+    pickle 인덱스를 임시 디렉토리에 청크 저장소 형식으로 변환한 뒤 두 로더를 비교
+
+    Args:
+        index_dir: pickle 인덱스(index.faiss / index.pkl)가 있는 디렉토리
+        index_name: 인덱스 이름
+        lookups: 측정할 무작위 행 조회 수
+
+    Returns:
+        로더별 측정 결과 (pickle / chunk_store)
+    """
+    index_dir = Path(index_dir)
+    # 로드만 측정하므로 임베딩 API를 호출하지 않는 가짜 임베딩 사용
+    embeddings = FakeEmbeddings(size=1)
+
+    def load_pickle():
+        return FAISS.load_local(str(index_dir), embeddings, index_name=index_name, allow_dangerous_deserialization=True)
+
+    def lookup_pickle(faiss_db, row):
+        return faiss_db.docstore.search(faiss_db.index_to_docstore_id[row]).page_content
+
+    faiss_db = load_pickle()
+    rows = np.random.default_rng(0).integers(0, faiss_db.index.ntotal, size=lookups)
+    pickle_files = [index_dir / f"{index_name}.faiss", index_dir / f"{index_name}.pkl"]
+
+    results = {"vectors": int(faiss_db.index.ntotal), "lookups": lookups}
+    results["pickle"] = _measure(load_pickle, lookup_pickle, rows)
+    results["pickle"]["size_kb"] = sum(path.stat().st_size for path in pickle_files) / 1024
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = EmbeddingService()
+        service.config.faiss_index_dir = Path(tmp_dir)
+        service._save_partition(faiss_db, index_name)
+        prefix = Path(tmp_dir) / index_name
+
+        def load_chunk_store():
+            faiss.read_index(f"{prefix}.faiss", EmbeddingService.MMAP_FLAGS)
+            return ChunkStore.open(prefix)
+
+        results["chunk_store"] = _measure(load_chunk_store, ChunkStore.get_text, rows)
+        results["chunk_store"]["size_kb"] = sum(path.stat().st_size for path in Path(tmp_dir).iterdir()) / 1024
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pickle 인덱스와 청크 저장소 로더 비교")
+    parser.add_argument('--index-dir', type=Path, default=Path(__file__).parent / "faiss_index")
+    parser.add_argument('--index-name', default="index")
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    results = benchmark(args.index_dir, args.index_name, args.lookups)
+    print(f"벡터 {results['vectors']}개, 무작위 조회 {results['lookups']}회")
+    for loader in ("pickle", "chunk_store"):
+        result = results[loader]
+        print(
+            f"{loader:<12} 로드 {result['load_ms']:8.2f}ms | 할당 {result['peak_alloc_kb']:9.1f}KB | "
+            f"조회 {result['lookup_us_avg']:7.2f}us | 파일 {result['size_kb']:9.1f}KB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
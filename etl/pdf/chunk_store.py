@@ -0,0 +1,263 @@
+"""
+청크 저장소
+LangChain pickle docstore를 대체하는 컬럼형 청크 저장소.
+모든 파일을 mmap으로 열어 여러 uvicorn 워커가 같은 페이지 캐시를 공유하고,
+FAISS 행 번호로 청크를 O(1)에 조회하며 조회한 청크만 Python 객체로 만든다.
+
+파일 형식 ({prefix}는 인덱스 이름, 예: index-1724567890_ko):
+
+    {prefix}.chunks.json   헤더 (UTF-8 JSON)
+        {
+          "format": "locallinker-chunks",
+          "version": 2,
+          "count": 청크 수,
+          "sources": [출처 파일 경로 목록],     # source 컬럼이 가리키는 사전
+          "languages": [언어 코드 목록]         # language 컬럼이 가리키는 사전
+        }
+
+    {prefix}.chunks.bin    청크 텍스트 UTF-8 바이트를 FAISS 행 순서대로 이어 붙인 파일
+
+    {prefix}.chunks.npy    행 단위 컬럼 (NumPy 구조화 배열, little-endian, 행 = FAISS 행 번호)
+        offset    int64  chunks.bin 안의 시작 바이트 위치
+        length    int32  텍스트 바이트 길이
+        page      int32  PDF 페이지 번호 (없으면 -1)
+        source    int32  헤더 sources 인덱스 (없으면 -1)
+        language  int32  헤더 languages 인덱스 (없으면 -1)
+        meta_offset  int64  chunks.meta.bin 안의 시작 바이트 위치
+        meta_length  int32  나머지 메타데이터 JSON 바이트 길이 (없으면 0)
+
+    {prefix}.chunks.meta.bin  컬럼에 담지 않는 나머지 메타데이터를 행별 JSON 객체(UTF-8)로 이어 붙인 파일
+                              (JSON으로 표현할 수 없는 값은 문자열로 저장)
+
+버전 1 저장소(meta_offset/meta_length 컬럼과 chunks.meta.bin 없음)도 그대로 열 수 있음
+"""
+import json
+import mmap
+from collections.abc import Mapping
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+FORMAT_NAME = "locallinker-chunks"
+FORMAT_VERSION = 2
+
+COLUMNS_DTYPE_V1 = np.dtype([
+    ("offset", "<i8"),
+    ("length", "<i4"),
+    ("page", "<i4"),
+    ("source", "<i4"),
+    ("language", "<i4"),
+])
+COLUMNS_DTYPE = np.dtype(COLUMNS_DTYPE_V1.descr + [
+    ("meta_offset", "<i8"),
+    ("meta_length", "<i4"),
+])
+# 버전별 컬럼 형식
+COLUMNS_DTYPES = {1: COLUMNS_DTYPE_V1, FORMAT_VERSION: COLUMNS_DTYPE}
+
+
+class RowIdMapping(Mapping):
+    """FAISS 행 번호 → 청크 ID 매핑 (ID가 행 번호 문자열이므로 dict를 만들지 않음)"""
+
+    def __init__(self, size: int):
+        self._size = size
+
+    def __getitem__(self, row: int) -> str:
+        if not 0 <= row < self._size:
+            raise KeyError(row)
+        return str(row)
+
+    def __iter__(self):
+        return iter(range(self._size))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class ChunkStore(Docstore):
+    """읽기 전용 컬럼형 청크 저장소 (청크 ID = FAISS 행 번호 문자열)"""
+
+    HEADER_SUFFIX = ".chunks.json"
+    TEXT_SUFFIX = ".chunks.bin"
+    COLUMNS_SUFFIX = ".chunks.npy"
+    META_SUFFIX = ".chunks.meta.bin"
+
+    def __init__(self, blob, columns: np.ndarray, sources: List[str], languages: List[str], meta_blob=b""):
+        self._blob = blob
+        self._columns = columns
+        self._sources = sources
+        self._languages = languages
+        self._meta_blob = meta_blob
+
+    @classmethod
+    def _paths(cls, prefix: Path):
+        prefix = Path(prefix)
+        return (
+            prefix.with_name(prefix.name + cls.HEADER_SUFFIX),
+            prefix.with_name(prefix.name + cls.TEXT_SUFFIX),
+            prefix.with_name(prefix.name + cls.COLUMNS_SUFFIX)
+        )
+
+    @classmethod
+    def _meta_path(cls, prefix: Path) -> Path:
+        prefix = Path(prefix)
+        return prefix.with_name(prefix.name + cls.META_SUFFIX)
+
+    @staticmethod
+    def _mmap(path: Path):
+        """파일을 읽기 전용 mmap으로 열기 (빈 파일은 mmap할 수 없으므로 빈 bytes)"""
+        if not path.stat().st_size:
+            return b""
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _split_metadata(metadata: dict) -> tuple:
+        """메타데이터를 컬럼 값 (page, source, language)과 나머지 dict로 분리"""
+        extra = dict(metadata)
+        page = extra.pop("page", None)
+        if not isinstance(page, int) or isinstance(page, bool) or page < 0:
+            if page is not None:
+                extra["page"] = page
+            page = -1
+
+        # source/language는 비어 있지 않은 문자열만 사전 컬럼에 저장하고 그 외 값은 나머지에 보존
+        codes = {}
+        for key in ("source", "language"):
+            value = extra.pop(key, None)
+            if isinstance(value, str) and value:
+                codes[key] = value
+            elif value is not None:
+                extra[key] = value
+        return page, codes.get("source"), codes.get("language"), extra
+
+    @classmethod
+    def exists(cls, prefix: Path) -> bool:
+        """저장소 파일이 모두 있는지 확인"""
+        return all(path.exists() for path in cls._paths(prefix))
+
+    @classmethod
+    def write(cls, prefix: Path, documents: List[Document]):
+        """
+        청크를 행 순서대로 저장
+
+        Args:
+            prefix: 저장 경로 (확장자 제외)
+            documents: FAISS 행 순서의 청크 목록
+                (metadata의 source, page, language는 컬럼으로, 나머지는 행별 JSON으로 저장)
+        """
+        header_path, text_path, columns_path = cls._paths(prefix)
+
+        sources, languages = {}, {}
+        columns = np.zeros(len(documents), dtype=COLUMNS_DTYPE)
+        offset = meta_offset = 0
+        with open(text_path, "wb") as f, open(cls._meta_path(prefix), "wb") as meta_file:
+            for row, document in enumerate(documents):
+                encoded = document.page_content.encode("utf-8")
+                f.write(encoded)
+
+                page, source, language, extra = cls._split_metadata(document.metadata or {})
+                encoded_meta = json.dumps(extra, ensure_ascii=False, default=str).encode("utf-8") if extra else b""
+                meta_file.write(encoded_meta)
+
+                columns[row] = (
+                    offset,
+                    len(encoded),
+                    page,
+                    sources.setdefault(source, len(sources)) if source else -1,
+                    languages.setdefault(language, len(languages)) if language else -1,
+                    meta_offset,
+                    len(encoded_meta)
+                )
+                offset += len(encoded)
+                meta_offset += len(encoded_meta)
+
+        np.save(columns_path, columns)
+        header_path.write_text(json.dumps({
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "count": len(documents),
+            "sources": list(sources),
+            "languages": list(languages)
+        }, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def open(cls, prefix: Path) -> "ChunkStore":
+        """저장소를 mmap으로 열기 (텍스트와 컬럼은 접근한 페이지만 읽음)"""
+        header_path, text_path, columns_path = cls._paths(prefix)
+
+        header = json.loads(header_path.read_text(encoding="utf-8"))
+        version = header.get("version")
+        if header.get("format") != FORMAT_NAME or version not in COLUMNS_DTYPES:
+            raise ValueError(f"지원하지 않는 청크 저장소 형식입니다: {header.get('format')} v{version}")
+
+        blob = cls._mmap(text_path)
+        # 버전 1 저장소에는 나머지 메타데이터 파일이 없음
+        meta_blob = cls._mmap(cls._meta_path(prefix)) if version >= 2 else b""
+
+        columns = np.load(columns_path, mmap_mode="r")
+        if columns.dtype != COLUMNS_DTYPES[version] or len(columns) != header["count"]:
+            raise ValueError("청크 저장소 컬럼이 헤더와 일치하지 않습니다.")
+
+        return cls(blob, columns, header["sources"], header["languages"], meta_blob)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """컬럼 전체 (mmap 배열, 예: 언어별 필터링)"""
+        return self._columns[name]
+
+    def get_text(self, row: int) -> str:
+        """행 번호의 청크 텍스트"""
+        offset, length = self._columns[row].item()[:2]
+        return self._blob[offset:offset + length].decode("utf-8")
+
+    def get_page(self, row: int) -> Optional[int]:
+        """행 번호의 PDF 페이지 번호"""
+        page = int(self._columns["page"][row])
+        return page if page >= 0 else None
+
+    def get_source(self, row: int) -> Optional[str]:
+        """행 번호의 출처 파일 경로"""
+        code = int(self._columns["source"][row])
+        return self._sources[code] if code >= 0 else None
+
+    def get_language(self, row: int) -> Optional[str]:
+        """행 번호의 언어 코드"""
+        code = int(self._columns["language"][row])
+        return self._languages[code] if code >= 0 else None
+
+    def get_metadata(self, row: int) -> dict:
+        """행 번호의 컬럼에 담지 않은 나머지 메타데이터"""
+        if "meta_length" not in self._columns.dtype.names:
+            return {}
+        meta_offset, meta_length = self._columns[row].item()[5:]
+        if not meta_length:
+            return {}
+        return json.loads(self._meta_blob[meta_offset:meta_offset + meta_length].decode("utf-8"))
+
+    def get_document(self, row: int) -> Document:
+        """행 번호의 청크 Document"""
+        offset, length, page, source, language = self._columns[row].item()[:5]
+        metadata = self.get_metadata(row)
+        if source >= 0:
+            metadata["source"] = self._sources[source]
+        if page >= 0:
+            metadata["page"] = page
+        if language >= 0:
+            metadata["language"] = self._languages[language]
+        return Document(page_content=self._blob[offset:offset + length].decode("utf-8"), metadata=metadata)
+
+    def search(self, search: str) -> Union[str, Document]:
+        """청크 ID(행 번호 문자열)로 Document 조회"""
+        try:
+            row = int(search)
+        except (TypeError, ValueError):
+            return f"ID {search} not found."
+        if not 0 <= row < len(self):
+            return f"ID {search} not found."
+        return self.get_document(row)
@@ -4,16 +4,19 @@ ETL 설정 관리
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_community.embeddings import OpenAIEmbeddings
 
-# .env 파일 로드
-load_dotenv()
+from etl.pdf.embedding_backends import create_embeddings
+from etl.pdf.embedding_cache import CachedEmbeddings
+from etl.pdf.lazy import LazyInstance
 
 
 class ETLConfig:
     """ETL 설정 클래스"""
 
     def __init__(self):
+        # .env 파일 로드 (import 시점이 아닌 설정 생성 시점)
+        load_dotenv()
+
         # 프로젝트 루트 경로
         self.project_root = Path(__file__).parent.parent.parent
 
@@ -27,9 +30,35 @@ class ETLConfig:
         self.chunk_size = 1000  # 토큰 기준 청크 크기
         self.chunk_overlap = 0  # 청크 간 겹치는 토큰 수
 
+        # FAISS 인덱스 유형 설정 (flat: 전수 검색, hnsw, ivf: IVF-Flat)
+        self.index_type = os.getenv("FAISS_INDEX_TYPE", "flat")
+        self.hnsw_m = int(os.getenv("FAISS_HNSW_M", "32"))
+        self.hnsw_ef_construction = int(os.getenv("FAISS_HNSW_EF_CONSTRUCTION", "200"))
+        self.hnsw_ef_search = int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))
+        self.ivf_nlist = int(os.getenv("FAISS_IVF_NLIST", "100"))
+        self.ivf_nprobe = int(os.getenv("FAISS_IVF_NPROBE", "8"))
+
+        # 인덱스 성능 측정 설정 (flat 기준 recall@k)
+        self.benchmark_k = int(os.getenv("FAISS_BENCHMARK_K", "5"))
+        self.benchmark_queries = int(os.getenv("FAISS_BENCHMARK_QUERIES", "100"))
+
         # OpenAI 설정
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self.embedding_model = OpenAIEmbeddings(chunk_size=self.chunk_size)
+        # 질의 임베딩 캐시 설정 (최대 항목 수, 만료 시간 초)
+        self.embedding_cache_size = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+        self.embedding_cache_ttl = int(os.getenv("EMBEDDING_CACHE_TTL", "3600"))
+        # 임베딩 백엔드 설정 (openai: OpenAI 임베딩 API, local: 로컬 sentence-transformers 모델)
+        self.embedding_backend = os.getenv("EMBEDDING_BACKEND", "openai")
+        self.local_embedding_model = os.getenv(
+            "LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+        )
+        self.local_embedding_batch_size = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+        self.local_embedding_workers = int(os.getenv("LOCAL_EMBEDDING_WORKERS", "2"))
+        self.embedding_model = CachedEmbeddings(
+            create_embeddings(self),
+            max_size=self.embedding_cache_size,
+            ttl=self.embedding_cache_ttl
+        )
 
         # 지원 언어
         self.supported_languages = {
@@ -42,5 +71,8 @@ class ETLConfig:
             "th": "태국어"
         }
 
-# 전역 설정 인스턴스
-config = ETLConfig()
+        # 가이드북이 없는 언어(예: th)의 질의가 검색할 대체 언어 인덱스
+        self.fallback_language = os.getenv("FALLBACK_LANGUAGE", "en")
+
+# 전역 설정 인스턴스 (첫 사용 시 생성)
+config = LazyInstance(ETLConfig)
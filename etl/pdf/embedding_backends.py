@@ -0,0 +1,117 @@
+"""
+임베딩 백엔드
+OpenAI 임베딩 API 또는 로컬 sentence-transformers 모델(CPU)을 설정으로 선택
+인덱스에는 생성에 사용한 백엔드/모델을 기록하여 다른 백엔드의 질의 벡터와 섞이지 않도록 함
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from langchain_community.embeddings import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+from etl.pdf.http_pool import openai_http_pool
+
+EMBEDDING_BACKENDS = ("openai", "local")
+
+
+class LocalSentenceTransformerEmbeddings(Embeddings):
+    """로컬 sentence-transformers 임베딩 (모델을 메모리에 유지하고 전용 스레드 풀에서 배치 추론)"""
+
+    def __init__(self, model_name: str, batch_size: int = 32, max_workers: int = 2, normalize: bool = True):
+        """
+        Args:
+            model_name: Hugging Face 모델명 또는 로컬 경로
+            batch_size: 추론 배치 크기
+            max_workers: 비동기 호출에 사용할 스레드 수
+            normalize: 벡터 L2 정규화 여부
+        """
+        self.model = model_name
+        self.batch_size = batch_size
+        self.normalize = normalize
+
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-embedding")
+
+    def load(self):
+        """모델 로드 (이미 로드되었으면 그대로 반환)"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "EMBEDDING_BACKEND=local을 사용하려면 sentence-transformers를 설치해야 합니다."
+                        ) from e
+                    self._model = SentenceTransformer(self.model, device="cpu")
+                    logger.info(f"로컬 임베딩 모델 로드 완료: {self.model}")
+        return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        vectors = self.load().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+def create_embeddings(config) -> Embeddings:
+    """
+    설정된 백엔드의 임베딩 모델 생성
+
+    Args:
+        config: ETLConfig (embedding_backend 및 백엔드별 설정)
+
+    Returns:
+        langchain Embeddings
+    """
+    if config.embedding_backend == "openai":
+        # 프로세스 공유 연결 풀 사용 (EmbeddingService마다 연결을 새로 맺지 않음)
+        return OpenAIEmbeddings(
+            chunk_size=config.chunk_size,
+            client=openai_http_pool.openai().embeddings,
+            async_client=openai_http_pool.async_openai().embeddings
+        )
+    if config.embedding_backend == "local":
+        return LocalSentenceTransformerEmbeddings(
+            config.local_embedding_model,
+            batch_size=config.local_embedding_batch_size,
+            max_workers=config.local_embedding_workers
+        )
+    raise ValueError(
+        f"지원하지 않는 임베딩 백엔드입니다: {config.embedding_backend} (지원: {', '.join(EMBEDDING_BACKENDS)})"
+    )
+
+
+def warm_up(embeddings: Embeddings):
+    """로컬 모델이면 첫 질의 전에 미리 로드 (캐시 래퍼는 내부 모델 기준)"""
+    embeddings = getattr(embeddings, "embeddings", embeddings)
+    if isinstance(embeddings, LocalSentenceTransformerEmbeddings):
+        embeddings.load()
+
+
+def embedding_signature(config) -> dict:
+    """인덱스에 기록할 임베딩 백엔드/모델 정보"""
+    embeddings = getattr(config.embedding_model, "embeddings", config.embedding_model)
+    return {
+        "backend": config.embedding_backend,
+        "model": getattr(embeddings, "model", None) or type(embeddings).__name__
+    }
@@ -0,0 +1,141 @@
+"""
+질의 임베딩 캐시
+같은 질문이 반복될 때 임베딩 API 호출 없이 이전 벡터를 재사용 (LRU + TTL)
+"""
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+class LRUTTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)을 가진 스레드 안전 메모리 캐시"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 캐시 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if self.ttl and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """캐시 저장 (가득 차면 가장 오래 사용되지 않은 항목부터 제거)"""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> dict:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """질의 임베딩(embed_query)만 캐시하는 임베딩 래퍼 (문서 임베딩은 그대로 위임)"""
+
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self, embeddings: Embeddings, max_size: int = 1024, ttl: float = 3600):
+        self.embeddings = embeddings
+        self.model_name = getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.cache = LRUTTLCache(max_size=max_size, ttl=ttl)
+
+    def _cache_key(self, text: str) -> tuple:
+        """모델명 + 정규화된 질의 텍스트"""
+        normalized = unicodedata.normalize("NFKC", text)
+        normalized = self._WHITESPACE.sub(" ", normalized).strip().casefold()
+        return self.model_name, normalized
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._cache_key(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.set(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._cache_key(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            self.cache.set(key, vector)
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 질의 임베딩 (캐시에 없는 질의만 한 번의 API 요청으로 임베딩)
+        OpenAI 임베딩은 질의/문서 임베딩이 같은 API이므로 embed_documents로 일괄 처리
+        """
+        keys = [self._cache_key(text) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+                self.cache.set(keys[i], vector)
+        return vectors
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """여러 질의 임베딩 (비동기)"""
+        keys = [self._cache_key(text) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = await self.embeddings.aembed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+                self.cache.set(keys[i], vector)
+        return vectors
@@ -2,61 +2,291 @@
 임베딩 서비스
 langchain의 OpenAI 임베딩을 사용하여 텍스트를 벡터로 변환하고 FAISS에 저장
 """
+import json
+import os
+import re
+import time
+from collections import defaultdict
+
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 from loguru import logger
 
+from etl.pdf.chunk_store import ChunkStore, RowIdMapping
 from etl.pdf.config import ETLConfig
+from etl.pdf.embedding_backends import embedding_signature
+from etl.pdf.index_builder import convert_faiss_db
+from etl.pdf.lexical_index import BM25Index
 
 
 class EmbeddingService:
-    def __init__(self):
-        self.config = ETLConfig()
+    # 현재 게시된 인덱스 버전을 기록하는 포인터 파일
+    CURRENT_FILE = "CURRENT"
+    # 포인터 파일이 없을 때 사용하는 기본 인덱스 이름 (index.faiss / index.pkl)
+    DEFAULT_INDEX_NAME = "index"
+    # 게시 후에도 남겨둘 이전 인덱스 수 (로드 중인 프로세스 보호)
+    KEEP_PREVIOUS = 1
+    # 언어를 알 수 없는 청크를 모아두는 파티션 키
+    UNKNOWN_LANGUAGE = "unknown"
+    # 인덱스를 만든 임베딩 백엔드/모델 기록 파일 접미사 ({version}.embedding.json)
+    EMBEDDING_MANIFEST_SUFFIX = ".embedding.json"
+    # 기록 파일이 없는 이전 인덱스는 OpenAI 임베딩으로 생성됨
+    LEGACY_EMBEDDING_BACKEND = "openai"
+
+    # 인덱스 파일을 읽기 전용 mmap으로 열기 (여러 워커가 같은 페이지 캐시 공유)
+    MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+    _SOURCE_LANGUAGE = re.compile(r"guidebook_([a-z]{2})\.pdf$", re.IGNORECASE)
+
+    def __init__(self, config: ETLConfig = None):
+        self.config = config or ETLConfig()
         self.faiss_db = None
+        # 마지막 생성 시 언어별 인덱스 측정 결과 (recall@k, 지연 시간)
+        self.index_reports = {}
+
+    @classmethod
+    def detect_language(cls, source: str) -> str:
+        """가이드북 파일명(guidebook_{언어}.pdf)에서 언어 코드 추출"""
+        match = cls._SOURCE_LANGUAGE.search(source or "")
+        return match.group(1).lower() if match else cls.UNKNOWN_LANGUAGE
 
     def create_embeddings(self, documents):
         """
-        문서에 대한 임베딩을 생성하고 FAISS DB에 저장합니다.
+        문서에 대한 임베딩을 생성하고 언어별 FAISS DB로 나누어 저장합니다.
 
         Args:
-            documents: 임베딩을 생성할 문서 리스트 (langchain Document 객체들)
+            documents: 임베딩을 생성할 문서 리스트 (langchain Document 객체들, metadata.language 포함)
 
         Returns:
-            FAISS 벡터 데이터베이스 객체
+            언어 코드 → FAISS 벡터 데이터베이스 딕셔너리
         """
         try:
             logger.info(f"{len(documents)}개 문서에 대한 임베딩 생성 시작")
 
-            # FAISS DB 생성 (임베딩 자동 생성)
-            self.faiss_db = FAISS.from_documents(
-                documents,
-                embedding=self.config.embedding_model
-            )
+            documents_by_language = defaultdict(list)
+            for document in documents:
+                language = document.metadata.get("language") or self.detect_language(document.metadata.get("source"))
+                documents_by_language[language].append(document)
 
-            logger.info("임베딩 생성 완료")
+            # 언어별 FAISS DB 생성 (임베딩 자동 생성) 후 설정된 인덱스 유형으로 변환
+            partitions = {}
+            self.index_reports = {}
+            for language, language_documents in documents_by_language.items():
+                partitions[language] = FAISS.from_documents(
+                    language_documents,
+                    embedding=self.config.embedding_model
+                )
+                logger.info(f"[{language}] 임베딩 생성 완료: {len(language_documents)}개")
+                self.index_reports[language] = convert_faiss_db(partitions[language], self.config)
 
-            # 로컬에 저장
-            save_path = self.config.faiss_index_dir
-            self.faiss_db.save_local(str(save_path))
-            logger.info(f"FAISS 인덱스 저장 완료: {save_path}")
+            # 로컬에 저장 후 게시
+            self.publish_partitions(partitions)
+            self.faiss_db = partitions
 
-            return self.faiss_db
+            return partitions
 
         except Exception as e:
             logger.error(f"임베딩 생성 중 오류 발생: {str(e)}")
             raise
 
-    def load_existing_db(self):
-        """기존에 저장된 FAISS DB를 로드합니다."""
+    def publish_partitions(self, partitions: dict) -> str:
+        """
+        언어별 FAISS DB를 새 버전 이름으로 저장한 뒤 CURRENT 포인터를 원자적으로 교체합니다.
+        실행 중인 API 서버는 포인터 변경을 감지해 재시작 없이 새 인덱스로 전환합니다.
+
+        Args:
+            partitions: 언어 코드 → FAISS DB
+
+        Returns:
+            게시된 인덱스 버전
+        """
+        save_path = self.config.faiss_index_dir
+        save_path.mkdir(parents=True, exist_ok=True)
+
+        version = f"{self.DEFAULT_INDEX_NAME}-{time.time_ns()}"
+        for language, faiss_db in partitions.items():
+            self._save_partition(faiss_db, f"{version}_{language}", language)
+        self._write_embedding_manifest(version, next(iter(partitions.values())).index.d)
+
+        self._write_current(version)
+        logger.info(f"FAISS 인덱스 게시 완료: {save_path} ({version}, 언어: {sorted(partitions)})")
+
+        self._cleanup_old_indexes(version)
+        return version
+
+    def publish_db(self, faiss_db) -> str:
+        """언어 구분 없는 단일 FAISS DB 게시 (로드 시 출처 파일명으로 언어별 분할)"""
+        save_path = self.config.faiss_index_dir
+        save_path.mkdir(parents=True, exist_ok=True)
+
+        version = f"{self.DEFAULT_INDEX_NAME}-{time.time_ns()}"
+        faiss_db.save_local(str(save_path), index_name=version)
+        self._write_embedding_manifest(version, faiss_db.index.d)
+
+        self._write_current(version)
+        logger.info(f"FAISS 인덱스 게시 완료: {save_path} ({version})")
+
+        self._cleanup_old_indexes(version)
+        return version
+
+    def migrate_legacy_index(self, index_name: str = None):
+        """
+        pickle 형식의 단일 인덱스를 언어별 청크 저장소 형식으로 변환하여 게시합니다.
+
+        Returns:
+            게시된 인덱스 버전 (변환할 인덱스가 없으면 None)
+        """
+        index_name = index_name or self.get_current_index_name()
+        flat_db = self.load_existing_db(index_name=index_name)
+        if flat_db is None:
+            return None
+        # 변환된 인덱스에는 현재 설정의 임베딩 정보가 기록되므로 먼저 호환 여부 확인
+        self.check_embedding_compatibility(index_name, {"": flat_db})
+        return self.publish_partitions(self.split_by_language(flat_db))
+
+    def _save_partition(self, faiss_db, index_name: str, language: str = None):
+        """FAISS 인덱스, 청크 저장소, BM25 인덱스를 mmap으로 열 수 있는 형식으로 저장 (pickle 미사용)"""
+        save_path = self.config.faiss_index_dir
+        faiss.write_index(faiss_db.index, str(save_path / f"{index_name}.faiss"))
+
+        documents = []
+        for row in range(faiss_db.index.ntotal):
+            document = faiss_db.docstore.search(faiss_db.index_to_docstore_id[row])
+            if language and not document.metadata.get("language"):
+                document = Document(
+                    page_content=document.page_content,
+                    metadata={**document.metadata, "language": language}
+                )
+            documents.append(document)
+        ChunkStore.write(save_path / index_name, documents)
+        # 어휘 검색 색인은 게시 시 한 번만 만들고 API 워커는 파일을 열어서 사용
+        BM25Index([document.page_content for document in documents]).save(save_path / index_name)
+
+    def _load_partition(self, index_name: str):
+        """
+        언어별 인덱스 로드
+        청크 저장소 형식이면 인덱스와 청크를 mmap으로 열어 워커 간 페이지 캐시를 공유하고,
+        이전 형식(pickle)이면 FAISS.load_local로 로드
+        """
+        index_path = self.config.faiss_index_dir
+        if not ChunkStore.exists(index_path / index_name):
+            return FAISS.load_local(
+                str(index_path),
+                self.config.embedding_model,
+                index_name=index_name,
+                allow_dangerous_deserialization=True
+            )
+
+        index = faiss.read_index(str(index_path / f"{index_name}.faiss"), self.MMAP_FLAGS)
+        docstore = ChunkStore.open(index_path / index_name)
+        return FAISS(
+            embedding_function=self.config.embedding_model,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=RowIdMapping(len(docstore))
+        )
+
+    def load_lexical_indexes(self, version: str, partitions: dict) -> dict:
+        """
+        언어별 BM25 인덱스 로드
+        게시 시 저장된 인덱스는 mmap으로 열고, 저장된 인덱스가 없는 이전 형식은 청크로 메모리에서 생성
+
+        Args:
+            version: 인덱스 버전
+            partitions: 언어 코드 → FAISS DB
+
+        Returns:
+            언어 코드 → BM25 인덱스
+        """
+        lexical_indexes = {}
+        for language, vector_db in partitions.items():
+            prefix = self.config.faiss_index_dir / f"{version}_{language}"
+            if BM25Index.exists(prefix):
+                lexical_indexes[language] = BM25Index.open(prefix)
+            else:
+                logger.warning(f"저장된 BM25 인덱스가 없어 메모리에서 생성합니다: {prefix.name}")
+                lexical_indexes[language] = BM25Index.from_faiss(vector_db)
+        return lexical_indexes
+
+    def _write_embedding_manifest(self, version: str, dimension: int):
+        """인덱스를 만든 임베딩 백엔드/모델/차원 기록"""
+        manifest = {**embedding_signature(self.config), "dimension": int(dimension)}
+        path = self.config.faiss_index_dir / f"{version}{self.EMBEDDING_MANIFEST_SUFFIX}"
+        path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+    def read_embedding_manifest(self, version: str) -> dict:
+        """인덱스 버전의 임베딩 정보 (기록이 없는 이전 인덱스는 OpenAI 백엔드로 간주)"""
+        path = self.config.faiss_index_dir / f"{version}{self.EMBEDDING_MANIFEST_SUFFIX}"
+        if not path.exists():
+            return {"backend": self.LEGACY_EMBEDDING_BACKEND}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def check_embedding_compatibility(self, version: str, partitions: dict):
+        """
+        인덱스를 만든 임베딩과 현재 질의 임베딩 설정이 같은지 확인
+
+        Raises:
+            ValueError: 백엔드, 모델 또는 벡터 차원이 다른 경우
+        """
+        manifest = self.read_embedding_manifest(version)
+        current = embedding_signature(self.config)
+
+        mismatched = [
+            key for key in ("backend", "model")
+            if manifest.get(key) is not None and manifest[key] != current[key]
+        ]
+        dimension = manifest.get("dimension")
+        if dimension is not None and any(db.index.d != dimension for db in partitions.values()):
+            mismatched.append("dimension")
+
+        if mismatched:
+            raise ValueError(
+                f"인덱스 {version}의 임베딩({manifest})이 현재 설정({current})과 다릅니다: {', '.join(mismatched)}"
+            )
+
+    def _write_current(self, version: str):
+        """포인터 파일은 임시 파일에 쓴 뒤 os.replace로 교체 (원자적)"""
+        save_path = self.config.faiss_index_dir
+        tmp_path = save_path / f".{self.CURRENT_FILE}.tmp"
+        tmp_path.write_text(version, encoding="utf-8")
+        os.replace(tmp_path, save_path / self.CURRENT_FILE)
+
+    def get_current_index_name(self):
+        """현재 게시된 인덱스 버전을 반환합니다. 인덱스가 없으면 None"""
+        index_path = self.config.faiss_index_dir
+        current_path = index_path / self.CURRENT_FILE
+        if current_path.exists():
+            version = current_path.read_text(encoding="utf-8").strip()
+        else:
+            version = self.DEFAULT_INDEX_NAME
+
+        if not self._partition_names(version) and not (index_path / f"{version}.faiss").exists():
+            return None
+        return version
+
+    def _partition_names(self, version: str) -> dict:
+        """버전에 속한 언어별 인덱스 이름 (언어 코드 → 인덱스 이름)"""
+        return {
+            path.stem[len(version) + 1:]: path.stem
+            for path in self.config.faiss_index_dir.glob(f"{version}_*.faiss")
+        }
+
+    def load_existing_db(self, index_name: str = None):
+        """기존에 저장된 FAISS DB를 로드합니다. (단일 인덱스)"""
         try:
             index_path = self.config.faiss_index_dir
+            index_name = index_name or self.get_current_index_name()
             logger.info("현재 FAISS 인덱스 로드 시도 중..." + str(index_path))
-            if index_path.exists():
+            if index_name is not None and (index_path / f"{index_name}.faiss").exists():
                 self.faiss_db = FAISS.load_local(
                     str(index_path),
                     self.config.embedding_model,
+                    index_name=index_name,
                     allow_dangerous_deserialization=True
                 )
-                logger.info("기존 FAISS 인덱스 로드 완료")
+                logger.info(f"기존 FAISS 인덱스 로드 완료 ({index_name})")
                 return self.faiss_db
             else:
                 logger.warning("기존 FAISS 인덱스를 찾을 수 없습니다.")
@@ -65,3 +295,85 @@ class EmbeddingService:
             logger.error(f"FAISS 인덱스 로드 중 오류: {str(e)}")
             return None
 
+    def load_partitions(self, version: str = None):
+        """
+        게시된 버전의 언어별 FAISS DB를 로드합니다.
+        언어별로 나뉘지 않은 이전 형식의 인덱스는 출처 파일명 기준으로 메모리에서 분할합니다.
+
+        Returns:
+            언어 코드 → FAISS DB 딕셔너리 (인덱스가 없으면 None)
+        """
+        try:
+            version = version or self.get_current_index_name()
+            if version is None:
+                logger.warning("기존 FAISS 인덱스를 찾을 수 없습니다.")
+                return None
+
+            partition_names = self._partition_names(version)
+            if not partition_names:
+                flat_db = self.load_existing_db(index_name=version)
+                if flat_db is None:
+                    return None
+                self.check_embedding_compatibility(version, {"": flat_db})
+                return self.split_by_language(flat_db)
+
+            partitions = {
+                language: self._load_partition(index_name)
+                for language, index_name in partition_names.items()
+            }
+            self.check_embedding_compatibility(version, partitions)
+            logger.info(f"언어별 FAISS 인덱스 로드 완료 ({version}, 언어: {sorted(partitions)})")
+            return partitions
+
+        except Exception as e:
+            logger.error(f"FAISS 인덱스 로드 중 오류: {str(e)}")
+            return None
+
+    def split_by_language(self, faiss_db) -> dict:
+        """단일 FAISS DB를 청크의 언어 정보 기준으로 언어별 FAISS DB로 분할"""
+        vectors = faiss_db.index.reconstruct_n(0, faiss_db.index.ntotal)
+
+        rows_by_language = defaultdict(list)
+        for row, docstore_id in faiss_db.index_to_docstore_id.items():
+            document = faiss_db.docstore.search(docstore_id)
+            language = document.metadata.get("language") or self.detect_language(document.metadata.get("source"))
+            rows_by_language[language].append(row)
+
+        partitions = {}
+        for language, rows in rows_by_language.items():
+            index = faiss.IndexFlat(faiss_db.index.d, faiss_db.index.metric_type)
+            index.add(vectors[rows])
+            docstore_ids = [faiss_db.index_to_docstore_id[row] for row in rows]
+            partitions[language] = FAISS(
+                embedding_function=faiss_db.embedding_function,
+                index=index,
+                docstore=InMemoryDocstore({i: faiss_db.docstore.search(i) for i in docstore_ids}),
+                index_to_docstore_id=dict(enumerate(docstore_ids)),
+                normalize_L2=faiss_db._normalize_L2,
+                distance_strategy=faiss_db.distance_strategy
+            )
+
+        logger.info(f"FAISS 인덱스 언어별 분할 완료: { {k: len(v) for k, v in rows_by_language.items()} }")
+        return partitions
+
+    def _cleanup_old_indexes(self, current_version: str):
+        """게시된 버전과 직전 버전을 제외한 이전 버전 파일을 삭제합니다."""
+        index_path = self.config.faiss_index_dir
+        prefix = f"{self.DEFAULT_INDEX_NAME}-"
+
+        files_by_version = defaultdict(list)
+        for path in index_path.glob(f"{prefix}*"):
+            if path.is_file():
+                files_by_version[path.name.split("_", 1)[0].split(".", 1)[0]].append(path)
+        files_by_version.pop(current_version, None)
+
+        versions = sorted(
+            files_by_version,
+            key=lambda version: int(version[len(prefix):]) if version[len(prefix):].isdigit() else 0
+        )
+        for version in versions[:-self.KEEP_PREVIOUS] if self.KEEP_PREVIOUS else versions:
+            for path in files_by_version[version]:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(f"이전 FAISS 인덱스 삭제 실패: {path.name} ({e})")
@@ -3,6 +3,7 @@ ETL 파이프라인 메인 클래스
 PDF 처리부터 벡터 DB 저장까지 전체 과정을 조율
 """
 
+from etl.pdf.config import ETLConfig
 from etl.pdf.embedding_service import EmbeddingService
 from etl.pdf.pdf_chunking import PDFProcessor
 import time
@@ -12,9 +13,9 @@ from loguru import logger
 class ETLPipeline:
     """ETL 파이프라인 메인 클래스"""
 
-    def __init__(self):
+    def __init__(self, config: ETLConfig = None):
         self.pdf_processor = PDFProcessor()
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = EmbeddingService(config)
 
         # 처리 통계
         self.stats = {
@@ -23,6 +24,7 @@ class ETLPipeline:
             'total_chunks': 0,
             'successful_chunks': 0,
             'failed_chunks': 0,
+            'index_reports': {},
             'start_time': None,
             'end_time': None
         }
@@ -58,15 +60,16 @@ class ETLPipeline:
 
             # 2. 임베딩 생성 및 FAISS DB 저장
             logger.info("2단계: 임베딩 생성 및 FAISS DB 저장")
-            faiss_db = self.embedding_service.create_embeddings(chunked_pdfs)
+            partitions = self.embedding_service.create_embeddings(chunked_pdfs)
 
-            if faiss_db is not None:
-                # FAISS DB에 저장된 벡터 수 확인
-                vector_count = faiss_db.index.ntotal if hasattr(faiss_db.index, 'ntotal') else len(chunked_pdfs)
+            if partitions:
+                # 언어별 FAISS DB에 저장된 벡터 수 합계 확인
+                vector_count = sum(faiss_db.index.ntotal for faiss_db in partitions.values())
                 self.stats['successful_chunks'] = vector_count
                 self.stats['failed_chunks'] = len(chunked_pdfs) - vector_count
+                self.stats['index_reports'] = self.embedding_service.index_reports
 
-                logger.info(f"임베딩 생성 및 저장 완료: {vector_count}개 벡터")
+                logger.info(f"임베딩 생성 및 저장 완료: {vector_count}개 벡터 ({len(partitions)}개 언어)")
             else:
                 logger.error("임베딩 생성 실패")
                 self.stats['failed_chunks'] = len(chunked_pdfs)
@@ -0,0 +1,163 @@
+"""
+OpenAI HTTP 연결 풀
+채팅/번역/임베딩 클라이언트가 프로세스 전체에서 하나의 httpx 연결 풀을 공유하여
+요청마다 TCP/TLS 연결을 새로 맺지 않고 keep-alive 연결을 재사용
+모든 요청은 호출 제어기(openai_governor)를 거쳐 요청 한도/재시도/서킷 브레이커가 적용됨
+"""
+import os
+import threading
+from typing import Optional
+
+import httpx
+from loguru import logger
+
+from etl.pdf.lazy import LazyInstance
+from etl.pdf.openai_governor import AsyncGovernedTransport, GovernedTransport, OpenAIGovernor, openai_governor
+
+
+class OpenAIHttpPool:
+    """OpenAI SDK 클라이언트와 그 아래 httpx 연결 풀 (첫 사용 시 생성)"""
+
+    def __init__(
+            self,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            http2: bool = False,
+            timeout: float = 60.0,
+            governor: Optional[OpenAIGovernor] = None
+    ):
+        """
+        Args:
+            max_connections: 최대 동시 연결 수
+            max_keepalive_connections: 유지할 유휴 연결 수
+            keepalive_expiry: 유휴 연결 유지 시간 (초)
+            http2: HTTP/2 사용 여부 (h2 패키지 필요, 없으면 HTTP/1.1)
+            timeout: 요청 타임아웃 (초)
+            governor: 요청 한도/재시도/서킷 브레이커 제어기 (기본: 전역 제어기)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and self._http2_available()
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 10.0))
+        self.governor = governor or openai_governor
+
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._openai = None
+        self._async_openai = None
+
+        self._requests = 0
+        self._connections = 0
+
+    @classmethod
+    def from_env(cls) -> "OpenAIHttpPool":
+        """환경 변수 설정으로 연결 풀 생성"""
+        return cls(
+            max_connections=int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OPENAI_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("OPENAI_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("OPENAI_HTTP2", "false").lower() == "true",
+            timeout=float(os.getenv("OPENAI_HTTP_TIMEOUT", "60"))
+        )
+
+    @staticmethod
+    def _http2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("h2 패키지가 없어 HTTP/1.1 keep-alive로 연결합니다. (pip install httpx[http2])")
+            return False
+
+    # ---- 연결 재사용 측정 (httpcore trace로 새 TCP 연결 수를 셈) ----
+    def _count_request(self, request: httpx.Request):
+        with self._lock:
+            self._requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _acount_request(self, request: httpx.Request):
+        with self._lock:
+            self._requests += 1
+        request.extensions["trace"] = self._atrace
+
+    def _trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._connections += 1
+
+    async def _atrace(self, event_name: str, info: dict):
+        self._trace(event_name, info)
+
+    @property
+    def sync_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    self._sync_client = httpx.Client(
+                        transport=GovernedTransport(
+                            httpx.HTTPTransport(limits=self.limits, http2=self.http2), self.governor
+                        ),
+                        timeout=self.timeout,
+                        event_hooks={"request": [self._count_request]}
+                    )
+        return self._sync_client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    self._async_client = httpx.AsyncClient(
+                        transport=AsyncGovernedTransport(
+                            httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2), self.governor
+                        ),
+                        timeout=self.timeout,
+                        event_hooks={"request": [self._acount_request]}
+                    )
+        return self._async_client
+
+    def openai(self):
+        """연결 풀을 사용하는 동기 OpenAI 클라이언트 (프로세스 공유)"""
+        if self._openai is None:
+            import openai
+            # 재시도는 제어기가 담당하므로 SDK 자체 재시도는 끔
+            self._openai = openai.OpenAI(http_client=self.sync_client, max_retries=0)
+        return self._openai
+
+    def async_openai(self):
+        """연결 풀을 사용하는 비동기 OpenAI 클라이언트 (프로세스 공유)"""
+        if self._async_openai is None:
+            import openai
+            self._async_openai = openai.AsyncOpenAI(http_client=self.async_client, max_retries=0)
+        return self._async_openai
+
+    async def aclose(self):
+        """연결 풀 종료 (다음 사용 시 다시 생성)"""
+        sync_client, async_client = self._sync_client, self._async_client
+        self._sync_client = self._async_client = None
+        self._openai = self._async_openai = None
+        if sync_client is not None:
+            sync_client.close()
+        if async_client is not None:
+            await async_client.aclose()
+
+    def get_stats(self) -> dict:
+        """요청 수, 새로 맺은 연결 수, 연결 재사용 비율"""
+        with self._lock:
+            reused = max(self._requests - self._connections, 0)
+            return {
+                "requests": self._requests,
+                "connections": self._connections,
+                "reused": reused,
+                "reuse_ratio": reused / self._requests if self._requests else 0.0,
+                "http2": self.http2
+            }
+
+
+# 전역 연결 풀 인스턴스 (채팅/번역/임베딩 클라이언트 공유, 첫 사용 시 생성)
+openai_http_pool = LazyInstance(OpenAIHttpPool.from_env)
@@ -0,0 +1,133 @@
+"""
+FAISS 인덱스 유형 선택 및 성능 측정
+flat(전수 검색) / HNSW / IVF-Flat 인덱스를 생성하고 flat 기준 recall@k와 질의당 지연 시간을 측정
+"""
+import time
+
+import faiss
+import numpy as np
+from loguru import logger
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+
+
+def build_index(vectors: np.ndarray, index_type: str, metric_type: int = faiss.METRIC_L2, **params):
+    """
+    벡터로 지정한 유형의 FAISS 인덱스 생성
+
+    Args:
+        vectors: (n, d) float32 벡터 행렬 (행 순서가 인덱스 행 번호)
+        index_type: flat / hnsw / ivf
+        metric_type: FAISS 거리 척도
+        **params: hnsw_m, hnsw_ef_construction, hnsw_ef_search, ivf_nlist, ivf_nprobe
+
+    Returns:
+        벡터가 추가된 FAISS 인덱스
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dim = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlat(dim, metric_type)
+
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, params.get("hnsw_m", 32), metric_type)
+        index.hnsw.efConstruction = params.get("hnsw_ef_construction", 200)
+        index.hnsw.efSearch = params.get("hnsw_ef_search", 64)
+
+    elif index_type == "ivf":
+        # 클러스터당 학습 벡터가 너무 적으면 FAISS 학습 품질이 떨어지므로 nlist 제한
+        nlist = max(1, min(params.get("ivf_nlist", 100), count // 39))
+        quantizer = faiss.IndexFlat(dim, metric_type)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric_type)
+        index.train(vectors)
+        index.nprobe = min(params.get("ivf_nprobe", 8), nlist)
+
+    else:
+        raise ValueError(f"지원하지 않는 인덱스 유형입니다: {index_type} (지원: {', '.join(INDEX_TYPES)})")
+
+    index.add(vectors)
+    return index
+
+
+def measure_index(baseline, index, queries: np.ndarray, k: int) -> dict:
+    """
+    flat 인덱스 기준 recall@k와 질의당 지연 시간 측정
+
+    Args:
+        baseline: 정답으로 사용할 전수 검색 인덱스
+        index: 측정할 인덱스
+        queries: (q, d) 질의 벡터 행렬
+        k: 검색 결과 수
+
+    Returns:
+        recall@k, 질의당 평균/p95 지연 시간(ms)
+    """
+    k = min(k, baseline.ntotal)
+
+    def timed_search(target):
+        latencies = []
+        results = []
+        for query in queries:
+            start = time.perf_counter()
+            _, ids = target.search(query.reshape(1, -1), k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(ids[0])
+        return np.asarray(results), np.asarray(latencies)
+
+    expected, baseline_latencies = timed_search(baseline)
+    actual, latencies = timed_search(index)
+
+    hits = sum(len(set(e[e != -1]) & set(a[a != -1])) for e, a in zip(expected, actual))
+    total = sum(int((e != -1).sum()) for e in expected)
+
+    return {
+        "recall_at_k": hits / total if total else 1.0,
+        "k": k,
+        "queries": len(queries),
+        "flat_ms_avg": float(baseline_latencies.mean()),
+        "ms_avg": float(latencies.mean()),
+        "ms_p95": float(np.percentile(latencies, 95))
+    }
+
+
+def convert_faiss_db(faiss_db, config) -> dict:
+    """
+    FAISS.from_documents로 생성된 flat 인덱스를 설정된 유형으로 교체하고 측정 결과 반환
+
+    Args:
+        faiss_db: langchain FAISS DB (flat 인덱스)
+        config: ETLConfig (index_type 및 인덱스 파라미터)
+
+    Returns:
+        인덱스 유형과 recall/지연 시간 측정 결과
+    """
+    flat_index = faiss_db.index
+    vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+
+    index = flat_index
+    if config.index_type != "flat":
+        index = build_index(
+            vectors,
+            config.index_type,
+            metric_type=flat_index.metric_type,
+            hnsw_m=config.hnsw_m,
+            hnsw_ef_construction=config.hnsw_ef_construction,
+            hnsw_ef_search=config.hnsw_ef_search,
+            ivf_nlist=config.ivf_nlist,
+            ivf_nprobe=config.ivf_nprobe
+        )
+
+    # 저장된 벡터 중 일부를 질의로 사용하여 측정 (실제 질의 로그가 없으므로)
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(vectors), size=min(config.benchmark_queries, len(vectors)), replace=False)
+    report = {"index_type": config.index_type, "vectors": int(flat_index.ntotal)}
+    report.update(measure_index(flat_index, index, vectors[sample], config.benchmark_k))
+
+    faiss_db.index = index
+    logger.info(
+        f"인덱스 생성 완료 - 유형: {report['index_type']}, 벡터: {report['vectors']}개, "
+        f"recall@{report['k']}: {report['recall_at_k']:.3f}, "
+        f"질의당 {report['ms_avg']:.3f}ms (p95 {report['ms_p95']:.3f}ms, flat {report['flat_ms_avg']:.3f}ms)"
+    )
+    return report
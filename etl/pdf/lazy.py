@@ -0,0 +1,52 @@
+"""
+지연 생성 전역 인스턴스
+모듈 import 시점에는 설정/클라이언트를 만들지 않고 첫 속성 접근(또는 서버 시작) 시 생성
+→ 환경 변수 없이도 import 가능하고, 무거운 라이브러리는 실제로 쓸 때 로드
+"""
+import threading
+from typing import Any, Callable
+
+
+class LazyInstance:
+    """첫 속성 접근 시 factory()로 인스턴스를 만들고 이후 모든 접근을 위임하는 프록시"""
+
+    __slots__ = ("_factory", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+            factory: 인스턴스 생성 함수 (무거운 모듈 import도 이 안에서 수행)
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    instance = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._get(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self._get(), name)
+
+    def __repr__(self) -> str:
+        instance = object.__getattribute__(self, "_instance")
+        return repr(instance) if instance is not None else "<LazyInstance (not created)>"
+
+
+def is_created(lazy: Any) -> bool:
+    """지연 인스턴스가 이미 생성되었는지 여부 (일반 객체는 항상 True)"""
+    if isinstance(lazy, LazyInstance):
+        return object.__getattribute__(lazy, "_instance") is not None
+    return True
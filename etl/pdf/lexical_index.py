@@ -0,0 +1,270 @@
+"""
+어휘 기반(BM25) 검색 인덱스
+형태소 분석기 없이 한국어/일본어/중국어를 처리하기 위해 문자 n-gram 단위로 색인
+ETL 게시 시 청크 저장소 옆에 저장하고, API 서버는 다시 색인하지 않고 mmap으로 열어 사용
+"""
+import json
+import math
+import mmap
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from etl.pdf.chunk_store import ChunkStore
+
+FORMAT_NAME = "locallinker-bm25"
+FORMAT_VERSION = 1
+
+# 용어 테이블 (행 = 사전순 용어, 마지막 행은 끝 위치를 담는 센티널)
+TERMS_DTYPE = np.dtype([
+    ("term_offset", "<i8"),
+    ("posting_offset", "<i8"),
+    ("idf", "<f4"),
+])
+# 용어별 출현 목록을 이어 붙인 배열
+POSTINGS_DTYPE = np.dtype([
+    ("doc_id", "<i4"),
+    ("tf", "<f4"),
+])
+
+
+class BM25Index:
+    """
+    문자 n-gram BM25 역색인 (문서 번호는 입력 순서 = FAISS 행 번호)
+
+    용어는 UTF-8 바이트 사전순으로 정렬하여 CSR 형태의 배열로 보관하므로
+    ETL에서 청크 저장소 옆에 저장한 파일을 워커들이 mmap으로 열어 페이지 캐시를 공유함
+
+    파일 형식 ({prefix}는 청크 저장소와 같은 인덱스 이름):
+
+        {prefix}.bm25.json        헤더 (format, version, ngram_range, k1, b, doc_count, term_count)
+        {prefix}.bm25.terms.bin   정렬된 용어 UTF-8 바이트를 이어 붙인 파일
+        {prefix}.bm25.terms.npy   용어 테이블 (TERMS_DTYPE, 용어 수 + 1행)
+        {prefix}.bm25.postings.npy  출현 목록 (POSTINGS_DTYPE)
+        {prefix}.bm25.lengths.npy   문서 길이 (float32, 행 = FAISS 행 번호)
+    """
+
+    _SEPARATOR = re.compile(r"[^\w\-]+")
+
+    HEADER_SUFFIX = ".bm25.json"
+    TERMS_TEXT_SUFFIX = ".bm25.terms.bin"
+    TERMS_SUFFIX = ".bm25.terms.npy"
+    POSTINGS_SUFFIX = ".bm25.postings.npy"
+    LENGTHS_SUFFIX = ".bm25.lengths.npy"
+
+    def __init__(self, texts: Sequence[str], ngram_range: Tuple[int, int] = (2, 3), k1: float = 1.5, b: float = 0.75):
+        self.ngram_range = tuple(ngram_range)
+        self.k1 = k1
+        self.b = b
+
+        postings = defaultdict(lambda: ([], []))
+        doc_lengths = []
+        for doc_id, text in enumerate(texts):
+            grams = Counter(self.tokenize(text))
+            doc_lengths.append(sum(grams.values()))
+            for gram, tf in grams.items():
+                doc_ids, tfs = postings[gram]
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+
+        doc_count = len(doc_lengths)
+        encoded_terms = sorted((gram.encode("utf-8"), gram) for gram in postings)
+
+        terms = np.zeros(len(encoded_terms) + 1, dtype=TERMS_DTYPE)
+        posting_rows = np.zeros(sum(len(doc_ids) for doc_ids, _ in postings.values()), dtype=POSTINGS_DTYPE)
+        term_offset = posting_offset = 0
+        for i, (encoded, gram) in enumerate(encoded_terms):
+            doc_ids, tfs = postings[gram]
+            terms[i] = (
+                term_offset,
+                posting_offset,
+                math.log(1 + (doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            )
+            posting_rows["doc_id"][posting_offset:posting_offset + len(doc_ids)] = doc_ids
+            posting_rows["tf"][posting_offset:posting_offset + len(doc_ids)] = tfs
+            term_offset += len(encoded)
+            posting_offset += len(doc_ids)
+        terms[-1] = (term_offset, posting_offset, 0.0)
+
+        self._set_arrays(
+            term_bytes=b"".join(encoded for encoded, _ in encoded_terms),
+            terms=terms,
+            postings=posting_rows,
+            doc_lengths=np.asarray(doc_lengths, dtype=np.float32)
+        )
+        # 메모리에서 만든 인덱스는 용어 → 행 사전으로 조회 (파일에서 연 인덱스는 이진 탐색)
+        self._term_rows = {gram: i for i, (_, gram) in enumerate(encoded_terms)}
+
+    def _set_arrays(self, term_bytes, terms: np.ndarray, postings: np.ndarray, doc_lengths: np.ndarray):
+        self._term_bytes = term_bytes
+        self._terms = terms
+        self._postings = postings
+        self.doc_lengths = doc_lengths
+        self.doc_count = len(doc_lengths)
+        self.avg_doc_length = float(doc_lengths.mean()) if self.doc_count else 0.0
+
+    @classmethod
+    def from_faiss(cls, vector_db, **kwargs) -> "BM25Index":
+        """FAISS DB의 청크로 인덱스 생성 (FAISS 행 순서 유지)"""
+        if isinstance(vector_db.docstore, ChunkStore):
+            # 청크 저장소는 Document를 만들지 않고 텍스트만 읽음
+            texts = [vector_db.docstore.get_text(row) for row in range(vector_db.index.ntotal)]
+            return cls(texts, **kwargs)
+
+        texts = [
+            vector_db.docstore.search(vector_db.index_to_docstore_id[row]).page_content
+            for row in range(vector_db.index.ntotal)
+        ]
+        return cls(texts, **kwargs)
+
+    # ---- 저장/로드 ----
+    @classmethod
+    def _paths(cls, prefix: Path):
+        prefix = Path(prefix)
+        return tuple(
+            prefix.with_name(prefix.name + suffix)
+            for suffix in (cls.HEADER_SUFFIX, cls.TERMS_TEXT_SUFFIX, cls.TERMS_SUFFIX, cls.POSTINGS_SUFFIX, cls.LENGTHS_SUFFIX)
+        )
+
+    @classmethod
+    def exists(cls, prefix: Path) -> bool:
+        """저장된 인덱스 파일이 모두 있는지 확인"""
+        return all(path.exists() for path in cls._paths(prefix))
+
+    def save(self, prefix: Path):
+        """인덱스를 mmap으로 열 수 있는 형식으로 저장"""
+        header_path, text_path, terms_path, postings_path, lengths_path = self._paths(prefix)
+        text_path.write_bytes(bytes(self._term_bytes))
+        np.save(terms_path, self._terms)
+        np.save(postings_path, self._postings)
+        np.save(lengths_path, self.doc_lengths)
+        header_path.write_text(json.dumps({
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "ngram_range": list(self.ngram_range),
+            "k1": self.k1,
+            "b": self.b,
+            "doc_count": self.doc_count,
+            "term_count": len(self._terms) - 1
+        }), encoding="utf-8")
+
+    @classmethod
+    def open(cls, prefix: Path) -> "BM25Index":
+        """저장된 인덱스를 읽기 전용 mmap으로 열기 (색인을 다시 만들지 않음)"""
+        header_path, text_path, terms_path, postings_path, lengths_path = cls._paths(prefix)
+
+        header = json.loads(header_path.read_text(encoding="utf-8"))
+        if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 BM25 인덱스 형식입니다: {header.get('format')} v{header.get('version')}")
+
+        term_bytes = b""
+        if text_path.stat().st_size:
+            with open(text_path, "rb") as f:
+                term_bytes = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        terms = np.load(terms_path, mmap_mode="r")
+        postings = np.load(postings_path, mmap_mode="r")
+        doc_lengths = np.load(lengths_path, mmap_mode="r")
+        if (
+                terms.dtype != TERMS_DTYPE or postings.dtype != POSTINGS_DTYPE
+                or len(terms) != header["term_count"] + 1 or len(doc_lengths) != header["doc_count"]
+        ):
+            raise ValueError("BM25 인덱스 배열이 헤더와 일치하지 않습니다.")
+
+        index = cls.__new__(cls)
+        index.ngram_range = tuple(header["ngram_range"])
+        index.k1 = header["k1"]
+        index.b = header["b"]
+        index._set_arrays(term_bytes, terms, postings, doc_lengths)
+        index._term_rows = None
+        return index
+
+    def _find_term(self, gram: str) -> Optional[int]:
+        """용어의 테이블 행 번호 (없으면 None)"""
+        if self._term_rows is not None:
+            return self._term_rows.get(gram)
+
+        target = gram.encode("utf-8")
+        offsets = self._terms["term_offset"]
+        lo, hi = 0, len(self._terms) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            term = self._term_bytes[int(offsets[mid]):int(offsets[mid + 1])]
+            if term < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._terms) - 1 and self._term_bytes[int(offsets[lo]):int(offsets[lo + 1])] == target:
+            return lo
+        return None
+
+    def posting(self, gram: str) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        """용어의 (문서 번호 배열, 출현 빈도 배열, idf) (없으면 None)"""
+        row = self._find_term(gram)
+        if row is None:
+            return None
+        start, end = int(self._terms["posting_offset"][row]), int(self._terms["posting_offset"][row + 1])
+        postings = self._postings[start:end]
+        return postings["doc_id"], postings["tf"], float(self._terms["idf"][row])
+
+    def tokenize(self, text: str) -> Iterable[str]:
+        """정규화 후 단어별 문자 n-gram 생성 (n보다 짧은 단어는 그대로 사용)"""
+        normalized = unicodedata.normalize("NFKC", text or "").casefold()
+        min_n, max_n = self.ngram_range
+        for token in self._SEPARATOR.sub(" ", normalized).split():
+            if len(token) < min_n:
+                yield token
+                continue
+            for n in range(min_n, max_n + 1):
+                for i in range(len(token) - n + 1):
+                    yield token[i:i + n]
+
+    def search(self, query: str, k: int) -> List[int]:
+        """
+        BM25 점수 상위 k개 문서 번호 반환 (점수 0인 문서 제외)
+
+        Args:
+            query: 검색어
+            k: 반환할 문서 수
+
+        Returns:
+            점수 내림차순 문서 번호 목록
+        """
+        if not self.doc_count:
+            return []
+
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / (self.avg_doc_length or 1.0))
+        for gram in set(self.tokenize(query)):
+            posting = self.posting(gram)
+            if posting is None:
+                continue
+            doc_ids, tfs, idf = posting
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + norm[doc_ids])
+
+        k = min(k, self.doc_count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [int(doc_id) for doc_id in top if scores[doc_id] > 0]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int = 60) -> List[int]:
+    """
+    여러 검색 결과 순위를 Reciprocal Rank Fusion으로 결합
+
+    Args:
+        rankings: 검색기별 문서 번호 순위 목록
+        k: 순위 완화 상수 (클수록 하위 순위 영향이 커짐)
+
+    Returns:
+        결합 점수 내림차순 문서 번호 목록
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
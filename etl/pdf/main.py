@@ -8,7 +8,10 @@ import argparse
 import sys
 from pathlib import Path
 from loguru import logger
+from etl.pdf.config import ETLConfig
+from etl.pdf.embedding_service import EmbeddingService
 from etl.pdf.etl_pipeline import ETLPipeline
+from etl.pdf.index_builder import INDEX_TYPES
 
 
 def setup_logging():
@@ -46,6 +49,12 @@ def main():
   
   # 특정 PDF 파일만 처리
   python -m etl.main --pdf-file guidebook_ko.pdf
+
+  # HNSW 인덱스로 생성 (flat 대비 recall@k / 지연 시간 리포트 출력)
+  python -m etl.pdf.main --index-type hnsw --hnsw-m 32 --hnsw-ef-search 64
+
+  # 기존 pickle 인덱스를 언어별 청크 저장소 형식으로 변환 (임베딩 재생성 없음)
+  python -m etl.pdf.main --migrate-legacy
         """
     )
 
@@ -68,6 +77,24 @@ def main():
         help='처리할 특정 PDF 파일명 (전체 처리 시 생략)'
     )
 
+    parser.add_argument(
+        '--index-type',
+        choices=list(INDEX_TYPES),
+        help='FAISS 인덱스 유형 (기본값: FAISS_INDEX_TYPE 환경변수 또는 flat)'
+    )
+
+    parser.add_argument('--hnsw-m', type=int, help='HNSW 노드당 연결 수 (M)')
+    parser.add_argument('--hnsw-ef-construction', type=int, help='HNSW 생성 시 탐색 폭 (efConstruction)')
+    parser.add_argument('--hnsw-ef-search', type=int, help='HNSW 검색 시 탐색 폭 (efSearch)')
+    parser.add_argument('--ivf-nlist', type=int, help='IVF 클러스터 수 (nlist)')
+    parser.add_argument('--ivf-nprobe', type=int, help='IVF 검색 시 탐색할 클러스터 수 (nprobe)')
+
+    parser.add_argument(
+        '--migrate-legacy',
+        action='store_true',
+        help='기존 pickle 인덱스를 청크 저장소 형식으로 변환하여 게시'
+    )
+
     parser.add_argument(
         '--log-level',
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -100,14 +127,34 @@ def main():
     try:
         logger.info("ETL 파이프라인 시작")
 
+        # 인덱스 유형 설정 (명령행 인자가 환경변수보다 우선)
+        config = ETLConfig()
+        for option in ('index_type', 'hnsw_m', 'hnsw_ef_construction', 'hnsw_ef_search', 'ivf_nlist', 'ivf_nprobe'):
+            value = getattr(args, option)
+            if value is not None:
+                setattr(config, option, value)
+
+        if args.migrate_legacy:
+            version = EmbeddingService(config).migrate_legacy_index()
+            if version is None:
+                logger.error("변환할 pickle 인덱스가 없습니다.")
+                return 1
+            logger.info(f"청크 저장소 형식으로 변환 완료 ({version})")
+            return 0
+
         # ETL 파이프라인 초기화
-        pipeline = ETLPipeline()
+        pipeline = ETLPipeline(config)
 
         # 전체 파이프라인 실행
         logger.info("전체 ETL 파이프라인 실행")
         success = pipeline.run()
 
         if success:
+            for language, report in success.get('index_reports', {}).items():
+                logger.info(
+                    f"[{language}] {report['index_type']} recall@{report['k']}={report['recall_at_k']:.3f}, "
+                    f"질의당 {report['ms_avg']:.3f}ms (flat {report['flat_ms_avg']:.3f}ms)"
+                )
             logger.info("ETL 파이프라인 실행 완료")
             return 0
         else:
@@ -0,0 +1,448 @@
+"""
+OpenAI 호출 제어기
+공유 연결 풀(http_pool)의 전송 계층에서 모든 OpenAI 요청(채팅/번역/임베딩)을 제어
+- 모델별 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷: 한도를 넘는 요청은 보내지 않고 대기
+- 429/5xx/연결 오류는 지터를 둔 지수 백오프로 재시도 (Retry-After 우선)
+- 5xx/연결 오류가 연속되면 서킷 브레이커를 열어 일정 시간 즉시 실패
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from etl.pdf.lazy import LazyInstance
+
+# 재시도할 응답 상태 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """서킷 브레이커가 열려 요청을 보내지 않음"""
+
+
+class RateLimitWaitTimeout(httpx.TransportError):
+    """요청 한도 대기 시간이 상한을 넘음"""
+
+
+class TokenBucket:
+    """분당 한도 토큰 버킷 (예약 방식: 부족하면 채워질 때까지의 대기 시간을 반환)"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: 분당 충전량
+            capacity: 최대 적립량 (기본: 분당 충전량)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """amount만큼 예약하고 사용 가능해질 때까지의 대기 시간(초) 반환"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float):
+        """보내지 않은 요청의 예약 반환"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+    def pause(self, seconds: float):
+        """429 응답 후 seconds 동안 새 요청이 나가지 않도록 적립량을 비움"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class CircuitBreaker:
+    """연속 실패 시 열리고, reset_timeout 후 시험 요청 하나로 복구를 확인하는 서킷 브레이커"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened = 0
+
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_inflight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        요청 허용 여부 확인 (열려 있으면 CircuitOpenError)
+
+        Returns:
+            복구 확인용 시험 요청인지 여부 (결과를 기록하지 못하면 release_trial로 반환해야 함)
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.HALF_OPEN and not self._trial_inflight:
+                self._trial_inflight = True
+                return True
+            retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+        raise CircuitOpenError(f"OpenAI 서킷 브레이커가 열려 있습니다 ({retry_in:.1f}초 후 재시도)")
+
+    def release_trial(self):
+        """결과 없이 끝난 시험 요청(취소 등)의 자리를 반환하여 다음 요청이 다시 시험하도록 함"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_inflight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_inflight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_inflight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                    logger.warning(f"OpenAI 서킷 브레이커 열림 (연속 실패 {self._failures}회)")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+@dataclass
+class Admission:
+    """예약된 요청 한도"""
+    model: str
+    tokens: int
+    wait: float
+    trial: bool = False
+
+
+class OpenAIGovernor:
+    """모델별 요청/토큰 한도, 재시도, 서킷 브레이커를 관리하는 호출 제어기"""
+
+    def __init__(
+            self,
+            rpm: int = 500,
+            tpm: int = 200000,
+            model_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+            max_retries: int = 3,
+            base_delay: float = 0.5,
+            max_delay: float = 20.0,
+            max_wait: float = 30.0,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            completion_tokens: int = 500,
+            token_counter: Optional[Callable[[str, str], int]] = None
+    ):
+        """
+        Args:
+            rpm: 모델별 기본 분당 요청 수
+            tpm: 모델별 기본 분당 토큰 수
+            model_limits: 모델별 (rpm, tpm) 재정의
+            max_retries: 재시도 횟수
+            base_delay: 백오프 기본 대기 시간 (초)
+            max_delay: 백오프 최대 대기 시간 (초)
+            max_wait: 한도 대기 시간 상한 (초, 넘으면 RateLimitWaitTimeout)
+            failure_threshold: 서킷 브레이커를 여는 연속 실패 수
+            reset_timeout: 서킷 브레이커가 열린 뒤 시험 요청까지의 시간 (초)
+            completion_tokens: 요청에 max_tokens가 없을 때 추정할 응답 토큰 수
+            token_counter: (모델, 텍스트) → 토큰 수 (기본: tiktoken)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.model_limits = model_limits or {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.completion_tokens = completion_tokens
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self._token_counter = token_counter
+        self._encodings = {}
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+        self._requests = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+        self._retries = 0
+        self._rate_limited = 0
+
+    @classmethod
+    def from_env(cls) -> "OpenAIGovernor":
+        """
+        환경 변수 설정으로 제어기 생성
+        OPENAI_RATE_LIMITS 형식: "모델=rpm:tpm,모델=rpm:tpm"
+        """
+        model_limits = {}
+        for entry in os.getenv("OPENAI_RATE_LIMITS", "").split(","):
+            if "=" in entry:
+                model, limits = entry.split("=", 1)
+                rpm, tpm = limits.split(":")
+                model_limits[model.strip()] = (int(rpm), int(tpm))
+        return cls(
+            rpm=int(os.getenv("OPENAI_RPM_LIMIT", "500")),
+            tpm=int(os.getenv("OPENAI_TPM_LIMIT", "200000")),
+            model_limits=model_limits,
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "3")),
+            base_delay=float(os.getenv("OPENAI_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("OPENAI_RETRY_MAX_DELAY", "20")),
+            max_wait=float(os.getenv("OPENAI_RATE_LIMIT_MAX_WAIT", "30")),
+            failure_threshold=int(os.getenv("OPENAI_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("OPENAI_BREAKER_RESET_SECONDS", "30")),
+            completion_tokens=int(os.getenv("OPENAI_COMPLETION_TOKEN_ESTIMATE", "500"))
+        )
+
+    # ---- 토큰 추정 ----
+    def count_tokens(self, model: str, text: str) -> int:
+        """텍스트 토큰 수 (tiktoken 인코딩을 불러올 수 없으면 문자 수로 상한 추정)"""
+        if self._token_counter is not None:
+            return self._token_counter(model, text)
+        if model not in self._encodings:
+            try:
+                import tiktoken
+                try:
+                    self._encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self._encodings[model] = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken 인코딩 로드 실패, 문자 수로 토큰을 추정합니다: {str(e)}")
+                self._encodings[model] = None
+        encoding = self._encodings[model]
+        return len(encoding.encode(text)) if encoding is not None else len(text)
+
+    def estimate_tokens(self, model: str, body: dict) -> int:
+        """요청 본문의 입력 토큰 + 예상 응답 토큰"""
+        texts, tokens = [], 0
+        for message in body.get("messages") or []:
+            content = message.get("content")
+            if isinstance(content, str):
+                texts.append(content)
+            elif isinstance(content, list):
+                texts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+
+        inputs = body.get("input")
+        if isinstance(inputs, str):
+            texts.append(inputs)
+        elif isinstance(inputs, list):
+            texts.extend(item for item in inputs if isinstance(item, str))
+            # 이미 토큰화된 입력 (임베딩 배치)
+            tokens += sum(len(item) for item in inputs if isinstance(item, list))
+
+        tokens += sum(self.count_tokens(model, text) for text in texts if text)
+        if "messages" in body:
+            tokens += body.get("max_tokens") or body.get("max_completion_tokens") or self.completion_tokens
+        return tokens
+
+    # ---- 한도 예약 ----
+    def _get_buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            if model not in self._buckets:
+                rpm, tpm = self.model_limits.get(model, (self.rpm, self.tpm))
+                self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+            return self._buckets[model]
+
+    def admit(self, request: httpx.Request) -> Admission:
+        """요청/토큰 한도 예약 후 서킷 브레이커 확인 (대기 시간 반환)"""
+        try:
+            body = json.loads(request.content or b"{}")
+        except (ValueError, httpx.RequestNotRead):
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+        model = body.get("model") or "default"
+        tokens = self.estimate_tokens(model, body)
+
+        requests_bucket, tokens_bucket = self._get_buckets(model)
+        wait = max(requests_bucket.reserve(1), tokens_bucket.reserve(tokens))
+        try:
+            if wait > self.max_wait:
+                raise RateLimitWaitTimeout(f"{model} 요청 한도 대기 시간 초과 ({wait:.1f}초)")
+            trial = self.breaker.allow()
+        except httpx.TransportError:
+            requests_bucket.refund(1)
+            tokens_bucket.refund(tokens)
+            raise
+
+        with self._lock:
+            self._requests += 1
+            if wait > 0:
+                self._throttled += 1
+                self._wait_seconds += wait
+        return Admission(model=model, tokens=tokens, wait=wait, trial=trial)
+
+    def release(self, admission: Admission):
+        """
+        응답을 받지 못한 요청의 예약 반환 (연결 오류, 취소)
+        시험 요청이었다면 서킷 브레이커의 시험 자리도 반환하여 half_open에 갇히지 않도록 함
+        """
+        requests_bucket, tokens_bucket = self._get_buckets(admission.model)
+        requests_bucket.refund(1)
+        tokens_bucket.refund(admission.tokens)
+        if admission.trial:
+            self.breaker.release_trial()
+
+    # ---- 결과 처리 ----
+    def on_response(self, admission: Admission, response: httpx.Response, attempt: int) -> Optional[float]:
+        """
+        응답 결과 기록
+
+        Returns:
+            재시도 대기 시간 (재시도하지 않으면 None)
+        """
+        status = response.status_code
+        if status not in RETRYABLE_STATUS:
+            self.breaker.record_success()
+            return None
+
+        if status == 429:
+            # 한도 초과는 서버가 정상 응답한 것이므로 장애로 보지 않고, 같은 모델 요청 전체를 잠시 멈춤
+            self.breaker.record_success()
+            with self._lock:
+                self._rate_limited += 1
+        else:
+            self.breaker.record_failure()
+
+        if attempt > self.max_retries:
+            return None
+        delay = self._retry_delay(attempt, response)
+        if status == 429:
+            for bucket in self._get_buckets(admission.model):
+                bucket.pause(delay)
+        with self._lock:
+            self._retries += 1
+        return delay
+
+    def on_error(self, attempt: int) -> Optional[float]:
+        """연결 오류 기록 후 재시도 대기 시간 반환 (재시도하지 않으면 None)"""
+        self.breaker.record_failure()
+        if attempt > self.max_retries:
+            return None
+        with self._lock:
+            self._retries += 1
+        return self._retry_delay(attempt)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Retry-After 헤더 우선, 없으면 지터를 둔 지수 백오프"""
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return min(self.base_delay * (2 ** (attempt - 1)), self.max_delay) * random.uniform(0.5, 1.5)
+
+    def get_stats(self) -> dict:
+        """요청/대기/재시도/429 횟수와 서킷 브레이커 상태"""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "wait_seconds": round(self._wait_seconds, 3),
+                "retries": self._retries,
+                "rate_limited": self._rate_limited,
+                "breaker_state": self.breaker.state,
+                "breaker_opened": self.breaker.opened
+            }
+
+
+class GovernedTransport(httpx.BaseTransport):
+    """호출 제어기를 거쳐 요청을 보내는 동기 전송 계층"""
+
+    def __init__(self, transport: httpx.BaseTransport, governor: OpenAIGovernor):
+        self._transport = transport
+        self.governor = governor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            admission = self.governor.admit(request)
+            try:
+                if admission.wait:
+                    time.sleep(admission.wait)
+                response = self._transport.handle_request(request)
+            except httpx.TransportError:
+                self.governor.release(admission)
+                delay = self.governor.on_error(attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # 중단(KeyboardInterrupt 등)도 예약과 시험 자리를 반환한 뒤 전파
+                self.governor.release(admission)
+                raise
+
+            delay = self.governor.on_response(admission, response, attempt)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncGovernedTransport(httpx.AsyncBaseTransport):
+    """호출 제어기를 거쳐 요청을 보내는 비동기 전송 계층 (대기 중 이벤트 루프를 막지 않음)"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, governor: OpenAIGovernor):
+        self._transport = transport
+        self.governor = governor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            admission = self.governor.admit(request)
+            try:
+                if admission.wait:
+                    await asyncio.sleep(admission.wait)
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                self.governor.release(admission)
+                delay = self.governor.on_error(attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # 대기/전송 중 취소(임베딩 시간 초과, 클라이언트 연결 끊김 등)되어도 예약과 시험 자리를 반환
+                self.governor.release(admission)
+                raise
+
+            delay = self.governor.on_response(admission, response, attempt)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+# 전역 호출 제어기 인스턴스 (연결 풀의 모든 OpenAI 요청이 공유, 첫 사용 시 생성)
+openai_governor = LazyInstance(OpenAIGovernor.from_env)
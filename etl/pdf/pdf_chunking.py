@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from etl.pdf.config import ETLConfig
+from etl.pdf.embedding_service import EmbeddingService
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
@@ -35,5 +36,10 @@ class PDFProcessor:
 
         chunks = text_splitter.split_documents(documents)
 
+        # 언어별 인덱스 분할을 위해 출처 가이드북 언어 표시
+        language = EmbeddingService.detect_language(pdf_path)
+        for chunk in chunks:
+            chunk.metadata["language"] = language
+
         return chunks
 
@@ -0,0 +1,30 @@
+"""
+테스트 공통 설정
+"""
+import os
+import tempfile
+
+import pytest
+
+# 테스트 환경에서 사용할 더미 환경변수 (실제 값이 있으면 그대로 사용)
+os.environ.setdefault("OPENAI_API_KEY", "test-key-for-ci")
+os.environ.setdefault("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+os.environ.setdefault("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+os.environ.setdefault("TOP_K_RESULTS", "5")
+os.environ.setdefault("MAX_TOKENS", "1000")
+os.environ.setdefault("TEMPERATURE", "0.7")
+os.environ.setdefault("TRANSLATION_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "translation_cache.sqlite3"))
+
+
+@pytest.fixture(autouse=True)
+def offline_token_encoding(monkeypatch):
+    """tiktoken 인코딩 파일을 내려받지 않도록 문자 수 추정 인코딩 사용"""
+    from app.services.ContextPacker import _CharEncoding, context_packer
+    monkeypatch.setattr(context_packer, "_encoding", _CharEncoding())
+
+
+@pytest.fixture(autouse=True)
+def empty_translation_cache():
+    """테스트마다 빈 번역 캐시에서 시작"""
+    from app.services.TranslationCache import translation_cache
+    translation_cache.clear()
@@ -0,0 +1,70 @@
+"""
+챗봇 API 테스트 (LLM/임베딩은 가짜 모델 사용)
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.api.endpoints import chatbot
+from app.main import app
+from app.services.SemanticAnswerCache import semantic_answer_cache
+from app.services.VectorIndexManager import IndexSnapshot, vector_index_manager
+from etl.pdf.embedding_cache import CachedEmbeddings
+
+
+@pytest.fixture
+def client(monkeypatch):
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=CachedEmbeddings(FakeEmbeddings(size=8)))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(partitions={"ko": vector_db}, version="test"))
+    monkeypatch.setattr(chatbot.openAiService, "client", FakeListChatModel(responses=["출입국사무소를 방문하세요."]))
+    semantic_answer_cache.clear()
+    return TestClient(app)
+
+
+def _parse_sse(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_ask_stream_sends_tokens_then_done(client):
+    """토큰 이벤트를 순서대로 보내고 마지막에 소요 시간 정보를 전송"""
+    response = client.post("/api/chatbot/ask/stream", json={"query": "외국인등록은?", "lang": "ko"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    tokens = [data["token"] for event, data in events if event == "token"]
+    assert "".join(tokens) == "출입국사무소를 방문하세요."
+    assert events[-1][0] == "done"
+    assert events[-1][1]["answer_length"] == len("출입국사무소를 방문하세요.")
+    assert "time_to_first_token_ms" in events[-1][1]
+
+
+def test_ask_batch_keeps_order_and_reports_item_errors(client, monkeypatch):
+    """일괄 요청은 입력 순서를 유지하고 실패 항목만 오류로 표시"""
+    class FlakyChatModel(FakeListChatModel):
+        async def ainvoke(self, input, *args, **kwargs):
+            if "실패" in input.to_string():
+                raise RuntimeError("upstream error")
+            return await super().ainvoke(input, *args, **kwargs)
+
+    monkeypatch.setattr(chatbot.openAiService, "client", FlakyChatModel(responses=["답변"]))
+
+    response = client.post("/api/chatbot/ask-batch", json={"questions": [
+        {"query": "외국인등록은?", "lang": "ko"},
+        {"query": "실패하는 질문", "lang": "en"},
+        {"query": "건강보험은?", "lang": "ja"},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["answer"] for item in results] == ["답변", None, "답변"]
+    assert results[1]["error"] is not None
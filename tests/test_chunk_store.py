@@ -0,0 +1,115 @@
+"""
+mmap 청크 저장소 테스트
+"""
+import json
+
+import numpy as np
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from app.services.VectorIndexManager import VectorIndexManager
+from etl.pdf.chunk_store import COLUMNS_DTYPE_V1, FORMAT_VERSION, ChunkStore
+from etl.pdf.embedding_service import EmbeddingService
+
+
+def test_chunk_store_round_trip(tmp_path):
+    """UTF-8 텍스트와 메타데이터 컬럼, 나머지 메타데이터를 행 번호로 조회"""
+    documents = [
+        Document(page_content="외국인등록 안내", metadata={"source": "guidebook_ko.pdf", "page": 1, "language": "ko"}),
+        Document(page_content="", metadata={"source": "guidebook_ko.pdf", "page": 2, "language": "ko"}),
+        Document(page_content="外国人登録のご案内", metadata={"source": "guidebook_ja.pdf", "page": 3, "language": "ja"}),
+        Document(page_content="extra metadata", metadata={"producer": "한글 PDF", "total_pages": 12, "page": "iv"}),
+    ]
+    ChunkStore.write(tmp_path / "index", documents)
+
+    store = ChunkStore.open(tmp_path / "index")
+
+    assert len(store) == 4
+    assert store.get_text(2) == "外国人登録のご案内"
+    assert store.get_source(2) == "guidebook_ja.pdf"
+    assert store.get_page(2) == 3
+    assert store.get_language(1) == "ko"
+    assert store.column("language").tolist() == [0, 0, 1, -1]
+    assert store.search("1").page_content == ""
+    assert store.search("0").metadata == {"source": "guidebook_ko.pdf", "page": 1, "language": "ko"}
+    assert store.search("3").metadata == {"producer": "한글 PDF", "total_pages": 12, "page": "iv"}
+    assert store.get_metadata(0) == {}
+    assert store.search("4") == "ID 4 not found."
+    assert store.search("x") == "ID x not found."
+
+
+def test_chunk_store_rejects_unknown_format(tmp_path):
+    """헤더 형식 버전이 다르면 로드하지 않음"""
+    ChunkStore.write(tmp_path / "index", [Document(page_content="a")])
+    header_path = tmp_path / f"index{ChunkStore.HEADER_SUFFIX}"
+    header_path.write_text(header_path.read_text().replace(f'"version": {FORMAT_VERSION}', '"version": 99'))
+
+    with pytest.raises(ValueError):
+        ChunkStore.open(tmp_path / "index")
+
+
+def test_chunk_store_opens_version_1(tmp_path):
+    """나머지 메타데이터가 없는 버전 1 저장소도 열 수 있음"""
+    prefix = tmp_path / "index"
+    (tmp_path / f"index{ChunkStore.TEXT_SUFFIX}").write_bytes("안내".encode("utf-8"))
+    np.save(tmp_path / f"index{ChunkStore.COLUMNS_SUFFIX}", np.array([(0, 6, 4, 0, -1)], dtype=COLUMNS_DTYPE_V1))
+    (tmp_path / f"index{ChunkStore.HEADER_SUFFIX}").write_text(json.dumps({
+        "format": "locallinker-chunks", "version": 1, "count": 1, "sources": ["guidebook_ko.pdf"], "languages": []
+    }))
+
+    store = ChunkStore.open(prefix)
+
+    assert store.search("0").page_content == "안내"
+    assert store.search("0").metadata == {"source": "guidebook_ko.pdf", "page": 4}
+
+
+def test_published_partitions_load_without_pickle(tmp_path):
+    """게시된 언어별 인덱스는 pickle 없이 mmap으로 로드"""
+    service = EmbeddingService()
+    service.config.faiss_index_dir = tmp_path
+    service.config.embedding_model = FakeEmbeddings(size=8)
+    faiss_db = FAISS.from_texts(
+        ["외국인등록", "건강보험"],
+        embedding=service.config.embedding_model,
+        metadatas=[{"page": 1}, {"page": 2}]
+    )
+    service.publish_partitions({"ko": faiss_db})
+
+    assert not list(tmp_path.glob("*.pkl"))
+
+    vector_db = VectorIndexManager(embedding_service=service, reload_interval=1).get().get_vector_db("ko")
+    vector = faiss_db.index.reconstruct(1).tolist()
+
+    assert isinstance(vector_db.docstore, ChunkStore)
+    assert vector_db.similarity_search_by_vector(vector, k=1)[0].metadata == {"page": 2, "language": "ko"}
+
+
+def test_migrate_legacy_index(tmp_path):
+    """pickle 단일 인덱스를 언어별 청크 저장소로 변환"""
+    service = EmbeddingService()
+    service.config.faiss_index_dir = tmp_path
+    service.config.embedding_model = FakeEmbeddings(size=8)
+    FAISS.from_texts(
+        ["외국인등록", "外国人登録", "건강보험"],
+        embedding=service.config.embedding_model,
+        metadatas=[
+            {"source": "guidebook_ko.pdf", "section": "체류"},
+            {"source": "guidebook_ja.pdf", "author": "出入国管理庁"},
+            {"source": "guidebook_ko.pdf"}
+        ]
+    ).save_local(str(tmp_path), index_name=service.DEFAULT_INDEX_NAME)
+
+    version = service.migrate_legacy_index()
+    partitions = service.load_partitions()
+
+    assert service.get_current_index_name() == version
+    assert {language: len(db.docstore) for language, db in partitions.items()} == {"ko": 2, "ja": 1}
+    assert partitions["ja"].docstore.get_source(0) == "guidebook_ja.pdf"
+    assert partitions["ja"].docstore.get_language(0) == "ja"
+    # 컬럼에 담지 않는 메타데이터도 변환 후 유지
+    assert partitions["ja"].docstore.search("0").metadata == {
+        "source": "guidebook_ja.pdf", "author": "出入国管理庁", "language": "ja"
+    }
+    assert partitions["ko"].docstore.get_metadata(0) == {"section": "체류"}
@@ -0,0 +1,50 @@
+"""
+토큰 예산 기반 컨텍스트 패커 테스트
+"""
+from langchain_core.documents import Document
+
+from app.services.ContextPacker import ContextPacker, _CharEncoding
+
+
+def _make_packer(token_budget=1000, dedup_threshold=0.8):
+    return ContextPacker(token_budget=token_budget, dedup_threshold=dedup_threshold, encoding=_CharEncoding())
+
+
+def test_pack_drops_near_duplicate_chunks():
+    """이미 담은 청크와 거의 같은 청크는 제외하고 절약한 토큰을 집계"""
+    docs = [
+        Document(page_content="외국인등록은 입국 후 90일 이내에 출입국사무소에서 신청합니다."),
+        Document(page_content="외국인등록은 입국 후 90일 이내에 출입국사무소에서 신청합니다!"),
+        Document(page_content="건강보험은 6개월 이상 체류하면 자동으로 가입됩니다."),
+    ]
+    packer = _make_packer()
+
+    packed = packer.pack(docs)
+
+    assert packed.duplicates == 1
+    assert [doc.page_content for doc in packed.documents] == [docs[0].page_content, docs[2].page_content]
+    assert packed.saved_tokens == len(docs[1].page_content) + 2
+    assert packer.get_stats()["saved_tokens"] == packed.saved_tokens
+
+
+def test_pack_trims_to_token_budget():
+    """예산을 넘는 청크는 잘라서 넣고, 남은 예산이 너무 적으면 더 넣지 않음"""
+    docs = [Document(page_content="가" * 80), Document(page_content="나" * 80), Document(page_content="다" * 80)]
+
+    packed = _make_packer(token_budget=150).pack(docs)
+
+    assert packed.tokens == 150
+    assert packed.truncated
+    assert packed.text == "가" * 80 + "\n\n" + "나" * 68
+    assert packed.original_tokens == 244
+
+
+def test_pack_keeps_order_when_under_budget():
+    """예산 안이면 검색 순서를 유지하고 원래 컨텍스트와 같은 형식으로 결합"""
+    docs = [Document(page_content="첫 번째 청크"), Document(page_content="두 번째 내용")]
+
+    packed = _make_packer().pack(docs)
+
+    assert packed.text == "첫 번째 청크\n\n두 번째 내용"
+    assert packed.saved_tokens == 0
+    assert not packed.truncated
@@ -0,0 +1,77 @@
+"""
+임베딩 백엔드 선택 및 인덱스 호환성 테스트
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from etl.pdf.embedding_backends import LocalSentenceTransformerEmbeddings, create_embeddings
+from etl.pdf.embedding_service import EmbeddingService
+
+
+class FakeSentenceTransformer:
+    """encode 호출마다 배치 크기를 기록하는 가짜 모델"""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size, normalize_embeddings, convert_to_numpy, show_progress_bar):
+        self.batches.append(len(texts))
+        return np.asarray([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+def _make_service(tmp_path):
+    service = EmbeddingService()
+    service.config.faiss_index_dir = tmp_path
+    service.config.embedding_model = FakeEmbeddings(size=8)
+    return service
+
+
+def test_local_embeddings_batch_on_thread_pool():
+    """문서는 한 번의 배치로, 비동기 질의는 전용 스레드 풀에서 임베딩"""
+    embeddings = LocalSentenceTransformerEmbeddings("fake-model", max_workers=1)
+    embeddings._model = FakeSentenceTransformer()
+
+    assert embeddings.embed_documents(["가", "나다"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert asyncio.run(embeddings.aembed_query("라마바")) == [3.0, 1.0]
+    assert embeddings._model.batches == [2, 1]
+
+
+def test_unknown_backend_is_rejected():
+    """지원하지 않는 백엔드는 설정 단계에서 오류"""
+    service = EmbeddingService()
+    service.config.embedding_backend = "cohere"
+
+    with pytest.raises(ValueError):
+        create_embeddings(service.config)
+
+
+def test_published_index_records_backend_and_rejects_mismatch(tmp_path):
+    """게시된 인덱스에 임베딩 정보를 기록하고, 다른 백엔드 설정으로는 로드하지 않음"""
+    service = _make_service(tmp_path)
+    faiss_db = FAISS.from_texts(["외국인등록"], embedding=service.config.embedding_model)
+    version = service.publish_partitions({"ko": faiss_db})
+
+    manifest = json.loads((tmp_path / f"{version}{service.EMBEDDING_MANIFEST_SUFFIX}").read_text())
+    assert manifest == {"backend": "openai", "model": "FakeEmbeddings", "dimension": 8}
+    assert service.load_partitions() is not None
+
+    service.config.embedding_backend = "local"
+    assert service.load_partitions() is None
+
+
+def test_legacy_index_is_treated_as_openai(tmp_path):
+    """기록이 없는 이전 인덱스는 OpenAI 백엔드로 간주"""
+    service = _make_service(tmp_path)
+    FAISS.from_texts(
+        ["외국인등록"], embedding=service.config.embedding_model, metadatas=[{"source": "guidebook_ko.pdf"}]
+    ).save_local(str(tmp_path), index_name=service.DEFAULT_INDEX_NAME)
+
+    assert set(service.load_partitions()) == {"ko"}
+
+    service.config.embedding_backend = "local"
+    assert service.load_partitions() is None
@@ -0,0 +1,57 @@
+"""
+질의 임베딩 캐시 테스트
+"""
+import asyncio
+import time
+
+from langchain_community.embeddings import FakeEmbeddings
+
+from etl.pdf.embedding_cache import CachedEmbeddings, LRUTTLCache
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    """embed_query 호출 횟수를 세는 가짜 임베딩"""
+    calls: int = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+def test_repeated_query_hits_cache():
+    """정규화 후 같은 질문은 임베딩 API를 다시 호출하지 않음"""
+    inner = CountingEmbeddings(size=8)
+    embeddings = CachedEmbeddings(inner, max_size=10, ttl=60)
+
+    first = embeddings.embed_query("How do I register my  alien card?")
+    second = embeddings.embed_query("  how do I register my alien card? ")
+
+    assert first == second
+    assert inner.calls == 1
+    assert embeddings.cache.get_stats()["hits"] == 1
+    assert embeddings.cache.get_stats()["misses"] == 1
+
+
+def test_async_query_shares_cache():
+    """비동기 질의도 같은 캐시를 사용"""
+    embeddings = CachedEmbeddings(CountingEmbeddings(size=8), max_size=10, ttl=60)
+    vector = embeddings.embed_query("외국인등록")
+
+    assert asyncio.run(embeddings.aembed_query("외국인등록")) == vector
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    """가득 차면 가장 오래된 항목 제거, 만료된 항목은 조회되지 않음"""
+    cache = LRUTTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get_stats()["evictions"] == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr("etl.pdf.embedding_cache.time.monotonic", lambda: now + 11)
+    assert cache.get("a") is None
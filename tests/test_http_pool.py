@@ -0,0 +1,65 @@
+"""
+OpenAI HTTP 연결 풀 테스트 (로컬 HTTP 서버 사용)
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.OpenAIService import OpenAIService
+from etl.pdf.http_pool import OpenAIHttpPool, openai_http_pool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_reuses_keepalive_connections(server_url):
+    """동기/비동기 요청 모두 keep-alive 연결을 재사용하고 재사용 비율을 기록"""
+    pool = OpenAIHttpPool(max_connections=4, max_keepalive_connections=2)
+
+    for _ in range(5):
+        assert pool.sync_client.get(server_url).status_code == 200
+
+    async def run():
+        for _ in range(5):
+            await pool.async_client.get(server_url)
+        await pool.aclose()
+
+    asyncio.run(run())
+
+    stats = pool.get_stats()
+    assert stats["requests"] == 10
+    assert stats["connections"] == 2
+    assert stats["reuse_ratio"] == pytest.approx(0.8)
+
+
+def test_services_share_process_wide_clients():
+    """서비스 인스턴스가 달라도 같은 OpenAI 클라이언트(연결 풀)를 사용"""
+    first, second = OpenAIService(), OpenAIService()
+
+    assert first.client.client is second.client.client
+    assert first.client.async_client._client is openai_http_pool.async_openai()
+    assert openai_http_pool.openai()._client is openai_http_pool.sync_client
@@ -0,0 +1,143 @@
+"""
+BM25 어휘 검색 및 하이브리드 검색 테스트
+"""
+import asyncio
+import time
+
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.services.HybridRetriever import HybridRetriever
+from app.services.OpenAIService import OpenAIService
+from app.services.VectorIndexManager import IndexSnapshot, VectorIndexManager, vector_index_manager
+from etl.pdf.embedding_cache import CachedEmbeddings
+from etl.pdf.embedding_service import EmbeddingService
+from etl.pdf.lexical_index import BM25Index, reciprocal_rank_fusion
+
+TEXTS = [
+    "결혼이민(F-6) 비자 연장은 출입국·외국인사무소에서 신청합니다.",
+    "고용허가제(E-9) 근로자는 고용센터에서 사업장 변경을 신청합니다.",
+    "천안시청 민원실에서 전입신고를 할 수 있습니다.",
+]
+
+
+def test_bm25_matches_visa_codes_and_korean_terms():
+    """비자 코드와 한국어 용어를 형태소 분석 없이 검색"""
+    index = BM25Index(TEXTS)
+
+    assert index.search("F-6 비자", k=3)[0] == 0
+    assert index.search("E-9 사업장 변경", k=3)[0] == 1
+    assert index.search("전입신고", k=3) == [2]
+    assert index.search("zzz", k=3) == []
+
+
+def test_saved_bm25_index_opens_with_mmap_and_matches(tmp_path):
+    """저장한 인덱스는 다시 색인하지 않고 열어 메모리 인덱스와 같은 결과 반환"""
+    index = BM25Index(TEXTS)
+    index.save(tmp_path / "index_ko")
+
+    opened = BM25Index.open(tmp_path / "index_ko")
+
+    for query in ("F-6 비자", "E-9 사업장 변경", "전입신고", "천안", "zzz", "a"):
+        assert opened.search(query, k=3) == index.search(query, k=3), query
+
+
+def test_reload_opens_published_bm25_without_rebuilding(tmp_path, monkeypatch):
+    """게시 시 저장된 BM25 인덱스를 열고 인덱스 교체 시 청크로 다시 색인하지 않음"""
+    service = EmbeddingService()
+    service.config.faiss_index_dir = tmp_path
+    service.config.embedding_model = FakeEmbeddings(size=8)
+    service.publish_partitions({"ko": FAISS.from_texts(TEXTS, embedding=service.config.embedding_model)})
+
+    def rebuild(*args, **kwargs):
+        raise AssertionError("BM25 인덱스를 다시 만들면 안 됩니다.")
+
+    monkeypatch.setattr(BM25Index, "from_faiss", rebuild)
+    monkeypatch.setattr(BM25Index, "__init__", rebuild)
+
+    lexical_index = VectorIndexManager(embedding_service=service, reload_interval=1).get().get_lexical_index("ko")
+
+    assert lexical_index.search("전입신고", k=3) == [2]
+
+
+def test_reciprocal_rank_fusion_prefers_documents_ranked_by_both():
+    """두 검색기 모두 상위에 둔 문서가 먼저 옴"""
+    assert reciprocal_rank_fusion([[1, 2, 0], [2, 0, 1]])[0] == 2
+
+
+def test_retriever_without_embedding_uses_lexical_only():
+    """임베딩이 없으면 BM25 결과만으로 검색"""
+    vector_db = FAISS.from_texts(TEXTS, embedding=FakeEmbeddings(size=8))
+    retriever = HybridRetriever(vector_db=vector_db, lexical_index=BM25Index.from_faiss(vector_db), k=1)
+
+    assert retriever.search("F-6 비자 연장", embedding=None)[0].page_content == TEXTS[0]
+
+
+def test_slow_embedding_falls_back_to_lexical_search(monkeypatch):
+    """임베딩 API가 제한 시간을 넘기면 BM25 검색만으로 진행"""
+    class SlowEmbeddings(FakeEmbeddings):
+        async def aembed_query(self, text):
+            await asyncio.sleep(1)
+            return self.embed_query(text)
+
+    vector_db = FAISS.from_texts(TEXTS, embedding=SlowEmbeddings(size=8))
+    snapshot = IndexSnapshot(
+        partitions={"ko": vector_db},
+        version="test",
+        lexical_indexes={"ko": BM25Index.from_faiss(vector_db)}
+    )
+    service = OpenAIService()
+    monkeypatch.setattr(service.config, "embedding_timeout", 0.05)
+    retriever = service._get_retriever(snapshot, "ko")
+
+    assert asyncio.run(service._aembed_query(snapshot, retriever, "E-9")) is None
+
+
+def _batch_service(monkeypatch, embeddings: FakeEmbeddings):
+    """가짜 임베딩/LLM으로 일괄 답변을 생성하고 질문별 검색 문서를 기록하는 서비스"""
+    vector_db = FAISS.from_texts(TEXTS, embedding=CachedEmbeddings(embeddings))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(
+        partitions={"ko": vector_db},
+        version="test",
+        lexical_indexes={"ko": BM25Index.from_faiss(vector_db)}
+    ))
+    service = OpenAIService()
+    service.client = FakeListChatModel(responses=["답변"])
+    searched = []
+    monkeypatch.setattr(service, "_pack_context", lambda docs: searched.append(docs) or "")
+    return service, searched
+
+
+def test_batch_slow_embedding_falls_back_to_lexical_search(monkeypatch):
+    """일괄 질의도 임베딩 제한 시간을 넘기면 BM25 검색만으로 진행"""
+    class SlowEmbeddings(FakeEmbeddings):
+        async def aembed_documents(self, texts):
+            await asyncio.sleep(1)
+            return self.embed_documents(texts)
+
+    service, searched = _batch_service(monkeypatch, SlowEmbeddings(size=8))
+    monkeypatch.setattr(service.config, "embedding_timeout", 0.05)
+    monkeypatch.setattr(service.config, "retrieval_mode", "hybrid")
+
+    start = time.perf_counter()
+    results = asyncio.run(service.abatch_generate_rag_answers(["F-6 비자 연장 일괄", "E-9 사업장 변경 일괄"], ["ko", "ko"]))
+
+    assert time.perf_counter() - start < 0.5
+    assert results == ["답변", "답변"]
+    assert sorted(docs[0].page_content for docs in searched) == sorted(TEXTS[:2])
+
+
+def test_batch_lexical_mode_skips_embedding(monkeypatch):
+    """lexical 모드에서는 일괄 질의도 임베딩 API를 호출하지 않음"""
+    class UnusedEmbeddings(FakeEmbeddings):
+        async def aembed_documents(self, texts):
+            raise AssertionError("lexical 모드에서 임베딩 호출")
+
+    service, searched = _batch_service(monkeypatch, UnusedEmbeddings(size=8))
+    monkeypatch.setattr(service.config, "retrieval_mode", "lexical")
+
+    results = asyncio.run(service.abatch_generate_rag_answers(["E-9 사업장 변경"], ["ko"]))
+
+    assert results == ["답변"]
+    assert searched[0][0].page_content == TEXTS[1]
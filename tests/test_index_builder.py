@@ -0,0 +1,45 @@
+"""
+FAISS 인덱스 유형 선택 및 측정 테스트
+"""
+import numpy as np
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from etl.pdf.config import ETLConfig
+from etl.pdf.index_builder import build_index, convert_faiss_db, measure_index
+
+
+@pytest.mark.parametrize("index_type", ["hnsw", "ivf"])
+def test_ann_index_recall_against_flat(index_type):
+    """ANN 인덱스의 flat 기준 recall@k 측정"""
+    vectors = np.random.default_rng(0).random((500, 16), dtype=np.float32)
+    flat = build_index(vectors, "flat")
+    index = build_index(vectors, index_type, hnsw_ef_search=128, ivf_nlist=8, ivf_nprobe=8)
+
+    report = measure_index(flat, index, vectors[:50], k=5)
+
+    assert index.ntotal == 500
+    assert report["recall_at_k"] >= 0.9
+    assert report["ms_avg"] >= 0
+
+
+def test_unknown_index_type_is_rejected():
+    """지원하지 않는 인덱스 유형은 오류"""
+    with pytest.raises(ValueError):
+        build_index(np.zeros((2, 4), dtype=np.float32), "pq")
+
+
+def test_convert_faiss_db_keeps_docstore_mapping():
+    """인덱스 유형을 바꿔도 FAISS 행과 청크 매핑은 유지"""
+    texts = [f"청크 {i}" for i in range(60)]
+    faiss_db = FAISS.from_texts(texts, embedding=FakeEmbeddings(size=8))
+    config = ETLConfig()
+    config.index_type = "hnsw"
+
+    report = convert_faiss_db(faiss_db, config)
+
+    assert report["index_type"] == "hnsw"
+    assert "HNSW" in type(faiss_db.index).__name__
+    vector = faiss_db.index.reconstruct(7)
+    assert faiss_db.similarity_search_by_vector(vector.tolist(), k=1)[0].page_content == "청크 7"
@@ -0,0 +1,134 @@
+"""
+Prometheus 지표 테스트 (LLM/임베딩은 가짜 모델 사용)
+"""
+import pytest
+from fastapi.testclient import TestClient
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.api.endpoints import chatbot
+from app.config.OpenAIConfig import openai_config
+from app.main import app
+from app.services.Metrics import CONTENT_TYPE, Counter, Histogram, MetricsRegistry
+from app.services.SemanticAnswerCache import semantic_answer_cache
+from app.services.VectorIndexManager import IndexSnapshot, vector_index_manager
+from etl.pdf.embedding_cache import CachedEmbeddings
+
+ASK = "/api/chatbot/ask"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=CachedEmbeddings(FakeEmbeddings(size=8)))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(partitions={"ko": vector_db}, version="test"))
+    monkeypatch.setattr(chatbot.openAiService, "client", FakeListChatModel(responses=["출입국사무소를 방문하세요."]))
+    semantic_answer_cache.clear()
+    return TestClient(app)
+
+
+def _scrape(client) -> dict:
+    """/metrics 응답을 {샘플 이름과 라벨 문자열: 값}으로 변환"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def _value(samples: dict, name: str, **labels) -> float:
+    """라벨을 모두 포함하는 샘플 값의 합"""
+    wanted = [f'{key}="{value}"' for key, value in labels.items()]
+    return sum(
+        value for sample, value in samples.items()
+        if sample.split("{", 1)[0] == name and all(label in sample for label in wanted)
+    )
+
+
+def test_registry_renders_text_exposition_format():
+    """히스토그램 구간은 누적 값, 카운터는 _total 접미사"""
+    registry = MetricsRegistry()
+    latency = registry.register(Histogram("latency_seconds", "지연", ("stage",), buckets=(0.1, 1.0)))
+    errors = registry.register(Counter("errors", "오류", ("type",)))
+    latency.observe(0.05, stage="llm")
+    latency.observe(0.5, stage="llm")
+    latency.observe(5.0, stage="llm")
+    errors.inc(type='Bad"Error')
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{stage="llm",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="llm",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="llm",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="llm"} 3' in lines
+    assert 'latency_seconds_sum{stage="llm"} 5.55' in lines
+    assert 'errors_total{type="Bad\\"Error"} 1' in lines
+
+
+def test_ask_records_stages_tokens_and_cache_by_endpoint_and_language(client, monkeypatch):
+    """질의 처리 단계별 시간, 토큰 수, 답변 캐시 적중이 엔드포인트/언어 라벨로 기록"""
+    monkeypatch.setattr(openai_config, "answer_cache_enabled", True)
+    before = _scrape(client)
+
+    for _ in range(2):
+        response = client.post(ASK, json={"query": "외국인등록은?", "lang": "ko"})
+        assert response.status_code == 200
+
+    after = _scrape(client)
+
+    def delta(name, **labels):
+        return _value(after, name, **labels) - _value(before, name, **labels)
+
+    labels = {"endpoint": ASK, "language": "ko"}
+    for stage in ("embedding", "search", "prompt_build", "llm", "parse"):
+        # 두 번째 요청은 답변 캐시에서 응답하므로 검색 이후 단계는 한 번만 실행
+        expected = 2 if stage == "embedding" else 1
+        assert delta("rag_stage_duration_seconds_count", stage=stage, **labels) == expected, stage
+
+    assert delta("llm_tokens_total", kind="prompt", **labels) > 0
+    assert delta("llm_tokens_total", kind="completion", **labels) == len("출입국사무소를 방문하세요.")
+    assert delta("cache_lookups_total", cache="answer", result="miss", **labels) == 1
+    assert delta("cache_lookups_total", cache="answer", result="hit", **labels) == 1
+    assert delta("http_request_duration_seconds_count", endpoint=ASK, method="POST", status="200") == 2
+    assert _value(after, "http_requests_in_flight", endpoint=ASK) == 0
+    assert _value(after, "cache_hit_ratio", cache="answer") > 0
+
+
+def test_errors_are_counted_by_type(client, monkeypatch):
+    """LLM 호출 실패는 예외 유형별 오류 수로 기록"""
+    class FailingChatModel(FakeListChatModel):
+        async def ainvoke(self, input, *args, **kwargs):
+            raise TimeoutError("upstream timeout")
+
+    monkeypatch.setattr(chatbot.openAiService, "client", FailingChatModel(responses=["답변"]))
+    before = _scrape(client)
+
+    response = client.post(ASK, json={"query": "건강보험은?", "lang": "en"})
+    assert response.status_code == 500
+
+    after = _scrape(client)
+    labels = {"type": "TimeoutError", "endpoint": ASK, "language": "en"}
+    assert _value(after, "errors_total", **labels) - _value(before, "errors_total", **labels) == 1
+
+
+def test_component_stats_include_pipeline_context_and_reranker(client):
+    """파이프라인 재사용, 컨텍스트 토큰 절약, 재순위 통계를 수집 시점에 노출"""
+    for _ in range(2):
+        assert client.post(ASK, json={"query": "건강보험 가입은?", "lang": "ko"}).status_code == 200
+
+    samples = _scrape(client)
+
+    assert samples["rag_pipeline_reuses_total"] > 0
+    assert samples["rag_pipeline_saved_seconds_total"] >= 0
+    assert samples["rag_pipeline_build_seconds"] >= 0
+    assert _value(samples, "context_tokens_total", kind="original") > 0
+    assert _value(samples, "context_tokens_total", kind="saved") >= 0
+    assert "context_duplicate_chunks_total" in samples
+    assert 'reranker_requests_total{result="skipped"}' in samples
+    assert 'reranker_latency_seconds{kind="avg"}' in samples
@@ -0,0 +1,177 @@
+"""
+OpenAI 호출 제어기 테스트 (429/503을 반환하는 로컬 가짜 서버 사용)
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import openai
+import pytest
+
+from etl.pdf.http_pool import OpenAIHttpPool
+from etl.pdf.openai_governor import AsyncGovernedTransport, OpenAIGovernor, RateLimitWaitTimeout, TokenBucket
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}]
+}
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """statuses에 담긴 상태 코드를 차례로 반환하고 다 쓰면 정상 응답"""
+    protocol_version = "HTTP/1.1"
+    statuses = []
+    hits = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).hits += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = json.dumps(COMPLETION if status == 200 else {"error": {"message": "slow down"}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0.01")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openai():
+    _FakeOpenAIHandler.statuses = []
+    _FakeOpenAIHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield _FakeOpenAIHandler, f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def _governor(**kwargs):
+    return OpenAIGovernor(base_delay=0.01, token_counter=lambda model, text: len(text), **kwargs)
+
+
+def _chat(client):
+    return client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "안녕"}])
+
+
+def test_retries_429_until_success(fake_openai):
+    """429는 Retry-After만큼 기다렸다가 재시도하여 호출자는 정상 응답을 받음"""
+    handler, base_url = fake_openai
+    handler.statuses = [429, 429]
+    governor = _governor(max_retries=3)
+    pool = OpenAIHttpPool(governor=governor)
+    client = openai.OpenAI(api_key="sk-test", base_url=base_url, http_client=pool.sync_client, max_retries=0)
+
+    assert _chat(client).choices[0].message.content == "ok"
+    assert handler.hits == 3
+    stats = governor.get_stats()
+    assert (stats["rate_limited"], stats["retries"], stats["breaker_state"]) == (2, 2, "closed")
+
+
+def test_async_client_retries_429(fake_openai):
+    handler, base_url = fake_openai
+    handler.statuses = [429]
+    pool = OpenAIHttpPool(governor=_governor())
+
+    async def run():
+        client = openai.AsyncOpenAI(api_key="sk-test", base_url=base_url, http_client=pool.async_client, max_retries=0)
+        response = await client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+        await pool.aclose()
+        return response
+
+    assert asyncio.run(run()).choices[0].message.content == "ok"
+    assert handler.hits == 2
+
+
+def test_circuit_opens_on_repeated_5xx_and_recovers(fake_openai):
+    """5xx가 연속되면 서버에 요청하지 않고 즉시 실패하고, 복구 시간 후 시험 요청으로 닫힘"""
+    handler, base_url = fake_openai
+    handler.statuses = [503, 503]
+    governor = _governor(max_retries=1, failure_threshold=2, reset_timeout=0.2)
+    pool = OpenAIHttpPool(governor=governor)
+    client = openai.OpenAI(api_key="sk-test", base_url=base_url, http_client=pool.sync_client, max_retries=0)
+
+    with pytest.raises(openai.InternalServerError):
+        _chat(client)
+    with pytest.raises(openai.APIConnectionError):
+        _chat(client)
+    assert handler.hits == 2
+    assert governor.get_stats()["breaker_state"] == "open"
+
+    time.sleep(0.25)
+    assert _chat(client).choices[0].message.content == "ok"
+    assert governor.get_stats()["breaker_state"] == "closed"
+
+
+def test_cancelled_half_open_trial_releases_slot_and_reservation():
+    """시험 요청이 취소되어도 half_open에 갇히지 않고 다음 요청으로 복구되며 예약은 반환됨"""
+    class ScriptedTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self.actions = ["fail", "hang"]
+
+        async def handle_async_request(self, request):
+            action = self.actions.pop(0) if self.actions else "ok"
+            if action == "fail":
+                raise httpx.ConnectError("connection refused")
+            if action == "hang":
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=COMPLETION)
+
+    governor = _governor(max_retries=0, failure_threshold=1, reset_timeout=0.05, rpm=2)
+    client = httpx.AsyncClient(transport=AsyncGovernedTransport(ScriptedTransport(), governor))
+    url = "https://api.openai.com/v1/chat/completions"
+    payload = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}]}
+
+    async def run():
+        with pytest.raises(httpx.ConnectError):
+            await client.post(url, json=payload)
+        assert governor.breaker.state == "open"
+
+        await asyncio.sleep(0.06)
+        # 시험 요청이 시간 초과로 취소됨
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.post(url, json=payload), timeout=0.05)
+        assert governor.breaker.state == "half_open"
+
+        response = await client.post(url, json=payload)
+        await client.aclose()
+        return response
+
+    assert asyncio.run(run()).status_code == 200
+    assert governor.breaker.state == "closed"
+    # 응답을 받지 못한 두 요청의 예약은 반환되어 분당 2회 한도 안에서 대기 없이 처리됨
+    assert governor.get_stats()["throttled"] == 0
+
+
+def test_token_budget_queues_then_rejects_over_max_wait():
+    """토큰 한도를 넘는 요청은 대기 시간을 받고, 대기가 상한을 넘으면 보내지 않음"""
+    governor = _governor(tpm=600, max_wait=40)
+    request = httpx.Request(
+        "POST", "https://api.openai.com/v1/chat/completions",
+        json={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "x" * 100}], "max_tokens": 200}
+    )
+
+    assert governor.admit(request).tokens == 300
+    assert governor.admit(request).wait == 0
+    # 600토큰 한도 소진 후에는 10토큰/초 충전 속도에 맞춰 대기
+    assert governor.admit(request).wait == pytest.approx(30, abs=0.1)
+    with pytest.raises(RateLimitWaitTimeout):
+        governor.admit(request)
+
+
+def test_token_bucket_reserve_wait():
+    bucket = TokenBucket(per_minute=60, capacity=1)
+
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
@@ -0,0 +1,64 @@
+"""
+OpenAIService 비동기 경로 테스트 (LLM/임베딩은 가짜 모델 사용)
+"""
+import asyncio
+
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.config.OpenAIConfig import openai_config
+from app.services.OpenAIService import OpenAIService
+from app.services.VectorIndexManager import IndexSnapshot, vector_index_manager
+
+
+def _make_service(responses):
+    service = OpenAIService()
+    service.client = FakeListChatModel(responses=responses)
+    return service
+
+
+def test_atranslate_multiple_fields_parses_fields():
+    """비동기 번역 결과를 필드별로 파싱"""
+    service = _make_service(["Title: Housing support\nEligibility: Residents\nContent: Line 1\nLine 2"])
+
+    result = asyncio.run(service.atranslate_multiple_fields("주거 지원", "주민", "본문", "en"))
+
+    assert result == {"title": "Housing support", "eligibility": "Residents", "text": "Line 1\nLine 2", "cached": False}
+
+
+def test_agenerate_rag_answer_runs_concurrently(monkeypatch):
+    """여러 RAG 요청을 하나의 이벤트 루프에서 동시에 처리"""
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=FakeEmbeddings(size=8))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(partitions={"ko": vector_db}, version="test"))
+    service = _make_service(["답변"])
+
+    async def run():
+        # 같은 질문은 요청 병합되므로 서로 다른 질문으로 동시 처리 확인
+        return await asyncio.gather(*[
+            service.agenerate_rag_answer(f"외국인등록 {i}번 질문", "ko") for i in range(5)
+        ])
+
+    assert asyncio.run(run()) == ["답변"] * 5
+
+
+def test_stream_releases_llm_slot_before_client_reads_all_tokens(monkeypatch):
+    """스트리밍 응답을 클라이언트가 천천히 읽어도 업스트림이 끝나면 LLM 동시 호출 슬롯을 반환"""
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=FakeEmbeddings(size=8))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(partitions={"ko": vector_db}, version="test"))
+    monkeypatch.setattr(OpenAIService, "_llm_semaphore", None)
+    monkeypatch.setattr(openai_config, "max_concurrency", 1)
+    service = _make_service(["출입국사무소를 방문하세요."])
+
+    async def run():
+        stream = service.astream_rag_answer("외국인등록 스트리밍 질문", "ko")
+        first = await stream.__anext__()
+        # 첫 토큰만 읽은 상태에서 다른 요청이 유일한 슬롯을 얻어 완료되어야 함
+        answer = await asyncio.wait_for(service.agenerate_rag_answer("건강보험 질문", "ko"), timeout=2)
+        rest = [token async for token in stream]
+        return first + "".join(rest), answer
+
+    streamed, answer = asyncio.run(run())
+
+    assert streamed == "출입국사무소를 방문하세요."
+    assert answer == "출입국사무소를 방문하세요."
@@ -0,0 +1,48 @@
+"""
+공고 사전 번역 단계 테스트 (DB 없이 계획/실행 로직만 확인, 번역은 가짜 함수 사용)
+"""
+import asyncio
+
+from app.services.OpenAIService import OpenAIService
+from etl.crawling.pretranslate import plan_translations, source_hash, translate_plan
+
+POSTINGS = [
+    {"posting_id": 1, "title": "주거 지원", "eligibility": "주민", "content": "■ 개요\n주거비 지원"},
+    {"posting_id": 2, "title": "의료 지원", "eligibility": "외국인", "content": "■ 개요\n의료비 지원"},
+]
+
+
+def test_plan_skips_up_to_date_and_groups_pending_languages():
+    """해시가 같은 번역은 건너뛰고 원문이 바뀐 번역만 다시 계획"""
+    existing = {(1, "en"): source_hash(POSTINGS[0], "en"), (1, "ja"): source_hash(POSTINGS[0], "ja")}
+    changed = {**POSTINGS[1], "content": "■ 개요\n의료비 전액 지원"}
+    existing.update({(2, language): source_hash(POSTINGS[1], language) for language in ("en", "ja")})
+
+    plan = plan_translations([POSTINGS[0], changed], existing, ["en", "ja"])
+
+    assert list(plan) == [("en", "ja")]
+    assert [posting["posting_id"] for posting in plan[("en", "ja")]] == [2]
+    assert plan_translations(POSTINGS[:1], existing, ["en", "ja"]) == {}
+    assert list(plan_translations(POSTINGS[:1], existing, ["en", "ja", "vi"])) == [("vi",)]
+
+
+def test_translate_plan_stores_in_batches_and_skips_failures(monkeypatch):
+    """번역 결과를 배치로 저장하고 실패한 항목은 저장하지 않음"""
+    async def translate(self, title, eligibility, text, target_language):
+        if title == "의료 지원" and target_language == "ja":
+            raise RuntimeError("rate limited")
+        return {"title": f"{title}-{target_language}", "eligibility": eligibility, "text": text, "cached": False}
+
+    monkeypatch.setattr(OpenAIService, "atranslate_multiple_fields", translate)
+    service = OpenAIService()
+    monkeypatch.setattr(service.config, "translation_max_retries", 0)
+    batches = []
+
+    plan = plan_translations(POSTINGS, {}, ["en", "ja"])
+    stats = asyncio.run(translate_plan(service, plan, lambda rows: batches.append(list(rows)), batch_size=2))
+
+    assert stats == {"translated": 3, "failed": 1}
+    rows = [row for batch in batches for row in batch]
+    assert sorted((row[0], row[1]) for row in rows) == [(1, "en"), (1, "ja"), (2, "en")]
+    assert all(row[5] == source_hash(POSTINGS[row[0] - 1], row[1]) for row in rows)
+    assert len(batches[0]) == 2
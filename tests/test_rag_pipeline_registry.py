@@ -0,0 +1,54 @@
+"""
+언어별 RAG 파이프라인 레지스트리 테스트
+"""
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.services.OpenAIService import OpenAIService
+from app.services.RagPipelineRegistry import SUPPORTED_LANGUAGES
+from app.services.VectorIndexManager import IndexSnapshot
+
+
+def _make_snapshot():
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=FakeEmbeddings(size=8))
+    return IndexSnapshot(partitions={"ko": vector_db}, version="test")
+
+
+def test_pipelines_are_built_once_and_reused():
+    """지원 언어 파이프라인을 한 번 구성한 뒤 같은 객체를 재사용하고 절약 시간을 집계"""
+    service = OpenAIService()
+    service.pipelines.build()
+
+    first = service.pipelines.get("ja")
+    second = service.pipelines.get("ja")
+
+    assert first is second
+    assert "天安市" in first.prompt.messages[0].prompt.template
+    assert service.pipelines.get("fr").language == "ko"
+
+    stats = service.pipelines.get_stats()
+    assert stats["languages"] == len(SUPPORTED_LANGUAGES)
+    assert stats["reuses"] == 3
+    assert stats["saved_ms"] > 0
+
+
+def test_retrievers_are_rebuilt_when_snapshot_changes():
+    """검색기는 스냅샷별로 재사용하고 인덱스가 교체되면 다시 구성"""
+    service = OpenAIService()
+    snapshot = _make_snapshot()
+
+    retriever = service.pipelines.get_retriever(snapshot, "en")
+
+    assert service.pipelines.get_retriever(snapshot, "ko") is retriever
+    assert service.pipelines.get_retriever(_make_snapshot(), "ko") is not retriever
+
+
+def test_client_change_rebuilds_chains():
+    """채팅 모델을 교체하면 미리 구성된 체인도 새 모델 사용"""
+    service = OpenAIService()
+    service.client = FakeListChatModel(responses=["답변"])
+
+    result = service.pipelines.get("ko").chain.invoke({"question": "질문", "context": "내용"})
+
+    assert result.content == "답변"
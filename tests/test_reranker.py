@@ -0,0 +1,71 @@
+"""
+크로스 인코더 재순위기 테스트 (모델은 가짜 점수 함수 사용)
+"""
+from langchain_core.documents import Document
+
+from app.services.Reranker import CrossEncoderReranker
+
+
+class KeywordCrossEncoder:
+    """질의 단어가 청크에 많이 나올수록 높은 점수"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=None):
+        self.calls.append(len(pairs))
+        return [sum(word in text for word in query.split()) for query, text in pairs]
+
+
+def _make_reranker(model, **kwargs):
+    options = dict(enabled=True, model_name="fake", top_n=2, max_latency_ms=1000, max_inflight=4)
+    options.update(kwargs)
+    return CrossEncoderReranker(model=model, **options)
+
+
+def _docs(*texts):
+    return [Document(page_content=text) for text in texts]
+
+
+def test_rerank_batch_scores_all_queries_in_one_pass():
+    """여러 질의의 후보를 한 번에 점수화하고 질의별 상위 top_n개 반환"""
+    model = KeywordCrossEncoder()
+    reranker = _make_reranker(model)
+
+    results = reranker.rerank_batch(
+        ["건강보험 가입", "외국인등록"],
+        [_docs("비자 연장", "건강보험 가입 방법", "건강보험 안내"), _docs("운전면허", "외국인등록 신청")]
+    )
+
+    assert model.calls == [5]
+    assert [doc.page_content for doc in results[0]] == ["건강보험 가입 방법", "건강보험 안내"]
+    assert [doc.page_content for doc in results[1]] == ["외국인등록 신청", "운전면허"]
+
+
+def test_rerank_skipped_when_disabled_or_overloaded():
+    """비활성화 또는 평균 지연이 상한을 넘으면 검색 순위 상위 top_n개를 그대로 사용"""
+    docs = _docs("비자 연장", "건강보험 가입 방법", "건강보험 안내")
+
+    assert _make_reranker(KeywordCrossEncoder(), enabled=False).rerank("건강보험", docs) == docs[:2]
+
+    model = KeywordCrossEncoder()
+    reranker = _make_reranker(model, max_latency_ms=0)
+    reranker._latency_ewma_ms = 50
+
+    assert reranker.rerank("건강보험", docs) == docs[:2]
+    assert model.calls == []
+    assert reranker.get_stats()["skipped"] == 1
+
+
+def test_rerank_falls_back_on_model_error():
+    """추론 오류 시 검색 순위를 사용하고 동시 실행 수를 반환"""
+    class BrokenModel:
+        def predict(self, pairs, **kwargs):
+            raise RuntimeError("onnx runtime error")
+
+    docs = _docs("a", "b", "c")
+    reranker = _make_reranker(BrokenModel(), max_inflight=1)
+
+    assert reranker.rerank("q", docs) == docs[:2]
+    assert reranker.rerank("q", docs) == docs[:2]
+    assert reranker._inflight == 0
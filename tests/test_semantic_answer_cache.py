@@ -0,0 +1,63 @@
+"""
+의미 기반 답변 캐시 테스트
+"""
+import numpy as np
+
+from app.config.OpenAIConfig import OpenAIConfig
+from app.services.SemanticAnswerCache import SemanticAnswerCache
+
+
+def test_similar_question_hits_same_language_only():
+    """임계값 이상으로 유사한 질문은 같은 언어에서만 적중"""
+    cache = SemanticAnswerCache(threshold=0.9, max_size=4)
+    cache.store("en", "v1", [1.0, 0.0, 0.0], "answer")
+
+    assert cache.lookup("en", "v1", [0.99, 0.05, 0.0]) == "answer"
+    assert cache.lookup("ko", "v1", [0.99, 0.05, 0.0]) is None
+    assert cache.lookup("en", "v1", [0.0, 1.0, 0.0]) is None
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_index_rebuild_invalidates_entries():
+    """인덱스 버전이 바뀌면 이전 답변은 반환하지 않음"""
+    cache = SemanticAnswerCache(threshold=0.9, max_size=4)
+    cache.store("en", "v1", [1.0, 0.0], "old answer")
+
+    assert cache.lookup("en", "v2", [1.0, 0.0]) is None
+
+    cache.store("en", "v2", [1.0, 0.0], "new answer")
+    assert cache.lookup("en", "v2", [1.0, 0.0]) == "new answer"
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_bounded_eviction_replaces_least_recently_used():
+    """가득 차면 가장 오래 사용되지 않은 답변을 교체"""
+    cache = SemanticAnswerCache(threshold=0.9, max_size=2)
+    cache.store("en", "v1", [1.0, 0.0, 0.0], "a")
+    cache.store("en", "v1", [0.0, 1.0, 0.0], "b")
+    cache.lookup("en", "v1", [1.0, 0.0, 0.0])
+    cache.store("en", "v1", [0.0, 0.0, 1.0], "c")
+
+    assert cache.lookup("en", "v1", [1.0, 0.0, 0.0]) == "a"
+    assert cache.lookup("en", "v1", [0.0, 1.0, 0.0]) is None
+    assert cache.get_stats()["size"] == 2
+
+
+def test_near_duplicate_questions_about_different_visas_do_not_share_answers():
+    """임베딩이 임계값 이상으로 비슷해도 비자 코드가 다른 질문은 적중하지 않음"""
+    cache = SemanticAnswerCache(threshold=0.95, max_size=4)
+    f6 = np.array([1.0, 0.20, 0.0])
+    e9 = np.array([1.0, 0.25, 0.0])
+    assert f6 @ e9 / (np.linalg.norm(f6) * np.linalg.norm(e9)) >= 0.95
+
+    cache.store("ko", "v1", f6, "F-6 연장은 출입국사무소에서 신청합니다.", question="F-6 비자 연장은 어디서 하나요?")
+
+    assert cache.lookup("ko", "v1", e9, question="E-9 비자 연장은 어디서 하나요?") is None
+    assert cache.lookup("ko", "v1", e9, question="f-6비자 연장 신청 장소는?") == "F-6 연장은 출입국사무소에서 신청합니다."
+
+
+def test_answer_cache_is_opt_in(monkeypatch):
+    """ANSWER_CACHE_ENABLED를 지정하지 않으면 답변 캐시를 사용하지 않음"""
+    monkeypatch.delenv("ANSWER_CACHE_ENABLED", raising=False)
+
+    assert OpenAIConfig().answer_cache_enabled is False
@@ -0,0 +1,73 @@
+"""
+요청별 단계 처리 시간(Server-Timing) 테스트 (LLM/임베딩은 가짜 모델 사용)
+"""
+import pytest
+from fastapi.testclient import TestClient
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.api.endpoints import chatbot, translation
+from app.main import app
+from app.services.SemanticAnswerCache import semantic_answer_cache
+from app.services.VectorIndexManager import IndexSnapshot, vector_index_manager
+from etl.pdf.embedding_cache import CachedEmbeddings
+
+TRANSLATION_RESPONSE = "제목: Title\n자격요건: Residents\n본문: Body"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=CachedEmbeddings(FakeEmbeddings(size=8)))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(partitions={"ko": vector_db}, version="test"))
+    monkeypatch.setattr(chatbot.openAiService, "client", FakeListChatModel(responses=["출입국사무소를 방문하세요."]))
+    monkeypatch.setattr(translation.openAiService, "client", FakeListChatModel(responses=[TRANSLATION_RESPONSE]))
+    semantic_answer_cache.clear()
+    return TestClient(app)
+
+
+def _server_timing(header: str) -> dict:
+    entries = {}
+    for entry in header.split(", "):
+        name, duration = entry.split(";dur=")
+        entries[name] = float(duration)
+    return entries
+
+
+def test_ask_returns_stage_timings_when_requested(client):
+    """X-Debug-Timing 헤더가 있으면 Server-Timing 헤더와 timings 필드로 단계별 시간 반환"""
+    response = client.post(
+        "/api/chatbot/ask", json={"query": "외국인등록은?", "lang": "ko"}, headers={"X-Debug-Timing": "1"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["answer"] == "출입국사무소를 방문하세요."
+
+    header = _server_timing(response.headers["Server-Timing"])
+    for stage in ("index", "embedding", "search", "prompt_build", "llm_ttft", "llm", "parse", "total"):
+        assert stage in header, stage
+    assert header["llm_ttft"] <= header["llm"] <= header["total"]
+    assert set(body["timings"]) == set(header)
+
+
+def test_translate_returns_stage_timings_with_query_flag(client):
+    """?timings=1로도 요청할 수 있고 번역은 프롬프트 구성/LLM/파싱 단계를 반환"""
+    response = client.post(
+        "/api/translation/translate?timings=1",
+        json={"title": "제목", "eligibility": "주민", "text": "본문", "target_language": "en"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Title"
+    header = _server_timing(response.headers["Server-Timing"])
+    assert {"prompt_build", "llm_ttft", "llm", "parse", "total"} <= set(header)
+
+
+def test_no_timings_without_flag(client):
+    """요청하지 않으면 Server-Timing 헤더와 timings 필드 없음"""
+    response = client.post("/api/chatbot/ask", json={"query": "외국인등록은?", "lang": "ko"})
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+    assert "timings" not in response.json()
@@ -0,0 +1,117 @@
+"""
+동일 요청 병합 테스트
+"""
+import asyncio
+
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.services.Metrics import service_metrics
+from app.services.OpenAIService import OpenAIService
+from app.services.SemanticAnswerCache import semantic_answer_cache
+from app.services.SingleFlight import SingleFlight
+from app.services.VectorIndexManager import IndexSnapshot, vector_index_manager
+
+
+class SlowChatModel(FakeListChatModel):
+    """호출 횟수를 세고 응답을 지연하는 가짜 모델"""
+    calls: int = 0
+
+    async def ainvoke(self, input, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return await super().ainvoke(input, *args, **kwargs)
+
+    async def astream(self, input, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        async for chunk in super().astream(input, *args, **kwargs):
+            yield chunk
+
+
+def test_identical_translations_share_one_llm_call():
+    """동시에 들어온 같은 번역 요청은 LLM을 한 번만 호출하고 결과를 공유"""
+    service = OpenAIService()
+    service.client = SlowChatModel(responses=["Title: Support\nEligibility: All\nContent: Body"])
+
+    async def run():
+        same = [service.atranslate_multiple_fields("지원", "전체", "본문", "en") for _ in range(5)]
+        other = service.atranslate_multiple_fields("지원", "전체", "본문", "ja")
+        return await asyncio.gather(*same, other)
+
+    results = asyncio.run(run())
+
+    assert service.client.calls == 2
+    assert all(result == results[0] for result in results[:5])
+    assert results[0] is not results[1]
+
+
+def test_failure_and_cancellation_are_shared_safely():
+    """실패는 모든 호출자에게 전달되고, 한 호출자가 취소되어도 나머지는 결과를 받음"""
+    flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append("fail")
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream error")
+
+    async def succeeding():
+        calls.append("ok")
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        failures = await asyncio.gather(*[flight.do("rag", "a", failing) for _ in range(3)], return_exceptions=True)
+
+        leader = asyncio.ensure_future(flight.do("rag", "b", succeeding))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("rag", "b", succeeding))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return failures, await follower
+
+    failures, result = asyncio.run(run())
+
+    assert all(isinstance(error, RuntimeError) for error in failures)
+    assert result == "result"
+    assert calls == ["fail", "ok"]
+    assert flight.get_stats()["rag"] == {"calls": 2, "saved_calls": 3, "inflight": 0}
+
+
+
+def test_coalesced_rag_requests_share_leader_timings(monkeypatch):
+    """병합된 RAG 요청도 먼저 실행된 요청의 단계별 시간과 기다린 시간(coalesced)을 받음"""
+    vector_db = FAISS.from_texts(["외국인등록 안내", "건강보험 안내"], embedding=FakeEmbeddings(size=8))
+    monkeypatch.setattr(vector_index_manager, "_snapshot", IndexSnapshot(partitions={"ko": vector_db}, version="test"))
+    semantic_answer_cache.clear()
+    service = OpenAIService()
+    service.client = SlowChatModel(responses=["답변"])
+
+    async def ask(question: str, measure: bool):
+        timings = service_metrics.start_request_timings() if measure else None
+        answer = await service.agenerate_rag_answer(question, "ko")
+        return answer, timings
+
+    async def first_then_rest(question: str, measures):
+        first = asyncio.ensure_future(ask(question, measures[0]))
+        await asyncio.sleep(0)
+        return await asyncio.gather(first, *[ask(question, measure) for measure in measures[1:]])
+
+    async def run():
+        measured = await first_then_rest("외국인등록 어떻게 하나요?", (True, True, False))
+        unmeasured = await first_then_rest("건강보험 가입은?", (False, True))
+        return measured, unmeasured
+
+    (leader, follower, silent), (_, late_follower) = asyncio.run(run())
+
+    assert service.client.calls == 2
+    assert leader[0] == follower[0] == silent[0] == "답변"
+    assert {"embedding", "search", "llm_ttft", "llm"} <= set(leader[1])
+    assert "coalesced" not in leader[1]
+    assert set(follower[1]) == set(leader[1]) | {"coalesced"}
+    assert follower[1]["llm"] == leader[1]["llm"]
+    assert silent[1] is None
+    # 첫 요청이 측정하지 않았으면 병합된 요청은 기다린 시간만 받음
+    assert set(late_follower[1]) == {"coalesced"}
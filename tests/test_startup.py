@@ -0,0 +1,118 @@
+"""
+서버 시작 비용 테스트 (import 시간/부수 효과, liveness/readiness)
+"""
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.main import READINESS_CHECKS, app
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# app.main import 시 로드되면 안 되는 무거운 모듈 (첫 사용 또는 서버 시작 시 로드)
+DEFERRED_MODULES = (
+    "langchain", "langchain_core", "langchain_community", "openai", "httpx", "faiss",
+    "numpy", "tiktoken", "torch", "transformers", "sentence_transformers"
+)
+# app.main 누적 import 시간 상한 (ms, 느린 CI를 고려한 여유값)
+IMPORT_BUDGET_MS = int(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+PROFILE_SCRIPT = f"""
+import sys
+import app.main
+loaded = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+print("DEFERRED_LOADED=" + ",".join(loaded))
+"""
+
+
+def _import_profile() -> tuple:
+    """환경 변수 없이 새 인터프리터에서 app.main을 import하고 (로드된 무거운 모듈, 모듈별 누적 시간) 반환"""
+    env = {"PATH": os.environ.get("PATH", ""), "HOME": os.environ.get("HOME", ""), "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROFILE_SCRIPT],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    loaded = result.stdout.strip().split("DEFERRED_LOADED=", 1)[1].split(",")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative_us, name = line.split("|")
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+    return [name for name in loaded if name], cumulative
+
+
+def test_import_has_no_heavy_modules_or_env_requirement():
+    """환경 변수 없이 import되고 langchain/OpenAI/faiss 등은 로드되지 않으며 시간 예산 이내"""
+    loaded, cumulative = _import_profile()
+    slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:10]
+
+    assert loaded == [], f"import 시점에 로드된 무거운 모듈: {loaded}"
+    assert cumulative["app.main"] / 1000 < IMPORT_BUDGET_MS, f"import 시간 초과: {slowest}"
+
+
+def test_liveness_and_readiness():
+    """liveness는 항상 200, readiness는 모든 준비 단계가 끝난 뒤에만 200"""
+    client = TestClient(app)
+
+    app.state.readiness = {check: False for check in READINESS_CHECKS}
+    assert client.get("/api/health").status_code == 200
+    response = client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+    app.state.readiness = {check: True for check in READINESS_CHECKS}
+    assert client.get("/api/ready").status_code == 200
+    del app.state.readiness
+
+
+def test_warm_up_retries_and_starts_watching_after_failure(monkeypatch):
+    """준비 실패 시 오류를 /api/ready에 노출하고 재시도하며, 인덱스 감시는 첫 실패 직후에도 시작"""
+    client = TestClient(app)
+    attempts = []
+    watch_started = []
+    seen = {}
+
+    def flaky_prepare(readiness):
+        attempts.append(dict(readiness))
+        if len(attempts) < 3:
+            readiness["pipelines"] = True
+            raise RuntimeError("게시된 FAISS 인덱스가 없습니다.")
+        readiness.update({check: True for check in READINESS_CHECKS})
+
+    async def sleep(delay):
+        # 재시도 대기 중의 readiness 응답과 감시 시작 여부 확인
+        seen.setdefault("ready", client.get("/api/ready"))
+        seen.setdefault("watching", bool(watch_started))
+        seen.setdefault("delays", []).append(delay)
+
+    monkeypatch.setattr(main, "_prepare", flaky_prepare)
+    monkeypatch.setattr(main, "_start_index_watch", lambda: watch_started.append(True) or True)
+    monkeypatch.setattr(main.asyncio, "sleep", sleep)
+    app.state.readiness = {check: False for check in READINESS_CHECKS}
+    app.state.readiness_error = None
+
+    try:
+        asyncio.run(main._warm_up(app))
+
+        assert len(attempts) == 3
+        # 이미 끝난 단계는 다음 시도에서 완료 상태로 유지
+        assert attempts[1]["pipelines"] is True
+        assert seen["watching"] is True and len(watch_started) == 1
+        assert seen["delays"] == [main.WARM_UP_RETRY_BASE_DELAY, main.WARM_UP_RETRY_BASE_DELAY * 2]
+        assert seen["ready"].status_code == 503
+        assert seen["ready"].json()["error"] == "RuntimeError: 게시된 FAISS 인덱스가 없습니다."
+
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        assert "error" not in response.json()
+    finally:
+        del app.state.readiness
+        del app.state.readiness_error
@@ -0,0 +1,84 @@
+"""
+일괄 번역 테스트 (LLM 호출은 가짜 함수 사용)
+"""
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.OpenAIService import OpenAIService
+
+
+def _postings(count):
+    return [
+        {"posting_id": f"p{i}", "title": f"제목{i}", "eligibility": "주민", "text": "본문"}
+        for i in range(count)
+    ]
+
+
+def _flaky_translate(fail_times, always_fail=()):
+    """항목별로 처음 fail_times번 실패하는 번역 함수 (always_fail 공고는 항상 실패)"""
+    calls = {}
+    state = {"inflight": 0, "max_inflight": 0}
+
+    async def translate(self, title, eligibility, text, target_language):
+        key = (title, target_language)
+        calls[key] = calls.get(key, 0) + 1
+        state["inflight"] += 1
+        state["max_inflight"] = max(state["max_inflight"], state["inflight"])
+        try:
+            await asyncio.sleep(0.01)
+            if title in always_fail or calls[key] <= fail_times:
+                raise RuntimeError("rate limited")
+            return {"title": f"{title}-{target_language}", "eligibility": eligibility, "text": text, "cached": False}
+        finally:
+            state["inflight"] -= 1
+
+    return translate, calls, state
+
+
+def test_atranslate_bulk_retries_and_bounds_concurrency(monkeypatch):
+    """실패 항목은 재시도하고 동시 작업 수는 설정값 이하로 유지"""
+    translate, calls, state = _flaky_translate(fail_times=1)
+    monkeypatch.setattr(OpenAIService, "atranslate_multiple_fields", translate)
+    service = OpenAIService()
+    monkeypatch.setattr(service.config, "translation_bulk_concurrency", 3)
+    monkeypatch.setattr(service.config, "translation_retry_base_delay", 0.001)
+
+    async def run():
+        return [item async for item in service.atranslate_bulk(_postings(4), ["en", "ja"])]
+
+    results = asyncio.run(run())
+
+    assert len(results) == 8
+    assert all(item["error"] is None and item["attempts"] == 2 for item in results)
+    assert {(item["posting_id"], item["target_language"]) for item in results} == {
+        (f"p{i}", language) for i in range(4) for language in ("en", "ja")
+    }
+    assert state["max_inflight"] <= 3
+
+
+def test_translate_bulk_streams_ndjson_with_failures(monkeypatch):
+    """실패한 항목이 있어도 나머지를 모두 전송하고 마지막에 요약 전송"""
+    translate, _, _ = _flaky_translate(fail_times=0, always_fail=("제목1",))
+    monkeypatch.setattr(OpenAIService, "atranslate_multiple_fields", translate)
+    from app.config.OpenAIConfig import openai_config
+    monkeypatch.setattr(openai_config, "translation_retry_base_delay", 0.001)
+
+    response = TestClient(app).post(
+        "/api/translation/translate-bulk",
+        json={"postings": _postings(3), "target_languages": ["en", "vi", "en"]}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.strip().split("\n")]
+    items, summary = lines[:-1], lines[-1]
+
+    assert len(items) == 6
+    failed = [item for item in items if item["error"] is not None]
+    assert {item["posting_id"] for item in failed} == {"p1"}
+    assert all(item["attempts"] == openai_config.translation_max_retries + 1 for item in failed)
+    assert summary["done"] is True
+    assert (summary["succeeded"], summary["failed"]) == (4, 2)
@@ -0,0 +1,126 @@
+"""
+번역 결과 영구 캐시 테스트
+"""
+import asyncio
+import sqlite3
+import threading
+
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.main import app
+from app.services.OpenAIService import OpenAIService
+from app.services.TranslationCache import TranslationCache, make_translation_key
+
+TRANSLATED = "Title: Support\nEligibility: All\nContent: Body"
+
+
+def test_cache_survives_reopen_and_tracks_hits(tmp_path):
+    """새 인스턴스(재시작)에서도 저장된 번역을 조회하고 적중률 집계"""
+    key = make_translation_key("gpt-4o-mini", "en", "제목", "자격", "본문", "1")
+    TranslationCache(tmp_path / "cache.sqlite3", max_bytes=1024).set(key, {"title": "Title"})
+
+    cache = TranslationCache(tmp_path / "cache.sqlite3", max_bytes=1024)
+
+    assert cache.get(key) == {"title": "Title"}
+    assert cache.get(make_translation_key("gpt-4o-mini", "ja", "제목", "자격", "본문", "1")) is None
+    assert cache.get_stats()["hit_ratio"] == 0.5
+
+
+def test_cache_evicts_least_recently_used_over_size_limit(tmp_path):
+    """전체 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+    cache = TranslationCache(tmp_path / "cache.sqlite3", max_bytes=100)
+    value = {"text": "x" * 30}
+
+    cache.set("a", value)
+    cache.set("b", value)
+    cache.get("a")
+    cache.set("c", value)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == value
+    assert cache.get("c") == value
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_stats()["size_bytes"] <= 100
+
+
+def test_hits_batch_last_used_updates(tmp_path):
+    """조회마다 커밋하지 않고 조회 시각을 모아서 기록"""
+    path = tmp_path / "cache.sqlite3"
+    cache = TranslationCache(path, max_bytes=1024)
+    cache.TOUCH_BATCH_SIZE = 2
+    cache.set("a", {"title": "A"})
+    cache.set("b", {"title": "B"})
+
+    def last_used():
+        with sqlite3.connect(str(path)) as conn:
+            return dict(conn.execute("SELECT key, last_used FROM translations"))
+
+    before = last_used()
+    cache.get("a")
+    assert last_used() == before
+
+    cache.get("b")
+    after = last_used()
+    assert after["a"] > before["a"] and after["b"] > before["b"]
+
+
+def test_size_limit_holds_across_workers(tmp_path):
+    """여러 워커(인스턴스)가 같은 파일에 저장해도 전체 크기 상한 유지"""
+    path = tmp_path / "cache.sqlite3"
+    workers = [TranslationCache(path, max_bytes=100) for _ in range(2)]
+    value = {"text": "x" * 30}
+
+    for i in range(6):
+        workers[i % 2].set(f"k{i}", value)
+
+    stats = workers[0].get_stats()
+    assert stats["size_bytes"] <= 100
+    assert workers[1].get("k5") == value
+
+
+def test_async_access_runs_off_event_loop(tmp_path):
+    """비동기 조회/저장은 이벤트 루프 스레드 밖에서 SQLite I/O 수행"""
+    cache = TranslationCache(tmp_path / "cache.sqlite3", max_bytes=1024)
+    threads = []
+    original_get = cache.get
+
+    def recording_get(key):
+        threads.append(threading.get_ident())
+        return original_get(key)
+
+    cache.get = recording_get
+
+    async def run():
+        await cache.aset("a", {"title": "A"})
+        return await cache.aget("a"), threading.get_ident()
+
+    value, loop_thread = asyncio.run(run())
+    assert value == {"title": "A"}
+    assert threads and loop_thread not in threads
+
+
+def test_translation_uses_cache_before_llm():
+    """같은 번역 요청은 LLM 호출 없이 캐시에서 반환하고 cached로 표시"""
+    service = OpenAIService()
+    service.client = FakeListChatModel(responses=[TRANSLATED])
+
+    first = asyncio.run(service.atranslate_multiple_fields("지원", "전체", "본문", "en"))
+    service.client = FakeListChatModel(responses=["Title: Other"])
+    second = asyncio.run(service.atranslate_multiple_fields("지원", "전체", "본문", "en"))
+
+    assert first == {"title": "Support", "eligibility": "All", "text": "Body", "cached": False}
+    assert second == {**first, "cached": True}
+
+
+def test_translate_endpoint_reports_cache_hit(monkeypatch):
+    """번역 API 응답에 캐시 사용 여부 포함"""
+    monkeypatch.setattr(OpenAIService, "client", FakeListChatModel(responses=[TRANSLATED]))
+    client = TestClient(app)
+    body = {"title": "지원", "eligibility": "전체", "text": "본문", "target_language": "en"}
+
+    first = client.post("/api/translation/translate", json=body)
+    second = client.post("/api/translation/translate", json=body)
+
+    assert first.json()["cached"] is False
+    assert second.json() == {**first.json(), "cached": True}
@@ -0,0 +1,78 @@
+"""
+긴 본문 분할 번역 테스트
+"""
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.services.OpenAIService import OpenAIService
+from app.services.TranslationSegmenter import split_translation_segments
+
+CONTENT = "\n\n".join([
+    "■ 개요\n" + "주거비를 지원합니다. " * 10,
+    "■ 지원대상\n" + "외국인 주민 " * 20,
+    "■ 지원내용\n" + "월 최대 20만원 " * 15,
+    "■ 신청방법\n주민센터 방문"
+])
+
+
+def test_split_keeps_order_and_section_boundaries():
+    """구간은 크기 상한 이하이고 섹션 경계에서 나뉘며 순서대로 합치면 원문 내용과 같음"""
+    segments = split_translation_segments(CONTENT, 200)
+
+    assert len(segments) > 1
+    assert all(len(segment) <= 200 for segment in segments)
+    assert all(segment.startswith("■") for segment in segments)
+    assert "".join("".join(segments).split()) == "".join(CONTENT.split())
+
+
+def test_split_short_or_disabled_returns_whole_text():
+    assert split_translation_segments("짧은 본문", 200) == ["짧은 본문"]
+    assert split_translation_segments(CONTENT, 0) == [CONTENT]
+
+
+def test_split_whitespace_only_returns_whole_text():
+    """공백뿐인 긴 본문도 빈 목록이 아니라 원문 구간 하나를 반환"""
+    blank = " " * 2000 + "\n\n" + " " * 500
+
+    assert split_translation_segments(blank, 1200) == [blank]
+
+
+def test_split_long_line_on_sentence_boundaries():
+    """줄 하나가 구간보다 길면 문장 경계에서 분할"""
+    segments = split_translation_segments("첫 문장입니다. " * 30, 100)
+
+    assert all(len(segment) <= 100 for segment in segments)
+    assert all(segment.endswith("다.") for segment in segments)
+
+
+def test_atranslate_segments_run_concurrently(monkeypatch):
+    """제목/자격요건 호출과 본문 구간 호출을 동시에 실행하고 원래 순서대로 합침"""
+    state = {"inflight": 0, "max_inflight": 0}
+
+    async def fake_llm(prompt_value):
+        state["inflight"] += 1
+        state["max_inflight"] = max(state["max_inflight"], state["inflight"])
+        await asyncio.sleep(0.05)
+        state["inflight"] -= 1
+        human = prompt_value.to_messages()[-1].content
+        if "자격요건:" in human:
+            body = human.split("본문: ", 1)[1].split("\n\n번역 결과를", 1)[0]
+            return AIMessage(content=f"Title: T\nEligibility: E\nContent: {body.splitlines()[0]}")
+        return AIMessage(content=human.splitlines()[0])
+
+    service = OpenAIService()
+    service.client = RunnableLambda(fake_llm)
+    monkeypatch.setattr(service.config, "translation_segment_chars", 200)
+    segments = split_translation_segments(CONTENT, 200)
+
+    start = time.perf_counter()
+    result = asyncio.run(service.atranslate_multiple_fields("주거 지원", "주민", CONTENT, "en"))
+    elapsed = time.perf_counter() - start
+
+    assert (result["title"], result["eligibility"]) == ("T", "E")
+    assert result["text"].split("\n") == [segment.splitlines()[0] for segment in segments]
+    assert state["max_inflight"] == len(segments)
+    assert elapsed < 0.05 * len(segments)
@@ -0,0 +1,94 @@
+"""
+FAISS 인덱스 로드/핫스왑 테스트
+"""
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from app.services.VectorIndexManager import VectorIndexManager
+from etl.pdf.embedding_service import EmbeddingService
+
+
+def _make_service(tmp_path):
+    service = EmbeddingService()
+    service.config.faiss_index_dir = tmp_path
+    service.config.embedding_model = FakeEmbeddings(size=8)
+    return service
+
+
+def _build_db(service, texts, metadatas=None):
+    return FAISS.from_texts(texts, embedding=service.config.embedding_model, metadatas=metadatas)
+
+
+def test_reload_keeps_snapshot_until_new_index_published(tmp_path):
+    """게시된 인덱스가 바뀌지 않으면 같은 스냅샷을 재사용"""
+    service = _make_service(tmp_path)
+    service.publish_db(_build_db(service, ["외국인등록", "건강보험"]))
+
+    manager = VectorIndexManager(embedding_service=service, reload_interval=1)
+    first = manager.get()
+
+    assert manager.reload() is first
+    assert first.get_vector_db("ko").index.ntotal == 2
+
+
+def test_publish_hot_swaps_without_touching_old_snapshot(tmp_path):
+    """새 인덱스가 게시되면 교체되고 기존 스냅샷은 그대로 사용 가능"""
+    service = _make_service(tmp_path)
+    service.publish_db(_build_db(service, ["외국인등록"]))
+
+    manager = VectorIndexManager(embedding_service=service, reload_interval=1)
+    old = manager.get()
+
+    service.publish_db(_build_db(service, ["외국인등록", "건강보험", "비자 연장"]))
+    new = manager.reload()
+
+    assert new.version != old.version
+    assert new.get_vector_db("ko").index.ntotal == 3
+    # 진행 중인 요청이 들고 있는 이전 스냅샷은 계속 검색 가능
+    assert len(old.get_vector_db("ko").similarity_search("외국인등록", k=1)) == 1
+
+
+def test_old_index_files_are_cleaned_up(tmp_path):
+    """현재와 직전 버전을 제외한 이전 인덱스 파일은 삭제"""
+    service = _make_service(tmp_path)
+    names = [service.publish_db(_build_db(service, [f"문서 {i}"])) for i in range(4)]
+
+    remaining = {p.stem for p in tmp_path.glob("*.faiss")}
+    assert remaining == set(names[-2:])
+    assert service.get_current_index_name() == names[-1]
+
+
+def test_language_partitions_route_with_fallback(tmp_path):
+    """언어별 인덱스로 라우팅하고 가이드북이 없는 언어는 대체 언어 인덱스 사용"""
+    service = _make_service(tmp_path)
+    service.config.fallback_language = "en"
+    service.publish_partitions({
+        "ko": _build_db(service, ["외국인등록", "건강보험"]),
+        "en": _build_db(service, ["Alien registration"]),
+    })
+
+    snapshot = VectorIndexManager(embedding_service=service, reload_interval=1).get()
+
+    assert snapshot.get_vector_db("ko").index.ntotal == 2
+    assert snapshot.get_vector_db("th") is snapshot.get_vector_db("en")
+    assert snapshot.get_vector_db("th").similarity_search("visa", k=5)[0].page_content == "Alien registration"
+
+
+def test_flat_index_is_split_by_source_guidebook(tmp_path):
+    """언어 구분 없는 이전 형식 인덱스는 출처 파일명으로 언어별 분할"""
+    service = _make_service(tmp_path)
+    service.publish_db(_build_db(
+        service,
+        ["외국인등록", "건강보험", "Alien registration"],
+        metadatas=[
+            {"source": "C:\\guidebook_pdfs\\guidebook_ko.pdf"},
+            {"source": "guidebook_pdfs/guidebook_ko.pdf"},
+            {"source": "guidebook_pdfs/guidebook_en.pdf"},
+        ]
+    ))
+
+    snapshot = VectorIndexManager(embedding_service=service, reload_interval=1).get()
+
+    assert sorted(snapshot.partitions) == ["en", "ko"]
+    assert snapshot.get_vector_db("ko").index.ntotal == 2
+    assert snapshot.get_vector_db("en").index.ntotal == 1